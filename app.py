@@ -3,15 +3,36 @@ from __future__ import annotations
 import json
 import shutil
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 from uuid import uuid4
 
 from flask import Flask, redirect, render_template, request, url_for
 
+from src.core.convert import field_diff
+from src.core.integrity import IdIndex, IntegrityIssue, check_group, check_meeting, check_person
+from src.core.journal import record as record_change
+from src.core.lock import VersionConflict, data_lock, locked, version_token
+from src.core.meeting_index import (
+    current_index,
+    iter_meetings,
+    meeting_num_conflicts,
+    meeting_stats,
+    next_meeting_num,
+    remove_meetings,
+    sequence_report,
+    update_meetings,
+)
+from src.core.migrate import stamp_version
+from src.core.resolver import NameRegistry
+from src.core.sources import clean_url, normalize_sources
+from src.core.stats import build_report
 from src.core.validator import validate_with_schema
+from src.core.writer import write_json_file
+from src.templating import setup_templates
 from src.utils import data_dir, schema_base_dir
 
 app = Flask(__name__)
+setup_templates(app)
 
 
 # ========== helpers ==========
@@ -24,9 +45,8 @@ def _load_json(path: Path, default: Any = None) -> Any:
 
 
 def _write_json(path: Path, data: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    text = json.dumps(data, ensure_ascii=False, indent=2)
-    path.write_text(text, encoding="utf-8")
+    # 一時ファイル経由で置き換える（ロックを取らないビューアに書きかけの JSON を見せない）
+    write_json_file(path, data)
 
 
 def _validate_data(entity: str, payload: Dict[str, Any]) -> None:
@@ -40,6 +60,47 @@ def _validate_data(entity: str, payload: Dict[str, Any]) -> None:
     validate_with_schema(payload, schema_path)
 
 
+def _integrity_issues(entity: str, payloads: List[Dict[str, Any]]) -> List[List[IntegrityIssue]]:
+    """payloads それぞれについて、保存した場合の参照整合性の問題を返す（参照先の索引は1回だけ作る）."""
+    if entity == "meeting":
+        # 会議は参照先の存在確認だけなので、ファイル名からID集合を作れば足りる
+        index = IdIndex.load_ids()
+        # 号数の重複は団体ごとの号数表で確認する（全会議は走査しない）
+        current_index()
+        results = []
+        for payload in payloads:
+            issues = check_meeting(index, payload)
+            for gid, num, other in meeting_num_conflicts(payload):
+                issues.append(IntegrityIssue(
+                    "duplicate_meeting_num", "meeting", payload["id"],
+                    f"同じ団体・号数の会議が既にあります: {gid} #{num} ({other})", other,
+                ))
+            results.append(issues)
+        return results
+    if entity == "group":
+        others = [g for g in load_groups() if g["id"] != payloads[0]["id"]]
+        index = IdIndex.from_records(others, [])
+        return [check_group(index, payload) for payload in payloads]
+    others = [p for p in load_persons() if p["id"] != payloads[0]["id"]]
+    index = IdIndex.from_records([], others)
+    return [check_person(index, payload) for payload in payloads]
+
+
+def _check_integrity(entity: str, payload: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> None:
+    """保存前に参照整合性を確認し、この編集で新たに生じる問題があれば ValueError を送出する.
+
+    previous（保存前の内容）に既にある問題は編集の妨げにしない。
+    """
+    if previous is None:
+        issues = _integrity_issues(entity, [payload])[0]
+    else:
+        issues, before = _integrity_issues(entity, [payload, {**previous, "id": payload["id"]}])
+        known = {(i.kind, i.message) for i in before}
+        issues = [i for i in issues if (i.kind, i.message) not in known]
+    if issues:
+        raise ValueError(" / ".join(issue.message for issue in issues))
+
+
 # ========== data access ==========
 
 
@@ -63,7 +124,10 @@ def load_persons() -> List[Dict[str, Any]]:
     return results
 
 
-def load_meetings() -> List[Dict[str, Any]]:
+def load_meetings(lazy: bool = False) -> Iterable[Dict[str, Any]]:
+    """全会議を新しい順に返す。lazy=True なら月別パーティション順に1件ずつ読み込むイテレータを返す."""
+    if lazy:
+        return iter_meetings()
     results: List[Dict[str, Any]] = []
     dir_path = data_dir() / "meeting"
     if not dir_path.exists():
@@ -78,37 +142,81 @@ def load_meetings() -> List[Dict[str, Any]]:
     return sorted(results, key=sort_key, reverse=True)
 
 
-def save_group(group_id: str, payload: Dict[str, Any]) -> None:
+def _check_version(entity: str, entity_id: str, path: Path, expected: Optional[str]) -> None:
+    """編集開始時の版トークンと今のファイルを比べ、違えば VersionConflict を送出する（None なら確認しない）."""
+    if expected is None:
+        return
+    current = version_token(path)
+    if current != expected:
+        raise VersionConflict(entity, entity_id, _load_json(path), current)
+
+
+@locked
+def save_group(group_id: str, payload: Dict[str, Any], expected_version: Optional[str] = None) -> None:
+    path = data_dir() / "group" / f"{group_id}.json"
+    _check_version("group", group_id, path, expected_version)
+    stamp_version("group", payload)
     _validate_data("group", payload)
-    _write_json(data_dir() / "group" / f"{group_id}.json", payload)
+    _check_integrity("group", payload, _load_json(path))
+    _write_json(path, payload)
+    record_change("group", group_id, payload)
 
 
-def save_person(person_id: str, payload: Dict[str, Any]) -> None:
+@locked
+def save_person(person_id: str, payload: Dict[str, Any], expected_version: Optional[str] = None) -> None:
+    path = data_dir() / "person" / f"{person_id}.json"
+    _check_version("person", person_id, path, expected_version)
+    stamp_version("person", payload)
     _validate_data("person", payload)
-    _write_json(data_dir() / "person" / f"{person_id}.json", payload)
+    _check_integrity("person", payload, _load_json(path))
+    _write_json(path, payload)
+    record_change("person", person_id, payload)
 
 
-def save_meeting(meeting_id: str, payload: Dict[str, Any]) -> None:
+def _prepare_meeting(meeting_id: str, payload: Dict[str, Any], expected_version: Optional[str] = None) -> Path:
+    """保存前の確認（版・スキーマ・参照整合性）だけを行う。問題があれば例外を送出し、何も書かない."""
+    path = data_dir() / "meeting" / meeting_id / "basic.json"
+    _check_version("meeting", meeting_id, path, expected_version)
+    stamp_version("meeting", payload)
     _validate_data("meeting", payload)
-    _write_json(data_dir() / "meeting" / meeting_id / "basic.json", payload)
+    _check_integrity("meeting", payload, _load_json(path))
+    return path
+
+
+def _store_meeting(meeting_id: str, path: Path, payload: Dict[str, Any]) -> None:
+    _write_json(path, payload)
+    update_meetings([{**payload, "id": meeting_id}])
+    record_change("meeting", meeting_id, payload)
 
 
+@locked
+def save_meeting(meeting_id: str, payload: Dict[str, Any], expected_version: Optional[str] = None) -> None:
+    _store_meeting(meeting_id, _prepare_meeting(meeting_id, payload, expected_version), payload)
+
+
+@locked
 def delete_group(group_id: str) -> None:
     path = data_dir() / "group" / f"{group_id}.json"
     if path.exists():
         path.unlink()
+        record_change("group", group_id)
 
 
+@locked
 def delete_person(person_id: str) -> None:
     path = data_dir() / "person" / f"{person_id}.json"
     if path.exists():
         path.unlink()
+        record_change("person", person_id)
 
 
+@locked
 def delete_meeting(meeting_id: str) -> None:
     folder = data_dir() / "meeting" / meeting_id
     if folder.exists():
         shutil.rmtree(folder)
+        record_change("meeting", meeting_id)
+    remove_meetings([meeting_id])
 
 
 # ========== parsing helpers for meeting form ==========
@@ -135,45 +243,6 @@ def _parse_agenda(raw: str) -> List[str]:
     return [line.strip() for line in raw.splitlines() if line.strip()]
 
 
-def _clean_url(value: Optional[str]) -> Optional[str]:
-    if value is None:
-        return None
-    v = value.strip()
-    return v or None
-
-
-def _normalize_sources(raw: Any) -> Dict[str, Any]:
-    """旧形式(list)も受け取り、新形式のdictに揃える."""
-    if not raw:
-        return {"meeting_page": None, "transcript": None, "announcement": None, "other": []}
-    if isinstance(raw, dict):
-        return {
-            "meeting_page": _clean_url(raw.get("meeting_page")),
-            "transcript": _clean_url(raw.get("transcript")),
-            "announcement": _clean_url(raw.get("announcement") or raw.get("notice")),
-            "other": raw.get("other") or [],
-        }
-    meeting_page = None
-    transcript = None
-    announcement = None
-    other_items: List[Dict[str, Any]] = []
-    for item in raw:
-        url = _clean_url(item.get("url")) if isinstance(item, dict) else None
-        if not url:
-            continue
-        stype = item.get("source_type") if isinstance(item, dict) else None
-        title = item.get("title") if isinstance(item, dict) else None
-        if stype == "meeting_page" and not meeting_page:
-            meeting_page = url
-        elif stype in ("minutes", "transcript") and not transcript:
-            transcript = url
-        elif stype in ("announcement", "notice") and not announcement:
-            announcement = url
-        else:
-            other_items.append({"url": url, "title": title})
-    return {"meeting_page": meeting_page, "transcript": transcript, "announcement": announcement, "other": other_items}
-
-
 def _build_sources_from_form(form: Any) -> Dict[str, Any]:
     other_raw = form.get("sources_other_lines", "") if hasattr(form, "get") else ""
     other_items: List[Dict[str, Any]] = []
@@ -188,9 +257,9 @@ def _build_sources_from_form(form: Any) -> Dict[str, Any]:
         title = parts[1] if len(parts) > 1 and parts[1] else None
         other_items.append({"url": url, "title": title})
     return {
-        "meeting_page": _clean_url(form.get("sources_meeting_page") if hasattr(form, "get") else None),
-        "transcript": _clean_url(form.get("sources_transcript") if hasattr(form, "get") else None),
-        "announcement": _clean_url(form.get("sources_announcement") if hasattr(form, "get") else None),
+        "meeting_page": clean_url(form.get("sources_meeting_page") if hasattr(form, "get") else None),
+        "transcript": clean_url(form.get("sources_transcript") if hasattr(form, "get") else None),
+        "announcement": clean_url(form.get("sources_announcement") if hasattr(form, "get") else None),
         "other": other_items,
     }
 
@@ -208,6 +277,23 @@ def _parse_materials(raw: str) -> List[Dict[str, Any]]:
     return items
 
 
+def _render_conflict(conflict: VersionConflict, submitted: Dict[str, Any], action: str, edit_url: str) -> tuple[str, int]:
+    """版トークンが合わなかったときの確認画面。送信内容は hidden で持ち回り、上書きも選べるようにする."""
+    current = conflict.current
+    if current is not None:
+        current = {**current, "id": conflict.entity_id}
+    fields = [(k, v) for k in request.form for v in request.form.getlist(k) if k != "version"]
+    html = render_template(
+        "conflict.html",
+        conflict=conflict,
+        changes=field_diff(current or {}, {k: v for k, v in submitted.items() if k != "schema_version"}),
+        fields=fields,
+        action=action,
+        edit_url=edit_url,
+    )
+    return html, 409
+
+
 # ========== routes ==========
 
 
@@ -325,7 +411,7 @@ def group_detail(id: str) -> str:
         parent_name = next((g["name"] for g in groups if g.get("id") == parent_id), None)
         parent_label = f"{parent_name} ({parent_id})" if parent_name else parent_id
         parent_id_for_link = parent_id
-    meetings = load_meetings()
+    meetings = current_index().summaries()
     main_meetings = [m for m in meetings if m.get("main", {}).get("group_id") == id]
     sub_meetings = [
         m
@@ -343,6 +429,23 @@ def group_detail(id: str) -> str:
     )
 
 
+@app.get("/group/<id>/sequence")
+def group_sequence(id: str) -> str:
+    path = data_dir() / "group" / f"{id}.json"
+    if not path.exists():
+        return "not found", 404
+    group = _load_json(path, {})
+    group["id"] = id
+    current_index()
+    return render_template("group_sequence.html", group=group, report=sequence_report(id))
+
+
+@app.get("/group/<id>/next_num")
+def group_next_num(id: str) -> Dict[str, Any]:
+    current_index()
+    return {"group_id": id, "next": next_meeting_num(id)}
+
+
 @app.get("/group/<id>/children")
 def group_children(id: str) -> str:
     groups = load_groups()
@@ -371,7 +474,7 @@ def group_edit(id: str) -> str:
     group = _load_json(path, {})
     group["id"] = id
     groups = load_groups()
-    return render_template("group_form.html", group=group, mode="edit", groups=groups)
+    return render_template("group_form.html", group=group, mode="edit", groups=groups, version=version_token(path))
 
 
 @app.post("/group/<id>/edit")
@@ -386,11 +489,15 @@ def group_update(id: str) -> str:
         "official_url": form["official_url"].strip(),
     }
     try:
-        save_group(id, payload)
+        save_group(id, payload, expected_version=form.get("version"))
         return redirect(url_for("group_detail", id=id))
+    except VersionConflict as e:
+        return _render_conflict(e, payload, url_for("group_update", id=id), url_for("group_edit", id=id))
     except Exception as e:  # noqa: BLE001
         groups = load_groups()
-        return render_template("group_form.html", group=payload, mode="edit", error=str(e), groups=groups)
+        return render_template(
+            "group_form.html", group=payload, mode="edit", error=str(e), groups=groups, version=form.get("version")
+        )
 
 
 @app.post("/group/<id>/delete")
@@ -446,7 +553,7 @@ def person_edit(id: str) -> str:
         return "not found", 404
     person = _load_json(path, {})
     person["id"] = id
-    return render_template("person_form.html", person=person, mode="edit")
+    return render_template("person_form.html", person=person, mode="edit", version=version_token(path))
 
 
 @app.post("/person/<id>/edit")
@@ -458,19 +565,21 @@ def person_update(id: str) -> str:
         "name_yomi": form.get("name_yomi") or None,
     }
     try:
-        save_person(id, payload)
+        save_person(id, payload, expected_version=form.get("version"))
         return redirect(url_for("person_detail", id=id))
+    except VersionConflict as e:
+        return _render_conflict(e, payload, url_for("person_update", id=id), url_for("person_edit", id=id))
     except Exception as e:  # noqa: BLE001
-        return render_template("person_form.html", person=payload, mode="edit", error=str(e))
+        return render_template("person_form.html", person=payload, mode="edit", error=str(e), version=form.get("version"))
 
 
 @app.get("/meeting")
 def meeting_list() -> str:
-    meetings = load_meetings()
-    months = sorted({(m.get("date") or "")[:7] for m in meetings if m.get("date")}, reverse=True)
+    # 一覧はサマリインデックスだけで描画し、basic.json は開かない
+    index = current_index()
+    months = index.months()
     active_month = request.args.get("month") or (months[0] if months else None)
-    if active_month:
-        meetings = [m for m in meetings if (m.get("date") or "").startswith(active_month)]
+    meetings = index.summaries(active_month)
     groups = load_groups()
     group_map = {g["id"]: g["name"] for g in groups}
     persons = load_persons()
@@ -485,6 +594,15 @@ def meeting_list() -> str:
     )
 
 
+@app.get("/stats")
+def stats() -> str:
+    # 集計はインデックスと一緒に差分更新されるので、ここでは会議を読まない
+    current_index()
+    group_map = {g["id"]: g["name"] for g in load_groups()}
+    person_map = {p["id"]: p["name"] for p in load_persons()}
+    return render_template("stats.html", report=build_report(meeting_stats(), group_map, person_map))
+
+
 @app.get("/meeting/month/<ym>")
 def meeting_month(ym: str) -> str:
     with app.test_request_context(f"/meeting?month={ym}"):
@@ -496,8 +614,10 @@ def meeting_new() -> str:
     groups = load_groups()
     persons = load_persons()
     prefill_group = request.args.get("main_group_id", "").strip()
+    if prefill_group:
+        current_index()
     meeting_prefill = {
-        "main": {"group_id": prefill_group, "num": ""},
+        "main": {"group_id": prefill_group, "num": next_meeting_num(prefill_group) if prefill_group else ""},
         "sub_group_id_list": ["" for _ in range(3)],
         "sub_num_list": ["" for _ in range(3)],
         "attendee_multi": [],
@@ -555,12 +675,43 @@ def _extract_meeting_form(form) -> Dict[str, Any]:
     return payload
 
 
+def _resolve_meeting_refs(
+    payload: Dict[str, Any],
+    groups: List[Dict[str, Any]],
+    persons: List[Dict[str, Any]],
+    previous: Optional[Dict[str, Any]] = None,
+) -> None:
+    """name で入力された group_id / attendee を id に置き換える（未登録なら近い候補付きのエラー）.
+
+    previous（保存済みのレコード）にある id はそのまま通す。登録から消えた参照の扱いは _check_integrity に任せる。
+    """
+    previous = previous or {}
+    known_groups = {(previous.get("main") or {}).get("group_id")}
+    known_groups.update(s.get("group_id") for s in previous.get("sub") or [])
+    known_persons = set(previous.get("attendee") or [])
+    group_registry = NameRegistry({})
+    for g in groups:
+        group_registry.add(g.get("name") or g["id"], g["id"])
+    person_registry = NameRegistry({})
+    for p in persons:
+        person_registry.add(p.get("name") or p["id"], p["id"], p.get("name_yomi"))
+
+    def group_id(value: str) -> str:
+        return value if value in known_groups else group_registry.resolve(value)
+
+    payload["main"]["group_id"] = group_id(payload["main"]["group_id"])
+    for sub in payload["sub"]:
+        sub["group_id"] = group_id(sub["group_id"])
+    payload["attendee"] = [a if a in known_persons else person_registry.resolve(a) for a in payload["attendee"]]
+
+
 @app.post("/meeting/new")
 def meeting_create() -> str:
     groups = load_groups()
     persons = load_persons()
     try:
         payload = _extract_meeting_form(request.form)
+        _resolve_meeting_refs(payload, groups, persons)
         meeting_id = str(uuid4())
         payload["id"] = meeting_id
         save_meeting(meeting_id, payload)
@@ -583,7 +734,7 @@ def meeting_detail(id: str) -> str:
         return "not found", 404
     meeting = _load_json(path, {})
     meeting["id"] = id
-    meeting["sources"] = _normalize_sources(meeting.get("sources"))
+    meeting["sources"] = normalize_sources(meeting.get("sources"))
     groups = load_groups()
     persons = load_persons()
     group_map = {g["id"]: g["name"] for g in groups}
@@ -603,7 +754,7 @@ def meeting_edit(id: str) -> str:
         return "not found", 404
     meeting = _load_json(path, {})
     meeting["id"] = id
-    meeting["sources"] = _normalize_sources(meeting.get("sources"))
+    meeting["sources"] = normalize_sources(meeting.get("sources"))
     groups = load_groups()
     persons = load_persons()
     # populate helper fields
@@ -628,6 +779,7 @@ def meeting_edit(id: str) -> str:
         groups=groups,
         persons=persons,
         error=None,
+        version=version_token(path),
     )
 
 
@@ -637,9 +789,12 @@ def meeting_update(id: str) -> str:
     persons = load_persons()
     try:
         payload = _extract_meeting_form(request.form)
+        _resolve_meeting_refs(payload, groups, persons, _load_json(data_dir() / "meeting" / id / "basic.json", {}))
         payload["id"] = id
-        save_meeting(id, payload)
+        save_meeting(id, payload, expected_version=request.form.get("version"))
         return redirect(url_for("meeting_detail", id=id))
+    except VersionConflict as e:
+        return _render_conflict(e, payload, url_for("meeting_update", id=id), url_for("meeting_edit", id=id))
     except Exception as e:  # noqa: BLE001
         return render_template(
             "meeting_form.html",
@@ -648,6 +803,7 @@ def meeting_update(id: str) -> str:
             groups=groups,
             persons=persons,
             error=str(e),
+            version=request.form.get("version"),
         )
 
 
@@ -665,23 +821,37 @@ def _find_meetings_with_person(person_id: str) -> List[Dict[str, Any]]:
 @app.post("/person/<id>/delete")
 def person_delete(id: str) -> str:
     linked_meetings = _find_meetings_with_person(id)
-    if linked_meetings and request.form.get("confirm") != "yes":
-        # 確認ページへ
+
+    def confirm_page(error: Optional[str] = None) -> str:
         group_map = {g["id"]: g["name"] for g in load_groups()}
         return render_template(
             "person_delete_confirm.html",
             person_id=id,
             meetings=linked_meetings,
             group_map=group_map,
+            error=error,
         )
 
-    # remove_attendance が on の場合は該当会議からattendeeを外す
-    if request.form.get("remove_attendance") == "on":
-        for m in _find_meetings_with_person(id):
-            m["attendee"] = [a for a in m.get("attendee", []) if a != id]
-            save_meeting(m["id"], m)
-
-    delete_person(id)
+    if linked_meetings and request.form.get("confirm") != "yes":
+        # 確認ページへ
+        return confirm_page()
+
+    # 会議の書き換えと削除の間に他の保存が割り込まないよう、まとめてロックする
+    with data_lock():
+        # remove_attendance が on の場合は該当会議からattendeeを外す。
+        # 先に全件を確認し、1件でも保存できなければ何も書かずに確認ページへ戻す
+        prepared = []
+        if request.form.get("remove_attendance") == "on":
+            for m in _find_meetings_with_person(id):
+                m["attendee"] = [a for a in m.get("attendee", []) if a != id]
+                try:
+                    prepared.append((m, _prepare_meeting(m["id"], m)))
+                except Exception as e:  # noqa: BLE001
+                    message = getattr(e, "message", None) or str(e)
+                    return confirm_page(f"会議 {m['id']} を保存できないため、削除を中止しました: {message}"), 409
+        for m, path in prepared:
+            _store_meeting(m["id"], path, m)
+        delete_person(id)
     return redirect(url_for("person_list"))
 
 
@@ -0,0 +1 @@
+"""合成データによるベンチマーク群."""
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import UUID
+
+import src.utils as utils
+
+HOLDINGS = ["onsite", "online", "hybrid", "document"]
+CATEGORIES = ["国/省庁", "国/審議会", "国/審議会(子)", "国/検討会", "自治体"]
+
+
+@dataclass(frozen=True)
+class Scale:
+    groups: int
+    persons: int
+    meetings: int
+    max_depth: int = 8
+
+
+SCALES: Dict[str, Scale] = {
+    "tiny": Scale(groups=30, persons=40, meetings=120, max_depth=4),
+    "small": Scale(groups=500, persons=1_000, meetings=5_000),
+    "medium": Scale(groups=2_000, persons=5_000, meetings=25_000),
+    "large": Scale(groups=10_000, persons=20_000, meetings=100_000, max_depth=12),
+}
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(UUID(int=rng.getrandbits(128), version=4))
+
+
+def _dump(path: Path, data: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def _build_groups(rng: random.Random, scale: Scale) -> List[Dict[str, Any]]:
+    groups: List[Dict[str, Any]] = []
+    depths: List[int] = []
+    roots = max(1, scale.groups // 200)
+    for i in range(scale.groups):
+        parent_index: Optional[int] = None
+        if i >= roots:
+            # 直近に作った団体を親に選びやすくして深い階層を作る
+            window = max(1, min(i, 50))
+            candidate = i - 1 - int(rng.random() ** 2 * window)
+            while depths[candidate] >= scale.max_depth:
+                candidate = groups[candidate]["_parent_index"]
+            parent_index = candidate
+        depth = 1 if parent_index is None else depths[parent_index] + 1
+        depths.append(depth)
+        gid = _uuid(rng)
+        groups.append({
+            "_parent_index": parent_index,
+            "id": gid,
+            "name": f"合成団体{i:05d}",
+            "parent": None if parent_index is None else groups[parent_index]["id"],
+            "category": rng.choice(CATEGORIES),
+            "list_url": f"https://example.go.jp/group/{i}/list" if rng.random() < 0.7 else None,
+            "official_url": f"https://example.go.jp/group/{i}/",
+        })
+    return groups
+
+
+def _build_persons(rng: random.Random, scale: Scale) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": _uuid(rng),
+            "name": f"合成人物{i:05d}",
+            "name_yomi": f"ごうせいじんぶつ{i:05d}" if rng.random() < 0.8 else None,
+        }
+        for i in range(scale.persons)
+    ]
+
+
+def _build_meetings(
+    rng: random.Random,
+    scale: Scale,
+    groups: List[Dict[str, Any]],
+    persons: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    counters: Dict[str, int] = {}
+
+    def next_num(gid: str) -> int:
+        counters[gid] = counters.get(gid, 0) + 1
+        return counters[gid]
+
+    meetings: List[Dict[str, Any]] = []
+    for i in range(scale.meetings):
+        main = rng.choice(groups)
+        sub_groups = rng.sample(groups, k=min(len(groups), rng.choice([0, 0, 0, 1, 2])))
+        sub = [{"group_id": g["id"], "num": next_num(g["id"])} for g in sub_groups if g is not main]
+        attendee = [p["id"] for p in rng.sample(persons, k=min(len(persons), rng.randint(0, 10)))]
+        start_hour = rng.randint(9, 17)
+        other = [
+            {"url": f"https://example.go.jp/meeting/{i}/other/{k}", "title": f"参考{k}"}
+            for k in range(rng.randint(0, 2))
+        ]
+        meetings.append({
+            "id": _uuid(rng),
+            "main": {"group_id": main["id"], "num": next_num(main["id"])},
+            "sub": sub,
+            "date": f"{rng.randint(2015, 2025):04d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "holding": rng.choice(HOLDINGS),
+            "start_time": f"{start_hour:02d}:00",
+            "end_time": f"{start_hour + 1:02d}:30",
+            "agenda": [f"議題{i}-{k}" for k in range(rng.randint(1, 5))],
+            "attendee": attendee,
+            "sources": {
+                "meeting_page": f"https://example.go.jp/meeting/{i}/",
+                "transcript": f"https://example.go.jp/meeting/{i}/transcript" if rng.random() < 0.5 else None,
+                "announcement": None,
+                "other": other,
+            },
+            "materials": [
+                {"url": f"https://example.go.jp/meeting/{i}/material{k}.pdf", "title": f"資料{k}"}
+                for k in range(rng.randint(0, 5))
+            ],
+        })
+    return meetings
+
+
+def generate_dataset(root: Path, scale: Scale, seed: int = 0) -> Dict[str, int]:
+    """root 配下に register/ data/ docs/schema/base を持つ合成データセットを生成する.
+
+    同じ scale と seed からは常に同一のファイル群が生成される。
+    """
+    rng = random.Random(seed)
+    groups = _build_groups(rng, scale)
+    persons = _build_persons(rng, scale)
+    meetings = _build_meetings(rng, scale, groups, persons)
+    id_to_group_name = {g["id"]: g["name"] for g in groups}
+    id_to_person_name = {p["id"]: p["name"] for p in persons}
+
+    shutil.copytree(utils.schema_base_dir(), root / "docs" / "schema" / "base", dirs_exist_ok=True)
+
+    # register: 参照は name で記述（convert の name 解決を通す）
+    register_groups = [
+        {
+            "name": g["name"],
+            "parent": id_to_group_name.get(g["parent"]) if g["parent"] else None,
+            "category": g["category"],
+            "list_url": g["list_url"],
+            "official_url": g["official_url"],
+        }
+        for g in groups
+    ]
+    register_persons = [{"id": p["id"], "name": p["name"], "name_yomi": p["name_yomi"]} for p in persons]
+    register_meetings = [
+        {
+            **m,
+            "main": {"group_id": id_to_group_name[m["main"]["group_id"]], "num": m["main"]["num"]},
+            "sub": [{"group_id": id_to_group_name[s["group_id"]], "num": s["num"]} for s in m["sub"]],
+            "attendee": [id_to_person_name[a] for a in m["attendee"]],
+        }
+        for m in meetings
+    ]
+    _dump(root / "register" / "group" / "form.json", register_groups)
+    _dump(root / "register" / "person" / "form.json", register_persons)
+    _dump(root / "register" / "meeting" / "form.json", register_meetings)
+
+    # data: 変換済みの確定データ
+    for g in groups:
+        _dump(root / "data" / "group" / f"{g['id']}.json", {k: v for k, v in g.items() if k != "_parent_index"})
+    for p in persons:
+        _dump(root / "data" / "person" / f"{p['id']}.json", p)
+    for m in meetings:
+        _dump(root / "data" / "meeting" / m["id"] / "basic.json", m)
+
+    return {"groups": len(groups), "persons": len(persons), "meetings": len(meetings)}
+
+
+@contextmanager
+def use_root(root: Path) -> Iterator[Path]:
+    """src.utils のパス解決を一時的に root へ向ける."""
+    original = utils.repo_root
+    utils.repo_root = lambda: root
+    try:
+        yield root
+    finally:
+        utils.repo_root = original
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="合成データセットを生成する")
+    parser.add_argument("dest", type=Path, help="出力先ディレクトリ")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    counts = generate_dataset(args.dest, SCALES[args.scale], seed=args.seed)
+    print(json.dumps({"scale": asdict(SCALES[args.scale]), "counts": counts}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import http.client
+import json
+import logging
+import math
+import random
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from benchmarks.generate import SCALES, generate_dataset, use_root
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# (ラベル, URLテンプレート, 重み)。{gid}/{mid}/{pid} はデータセットから埋める
+ROUTES: Dict[str, List[Tuple[str, str, int]]] = {
+    "viewer": [
+        ("meeting_list", "/meeting/", 4),
+        ("group_detail", "/group/{gid}/", 4),
+        ("group_tree", "/group/tree/", 2),
+        ("meeting_detail", "/meeting/{mid}/", 3),
+        ("person_detail", "/person/{pid}/", 1),
+        ("group_list", "/group/", 1),
+    ],
+    "admin": [
+        ("meeting_list", "/meeting", 4),
+        ("group_detail", "/group/{gid}", 4),
+        ("group_tree", "/group/tree", 2),
+        ("meeting_detail", "/meeting/{mid}", 3),
+        ("person_detail", "/person/{pid}", 1),
+        ("group_list", "/group", 1),
+    ],
+}
+
+
+@dataclass
+class Sample:
+    label: str
+    status: int
+    seconds: float
+
+
+def _load_app(target: str) -> Any:
+    if target == "viewer":
+        import viewer
+
+        return viewer.app
+    import app as admin_app
+
+    return admin_app.app
+
+
+def _dataset_ids() -> Dict[str, List[str]]:
+    from src.utils import data_dir
+
+    base = data_dir()
+    group_dir = base / "group"
+    person_dir = base / "person"
+    meeting_dir = base / "meeting"
+    return {
+        "gid": sorted(p.stem for p in group_dir.glob("*.json")) if group_dir.exists() else [],
+        "pid": sorted(p.stem for p in person_dir.glob("*.json")) if person_dir.exists() else [],
+        "mid": sorted(p.name for p in meeting_dir.iterdir() if p.is_dir()) if meeting_dir.exists() else [],
+    }
+
+
+def build_url_mix(target: str, ids: Dict[str, List[str]], size: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """データセットのIDから重み付きの (label, path) 列を決定的に作る."""
+    rng = random.Random(seed)
+    routes = [r for r in ROUTES[target] if all(ids.get(k) for k in ("gid", "mid", "pid") if f"{{{k}}}" in r[1])]
+    labels = [r[0] for r in routes]
+    weights = [r[2] for r in routes]
+    templates = {r[0]: r[1] for r in routes}
+    mix: List[Tuple[str, str]] = []
+    for label in rng.choices(labels, weights=weights, k=size):
+        path = templates[label].format(
+            gid=rng.choice(ids["gid"]) if ids["gid"] else "",
+            mid=rng.choice(ids["mid"]) if ids["mid"] else "",
+            pid=rng.choice(ids["pid"]) if ids["pid"] else "",
+        )
+        mix.append((label, path))
+    return mix
+
+
+def _inprocess_requester(app: Any) -> Callable[[], Callable[[str], int]]:
+    def factory() -> Callable[[str], int]:
+        client = app.test_client()
+
+        def get(path: str) -> int:
+            return client.get(path).status_code
+
+        return get
+
+    return factory
+
+
+def _http_requester(base_url: str) -> Callable[[], Callable[[str], int]]:
+    parts = urlsplit(base_url)
+    prefix = parts.path.rstrip("/")
+
+    def factory() -> Callable[[str], int]:
+        conn = http.client.HTTPConnection(parts.hostname or "127.0.0.1", parts.port or 80, timeout=60)
+
+        def get(path: str) -> int:
+            conn.request("GET", prefix + path)
+            resp = conn.getresponse()
+            resp.read()
+            return resp.status
+
+        return get
+
+    return factory
+
+
+@contextlib.contextmanager
+def local_server(app: Any, port: int = 0) -> Iterator[str]:
+    """werkzeug のスレッドサーバを別スレッドで起動し、ベースURLを返す."""
+    from werkzeug.serving import make_server
+
+    # リクエストごとのアクセスログは計測の邪魔になるので抑止する
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", port, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+def drive(
+    requester_factory: Callable[[], Callable[[str], int]],
+    mix: List[Tuple[str, str]],
+    threads: int,
+    duration: Optional[float] = None,
+) -> Tuple[List[Sample], float]:
+    """threads 本のクライアントで mix を消化（duration 指定時は時間まで周回）する."""
+    samples: List[Sample] = []
+    lock = threading.Lock()
+    cursor = [0]
+    deadline = time.perf_counter() + duration if duration else None
+
+    def take() -> Optional[Tuple[str, str]]:
+        with lock:
+            idx = cursor[0]
+            if deadline is None and idx >= len(mix):
+                return None
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            cursor[0] += 1
+            return mix[idx % len(mix)]
+
+    def worker() -> None:
+        get = requester_factory()
+        local: List[Sample] = []
+        while True:
+            item = take()
+            if item is None:
+                break
+            label, path = item
+            start = time.perf_counter()
+            try:
+                status = get(path)
+            except Exception:  # noqa: BLE001
+                status = 0
+            local.append(Sample(label, status, time.perf_counter() - start))
+        with lock:
+            samples.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return samples, time.perf_counter() - started
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """nearest-rank 法のパーセンタイル."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict[str, Any]:
+    def stats(items: List[Sample]) -> Dict[str, Any]:
+        lat = sorted(s.seconds for s in items)
+        return {
+            "requests": len(items),
+            "errors": sum(1 for s in items if s.status >= 400 or s.status == 0),
+            "rps": len(items) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(lat, 50) * 1000,
+            "p90_ms": percentile(lat, 90) * 1000,
+            "p99_ms": percentile(lat, 99) * 1000,
+            "max_ms": (lat[-1] if lat else 0.0) * 1000,
+        }
+
+    by_label: Dict[str, List[Sample]] = {}
+    for s in samples:
+        by_label.setdefault(s.label, []).append(s)
+    return {
+        "elapsed_seconds": elapsed,
+        "total": stats(samples),
+        "routes": {label: stats(items) for label, items in sorted(by_label.items())},
+    }
+
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any]) -> List[str]:
+    lines: List[str] = []
+    pairs = [("total", current["summary"]["total"], previous.get("summary", {}).get("total"))]
+    prev_routes = previous.get("summary", {}).get("routes", {})
+    for label, cur in current["summary"]["routes"].items():
+        pairs.append((label, cur, prev_routes.get(label)))
+    for label, cur, prev in pairs:
+        if not prev:
+            lines.append(f"{label}: (比較対象なし)")
+            continue
+        lines.append(
+            f"{label}: rps {prev['rps']:.1f} -> {cur['rps']:.1f}, "
+            f"p99 {prev['p99_ms']:.1f}ms -> {cur['p99_ms']:.1f}ms"
+        )
+    return lines
+
+
+def run_loadtest(
+    target: str,
+    mode: str,
+    threads: int,
+    requests: int,
+    duration: Optional[float] = None,
+    seed: int = 0,
+    base_url: Optional[str] = None,
+) -> Dict[str, Any]:
+    """現在の data_dir() を対象に負荷をかけ、集計結果を返す."""
+    ids = _dataset_ids()
+    mix = build_url_mix(target, ids, requests, seed=seed)
+    # 起動済みサーバ（--url）を叩くときはアプリを import しない（計測する側のプロセスに余計な負荷を載せない）
+    if mode == "inprocess":
+        samples, elapsed = drive(_inprocess_requester(_load_app(target)), mix, threads, duration)
+    elif base_url:
+        samples, elapsed = drive(_http_requester(base_url), mix, threads, duration)
+    else:
+        with local_server(_load_app(target)) as url:
+            samples, elapsed = drive(_http_requester(url), mix, threads, duration)
+    return {
+        "meta": {
+            "target": target,
+            "mode": mode,
+            "threads": threads,
+            "requests": requests,
+            "duration": duration,
+            "seed": seed,
+            "dataset": {k: len(v) for k, v in ids.items()},
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "summary": summarize(samples, elapsed),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Flaskアプリの並行負荷テスト")
+    parser.add_argument("--target", choices=sorted(ROUTES), default="viewer")
+    parser.add_argument("--mode", choices=["inprocess", "server"], default="inprocess")
+    parser.add_argument("--url", help="既に起動済みのサーバのベースURL（--mode server 時）")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500, help="URL列の長さ（--duration 無しなら総リクエスト数）")
+    parser.add_argument("--duration", type=float, help="指定秒数だけURL列を周回する")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-root", type=Path, help="register/data を含むデータセットのルート")
+    parser.add_argument("--scale", choices=sorted(SCALES), help="合成データを生成して使う")
+    parser.add_argument("--out", type=Path, help="結果JSONの出力先")
+    parser.add_argument("--compare", type=Path, help="比較対象の過去結果JSON")
+    args = parser.parse_args(argv)
+
+    with contextlib.ExitStack() as stack:
+        root = args.data_root
+        if args.scale:
+            root = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="kaigitai-load-")))
+            generate_dataset(root, SCALES[args.scale], seed=args.seed)
+        if root is not None:
+            stack.enter_context(use_root(root))
+        report = run_loadtest(
+            args.target,
+            args.mode,
+            args.threads,
+            args.requests,
+            duration=args.duration,
+            seed=args.seed,
+            base_url=args.url,
+        )
+    report["meta"]["scale"] = args.scale
+
+    total = report["summary"]["total"]
+    print(
+        f"[load] {args.target}/{args.mode} threads={args.threads}: "
+        f"{total['requests']} req, {total['rps']:.1f} req/s, "
+        f"p50 {total['p50_ms']:.1f}ms, p99 {total['p99_ms']:.1f}ms, errors {total['errors']}"
+    )
+    for label, route in report["summary"]["routes"].items():
+        print(f"  {label}: {route['rps']:.1f} req/s, p50 {route['p50_ms']:.1f}ms, p99 {route['p99_ms']:.1f}ms")
+
+    out = args.out or RESULTS_DIR / f"load-{args.target}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"結果を保存しました: {out}")
+
+    if args.compare:
+        previous = json.loads(args.compare.read_text(encoding="utf-8"))
+        for line in compare(report, previous):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.generate import SCALES, generate_dataset, use_root
+from src.utils import data_dir, repo_root
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+BenchFn = Callable[[Path], Any]
+
+
+def _load_freeze_module() -> Any:
+    path = repo_root() / "scripts" / "freeze_viewer.py"
+    spec = importlib.util.spec_from_file_location("_bench_freeze_viewer", path)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_load_meetings(root: Path) -> Any:
+    import app as admin_app
+
+    return admin_app.load_meetings()
+
+
+def bench_load_meeting_models(root: Path) -> Any:
+    import viewer
+
+    return viewer.load_meetings()
+
+
+def bench_convert_meeting(root: Path) -> Any:
+    from src.core.convert import convert_group, convert_meeting, convert_person
+
+    group_registry, _ = convert_group(dry_run=True)
+    person_registry, _ = convert_person(dry_run=True)
+    return convert_meeting(group_registry, person_registry, dry_run=True)
+
+
+def _bulk_convert_meeting(workers: int) -> Any:
+    from src.core.convert import convert_group, convert_meeting, convert_person
+
+    # data/meeting を消して全件を書き直す（一括投入）。register に id があるので同じデータに戻る
+    shutil.rmtree(data_dir() / "meeting", ignore_errors=True)
+    group_registry, _ = convert_group(dry_run=True)
+    person_registry, _ = convert_person(dry_run=True)
+    return convert_meeting(group_registry, person_registry, workers=workers)
+
+
+def bench_convert_meeting_bulk(root: Path) -> Any:
+    return _bulk_convert_meeting(workers=1)
+
+
+def bench_convert_meeting_bulk_parallel(root: Path) -> Any:
+    return _bulk_convert_meeting(workers=4)
+
+
+def bench_run_validate(root: Path) -> Any:
+    from src.cli.commands.validate import run_validate
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_validate(changed_only=False)
+
+
+def bench_run_validate_changed(root: Path) -> Any:
+    from src.cli.commands.validate import run_validate
+
+    # 1回目で検証結果を保存し、2回目は変更なしとして再利用する
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_validate(changed_only=True)
+        run_validate(changed_only=True)
+
+
+def bench_build_group_tree(root: Path) -> Any:
+    import viewer
+
+    return viewer.build_group_tree()
+
+
+def bench_render_lists(root: Path) -> Any:
+    import viewer
+
+    # 会議カードが並ぶページ（一覧と団体詳細）をまとめて描画する
+    client = viewer.app.test_client()
+    pages = ["/meeting/"] + [f"/group/{g['id']}/" for g in viewer.load_groups()]
+    return [client.get(url).status_code for url in pages]
+
+
+def bench_freeze(root: Path) -> Any:
+    module = _load_freeze_module()
+    module.app.config["FREEZER_DESTINATION"] = str(root / "build")
+    return module.freeze()
+
+
+BENCHMARKS: Dict[str, BenchFn] = {
+    "load_meetings": bench_load_meetings,
+    "load_meeting_models": bench_load_meeting_models,
+    "convert_meeting": bench_convert_meeting,
+    "convert_meeting_bulk": bench_convert_meeting_bulk,
+    "convert_meeting_bulk_parallel": bench_convert_meeting_bulk_parallel,
+    "run_validate": bench_run_validate,
+    "run_validate_changed": bench_run_validate_changed,
+    "build_group_tree": bench_build_group_tree,
+    "render_lists": bench_render_lists,
+    "freeze": bench_freeze,
+}
+
+
+def measure(fn: BenchFn, root: Path, repeat: int) -> Dict[str, Any]:
+    """repeat 回の実行時間と、別途1回分のピークメモリを計測する."""
+    times: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(root)
+        times.append(time.perf_counter() - start)
+    # tracemalloc は実行を遅くするので計時とは分けて測る
+    tracemalloc.start()
+    try:
+        fn(root)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+        "peak_bytes": peak,
+    }
+
+
+def run_benchmarks(
+    scale_name: str,
+    names: Optional[List[str]] = None,
+    repeat: int = 3,
+    seed: int = 0,
+    workdir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    scale = SCALES[scale_name]
+    selected = names or list(BENCHMARKS)
+    with contextlib.ExitStack() as stack:
+        if workdir is None:
+            workdir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="kaigitai-bench-")))
+        gen_start = time.perf_counter()
+        counts = generate_dataset(workdir, scale, seed=seed)
+        gen_seconds = time.perf_counter() - gen_start
+        results: Dict[str, Any] = {}
+        with use_root(workdir):
+            for name in selected:
+                print(f"[bench] {name} ...", flush=True)
+                results[name] = measure(BENCHMARKS[name], workdir, repeat)
+                print(f"  median {results[name]['median']:.3f}s, peak {results[name]['peak_bytes'] / 1e6:.1f}MB")
+    return {
+        "meta": {
+            "scale": scale_name,
+            "scale_params": asdict(scale),
+            "counts": counts,
+            "seed": seed,
+            "repeat": repeat,
+            "generate_seconds": gen_seconds,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any]) -> List[str]:
+    """2回分の結果を比較し、median と peak の比率を行単位で返す."""
+    lines: List[str] = []
+    prev_results = previous.get("results", {})
+    for name, cur in current["results"].items():
+        prev = prev_results.get(name)
+        if not prev:
+            lines.append(f"{name}: (比較対象なし)")
+            continue
+        time_ratio = cur["median"] / prev["median"] if prev["median"] else float("inf")
+        mem_ratio = cur["peak_bytes"] / prev["peak_bytes"] if prev["peak_bytes"] else float("inf")
+        lines.append(
+            f"{name}: median {prev['median']:.3f}s -> {cur['median']:.3f}s (x{time_ratio:.2f}), "
+            f"peak {prev['peak_bytes'] / 1e6:.1f}MB -> {cur['peak_bytes'] / 1e6:.1f}MB (x{mem_ratio:.2f})"
+        )
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="ホットパスの計時・ピークメモリ計測")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="実行するベンチマーク")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", type=Path, help="合成データの生成先（省略時は一時ディレクトリ）")
+    parser.add_argument("--out", type=Path, help="結果JSONの出力先")
+    parser.add_argument("--compare", type=Path, help="比較対象の過去結果JSON")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.scale, args.only, repeat=args.repeat, seed=args.seed, workdir=args.workdir)
+    out = args.out or RESULTS_DIR / f"{args.scale}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"結果を保存しました: {out}")
+
+    if args.compare:
+        previous = json.loads(args.compare.read_text(encoding="utf-8"))
+        for line in compare(report, previous):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
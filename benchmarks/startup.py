@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.cli.main import COMMANDS
+from src.utils import repo_root
+
+# 起動時に読まれていないことを確認したい重い依存
+HEAVY_MODULES = ("jsonschema", "flask", "jinja2")
+
+# 新しいプロセスで CLI を組み立て、サブコマンドの実装を解決するところまで（実行はしない）を測る
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from src.cli.main import build_parser, load_command
+build_parser()
+target = sys.argv[1]
+if target != "-":
+    load_command(target)
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def probe(command: str) -> Dict[str, Any]:
+    """1回分: プロセス全体の壁時計時間と、import 部分の時間・読み込まれた重い依存."""
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE, command],
+        cwd=repo_root(),
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    return {"wall": wall, "import": result["seconds"], "loaded": result["loaded"]}
+
+
+def run_startup(commands: Optional[List[str]] = None, repeat: int = 5) -> Dict[str, Any]:
+    """"-"（サブコマンドなし）と各サブコマンドについて起動時間の中央値を返す."""
+    results: Dict[str, Any] = {}
+    for command in ["-"] + list(commands or COMMANDS):
+        runs = [probe(command) for _ in range(repeat)]
+        results[command] = {
+            "wall_median": statistics.median(r["wall"] for r in runs),
+            "import_median": statistics.median(r["import"] for r in runs),
+            "loaded": runs[-1]["loaded"],
+        }
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="CLI の起動時間（プロセス起動〜サブコマンドの import）を計測する")
+    parser.add_argument("--only", nargs="*", choices=sorted(COMMANDS), help="計測するサブコマンド")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", type=Path, help="結果JSONの出力先")
+    parser.add_argument("--max-ms", type=float, help="import 時間の中央値がこれを超えるサブコマンドがあれば終了コード 1（CI 用）")
+    args = parser.parse_args(argv)
+
+    results = run_startup(args.only, repeat=args.repeat)
+    slow = []
+    for command, r in results.items():
+        label = "(なし)" if command == "-" else command
+        loaded = ", ".join(r["loaded"]) or "-"
+        print(f"{label:<10} wall {r['wall_median'] * 1000:7.1f}ms  import {r['import_median'] * 1000:7.1f}ms  重い依存: {loaded}")
+        if args.max_ms is not None and r["import_median"] * 1000 > args.max_ms:
+            slow.append(label)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    if slow:
+        print(f"上限 {args.max_ms}ms を超えました: {', '.join(slow)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from src.cli.main import run_menu
+import sys
 
+from src.cli.main import main as cli_main
 
-def main() -> None:
-    run_menu()
+
+def main() -> int:
+    # 引数なしなら対話メニュー、`cli.py convert --dry-run` のようにサブコマンドを付ければ非対話で実行する
+    return cli_main(sys.argv[1:])
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.meeting_index import index_root, rebuild_index
+
+
+def main() -> None:
+    """data/meeting/<uuid>/ から月別パーティション（data/index/meeting/）を作り直す."""
+    index = rebuild_index()
+    for month in sorted(index.counts):
+        print(f"  {month}: {index.counts[month]} 件")
+    print(f"{len(index)} 件を {len(index.counts)} パーティションに分割しました: {index_root()}")
+
+
+if __name__ == "__main__":
+    main()
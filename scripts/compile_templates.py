@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.templating import bytecode_cache_dir, compile_templates
+
+
+def main() -> int:
+    """管理UI・ビューアのテンプレートを事前にコンパイルし、.cache/jinja/ にバイトコードを保存する."""
+    import app as admin_app
+    import viewer
+
+    for name, flask_app in (("app", admin_app.app), ("viewer", viewer.app)):
+        count = compile_templates(flask_app)
+        print(f"{name}: {count} テンプレートをコンパイルしました")
+    print(f"保存先: {bytecode_cache_dir()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,10 +8,30 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from flask_frozen import Freezer
-from viewer import app, build_group_tree, load_groups, load_meetings, load_persons
+from src.core.ical import build_feeds
+from src.core.meeting_index import current_index
+from src.core.static_api import API_VERSION, build_api
+from src.core.static_site import load_state, month_fingerprints, save_state
+from src.templating import render_version
+from viewer import app, build_group_tree, load_groups, load_persons
 
 app.config["FREEZER_DESTINATION"] = str(ROOT / "build")
 
+# URL → ページの材料（データと描画の版）から作ったフィンガープリント（カレンダーフィードと月別一覧）。
+# 前回の出力と同じならそのページは描画し直さない。テンプレートや描画コードが変われば全部作り直す
+_fingerprints: dict = {}
+_frozen: dict = {}
+
+
+def skip_unchanged(url: str, path: str) -> bool:
+    current = _fingerprints.get(url)
+    return current is not None and _frozen.get(url) == current
+
+
+app.config["FREEZER_SKIP_EXISTING"] = skip_unchanged
+# api/ は build_api が自分で差分更新するので、Frozen-Flask の不要ファイル削除から外す
+app.config["FREEZER_DESTINATION_IGNORE"] = ["api/"]
+
 freezer = Freezer(app)
 
 
@@ -29,7 +49,7 @@ def person_detail() -> str:
 
 @freezer.register_generator
 def meeting_detail() -> str:
-    for m in load_meetings():
+    for m in current_index().summaries():
         yield "meeting_detail", {"id": m["id"]}
 
 
@@ -46,5 +66,51 @@ def group_children() -> str:
         yield "group_children", {"id": g["id"]}
 
 
+@freezer.register_generator
+def meeting_month() -> str:
+    for month in current_index().months():
+        yield "meeting_month", {"ym": month}
+
+
+@freezer.register_generator
+def ical_group() -> str:
+    for g in load_groups():
+        yield "ical_group", {"id": g["id"]}
+
+
+@freezer.register_generator
+def ical_tree() -> str:
+    for g in load_groups():
+        yield "ical_tree", {"id": g["id"]}
+
+
+def _page_fingerprints() -> dict:
+    index = current_index()
+    groups = load_groups()
+    group_map = {g["id"]: g["name"] for g in groups}
+    version = render_version(app)
+    fingerprints = {
+        f"/ical/{key}.ics": feed.fingerprint(group_map, version)
+        for key, feed in build_feeds(groups, index.summaries()).items()
+    }
+    fingerprints.update(
+        (f"/meeting/month/{month}/", fp) for month, fp in month_fingerprints(index, group_map, version).items()
+    )
+    return fingerprints
+
+
+def freeze() -> set:
+    destination = Path(app.config["FREEZER_DESTINATION"])
+    _fingerprints.clear()
+    _fingerprints.update(_page_fingerprints())
+    _frozen.clear()
+    _frozen.update(load_state(destination))
+    urls = freezer.freeze()
+    save_state(destination, _fingerprints)
+    api = build_api(destination / "api" / API_VERSION)
+    print(f"api/{API_VERSION}: {len(api.written)} 件書き込み / {len(api.unchanged)} 件変更なし / {len(api.removed)} 件削除")
+    return urls
+
+
 if __name__ == "__main__":
-    freezer.freeze()
+    freeze()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.migrate import ENTITIES, FileResult, checkpoint_path, current_version, migrations_for, run_migrations
+
+
+def main(argv: list[str] | None = None) -> int:
+    """data/ に未適用のマイグレーションをかける（中断しても再実行で続きから）."""
+    parser = argparse.ArgumentParser(description="data/ のスキーマ移行")
+    parser.add_argument("--entity", choices=ENTITIES, action="append", help="対象（複数指定可。省略時はすべて）")
+    parser.add_argument("--dry-run", action="store_true", help="書き込まずに差分だけを表示する")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--restart", action="store_true", help="チェックポイントを捨てて最初からやり直す")
+    parser.add_argument("--list", action="store_true", help="登録済みのマイグレーションを表示する")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for entity in args.entity or ENTITIES:
+            print(f"{entity}: version {current_version(entity)}")
+            for m in migrations_for(entity):
+                print(f"  {m.version:03d} {m.name}")
+        return 0
+
+    def report(result: FileResult) -> None:
+        if result.error:
+            print(f"[error] {result.path}: {result.error}")
+        elif result.changed:
+            print(f"[{'plan' if args.dry_run else 'migrated'}] {result.path} ({', '.join(result.applied)})")
+            if args.dry_run:
+                print(result.diff.rstrip("\n"))
+
+    run = run_migrations(args.entity, dry_run=args.dry_run, workers=args.workers, restart=args.restart, on_result=report)
+    if run.resumed:
+        print(f"チェックポイントから再開: {run.resumed} 件は処理済み")
+    verb = "変更予定" if args.dry_run else "更新"
+    print(f"完了: {len(run.results)} 件を確認、{verb} {len(run.changed)} 件、エラー {len(run.errors)} 件")
+    if run.errors and not args.dry_run:
+        print(f"エラーのあったファイルは再実行で再試行されます（{checkpoint_path()}）")
+    return 1 if run.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,31 +1,55 @@
 from __future__ import annotations
 
-from src.core.convert import convert_group, convert_meeting, convert_person
+from typing import List, Optional
 
+from src.core.convert import PlanEntry, convert_group, convert_meeting, convert_person
 
-def run_convert() -> None:
-    dry = input("dry-runで実行しますか？ (y/N): ").strip().lower() == "y"
-    strict = input("未登録nameはエラーにしますか？ (Y/n): ").strip().lower() != "n"
+
+def run_convert(dry_run: Optional[bool] = None, strict: Optional[bool] = None, workers: int = 1) -> bool:
+    """register→data 変換。引数を省略した項目だけ対話で尋ねる。meeting にエラーが無ければ True.
+
+    workers > 1 なら meeting の検証・直列化を複数プロセスで行う（出力は workers=1 と同じ）。
+    """
+    dry = dry_run if dry_run is not None else input("dry-runで実行しますか？ (y/N): ").strip().lower() == "y"
+    if strict is None:
+        strict = input("未登録nameはエラーにしますか？ (Y/n): ").strip().lower() != "n"
 
     print("[convert] group を処理します")
     group_registry, group_result = convert_group(dry_run=dry)
-    print(f"  created: {group_result.created}, updated: {group_result.updated}")
+    print(f"  created: {group_result.created}, updated: {group_result.updated}, unchanged: {group_result.unchanged}")
 
     print("[convert] person を処理します")
     person_registry, person_result = convert_person(dry_run=dry)
-    print(f"  created: {person_result.created}, updated: {person_result.updated}")
+    print(f"  created: {person_result.created}, updated: {person_result.updated}, unchanged: {person_result.unchanged}")
 
     print("[convert] meeting を処理します")
-    meeting_result = convert_meeting(group_registry, person_registry, dry_run=dry, strict_missing=strict)
-    print(f"  created: {meeting_result.created}, updated: {meeting_result.updated}, skipped: {meeting_result.skipped}")
+    meeting_result = convert_meeting(group_registry, person_registry, dry_run=dry, strict_missing=strict, workers=workers)
+    print(
+        f"  created: {meeting_result.created}, updated: {meeting_result.updated}, "
+        f"unchanged: {meeting_result.unchanged}, skipped: {meeting_result.skipped}"
+    )
     if meeting_result.errors:
         print("  errors:")
         for err in meeting_result.errors:
             print(f"    - {err}")
 
     if dry:
-        print("dry-runのためファイルは書き込みません。予定出力:")
-        for p in group_result.planned + person_result.planned + meeting_result.planned:
-            print(f"  - {p}")
+        print("dry-runのためファイルは書き込みません。予定:")
+        print_plan(group_result.plan + person_result.plan + meeting_result.plan)
     else:
         print("変換完了")
+    return not meeting_result.errors
+
+
+def print_plan(plan: List[PlanEntry]) -> None:
+    """新規・変更のあるレコードだけを出し、変更はフィールド単位の差分を添える."""
+    counts = {"new": 0, "modified": 0, "unchanged": 0}
+    for entry in plan:
+        counts[entry.status] += 1
+        if entry.status == "new":
+            print(f"  + {entry.path}")
+        elif entry.status == "modified":
+            print(f"  ~ {entry.path}")
+            for line in entry.changes:
+                print(f"      {line}")
+    print(f"  new: {counts['new']}, modified: {counts['modified']}, unchanged: {counts['unchanged']}")
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from src.core.dedup import describe, find_duplicates, merge, reference_counts
+from src.core.integrity import iter_entity_records, iter_meeting_records
+from src.utils import data_dir
+
+
+def run_dedup(interactive: bool = True) -> None:
+    """重複候補のクラスタを表示し、選んだものを1件に統合する（interactive=False なら表示だけ）."""
+    meetings = list(iter_meeting_records())
+    merged_any = False
+    for entity in ("group", "person"):
+        records: Dict[str, Dict[str, Any]] = {r["id"]: r for r in iter_entity_records(data_dir() / entity)}
+        clusters = find_duplicates(entity, records.values())
+        print(f"[dedup] {entity}: {len(records)} 件中 重複候補 {len(clusters)} クラスタ")
+        if not clusters:
+            continue
+        refs = reference_counts(entity, meetings)
+        for n, cluster in enumerate(clusters, 1):
+            print(f"  #{n}")
+            for i, rid in enumerate(cluster.ids, 1):
+                print(f"    {i}) {rid}  {describe(records[rid])}  (会議参照 {refs.get(rid, 0)} 件)")
+            for reason in cluster.reasons:
+                print(f"       - {reason}")
+            if not interactive:
+                continue
+            choice = input("    残す番号を入力すると統合します（空でスキップ）: ").strip()
+            if not choice:
+                continue
+            if not choice.isdigit() or not 1 <= int(choice) <= len(cluster.ids):
+                print("    無効な番号のためスキップしました")
+                continue
+            survivor = cluster.ids[int(choice) - 1]
+            try:
+                result = merge(entity, survivor, [rid for rid in cluster.ids if rid != survivor])
+            except ValueError as e:
+                print(f"    統合できませんでした: {e}")
+                continue
+            merged_any = True
+            print(
+                f"    統合しました: 会議 {len(result.meetings)} 件・group {len(result.groups)} 件の参照を付け替え、"
+                f"{len(result.removed)} ファイルを削除"
+            )
+            if result.meetings:
+                meetings = list(iter_meeting_records())
+    if merged_any:
+        print("register/ に重複した name が残っていると再変換で再び作られるため、あわせて修正してください")
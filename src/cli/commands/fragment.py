@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
+from typing import Iterable, List
 
-from src.core.loader import load_json_files
-from src.core.writer import write_json_file
+from src.core.loader import load_json_file
+from src.core.writer import serialize_json, write_serialized
 from src.utils import data_dir, schema_fragment_dir
 
 
@@ -12,21 +12,32 @@ def _collect_names(dir_path: Path) -> List[str]:
     names: List[str] = []
     if not dir_path.exists():
         return names
-    for obj in load_json_files(dir_path):
-        name = obj.get("name")
+    for file in sorted(dir_path.glob("*.json")):
+        name = load_json_file(file).get("name")
         if name:
             names.append(name)
     return names
 
 
-def run_fragment() -> None:
-    fragments_dir = schema_fragment_dir()
-    fragments_dir.mkdir(parents=True, exist_ok=True)
+def write_fragment(entity: str, names: Iterable[str]) -> List[Path]:
+    """name一覧を docs/schema/fragment/{entity}_names.json に書き出す.
 
-    group_names = _collect_names(data_dir() / "group")
-    write_json_file(fragments_dir / "group_names.json", {"enum": group_names})
+    enum は重複を除いて並べた name 集合にし、集合が変わらなければ書き直さない。書き直したファイルを返す。
+    """
+    dest = schema_fragment_dir() / f"{entity}_names.json"
+    text = serialize_json({"enum": sorted({n for n in names if n})})
+    try:
+        if dest.read_text(encoding="utf-8") == text:
+            return []
+    except FileNotFoundError:
+        pass
+    write_serialized(dest, text)
+    return [dest]
 
-    person_names = _collect_names(data_dir() / "person")
-    write_json_file(fragments_dir / "person_names.json", {"enum": person_names})
 
+def run_fragment() -> None:
+    for entity in ("group", "person"):
+        written = write_fragment(entity, _collect_names(data_dir() / entity))
+        status = ", ".join(p.name for p in written) if written else "変更なし"
+        print(f"[fragment] {entity}: {status}")
     print("fragment生成完了")
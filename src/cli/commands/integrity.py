@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from src.core.integrity import run_check
+
+
+def run_integrity() -> bool:
+    report = run_check()
+    counts = report.counts
+    print(f"[integrity] group: {counts['group']}, person: {counts['person']}, meeting: {counts['meeting']}")
+    if report.ok:
+        print("参照整合性の問題はありません")
+        return True
+    for kind, issues in report.by_kind().items():
+        print(f"  {kind}: {len(issues)} 件")
+        for issue in issues:
+            print(f"    - [{issue.entity} {issue.id}] {issue.message}")
+    print(f"問題 {len(report.issues)} 件")
+    return False
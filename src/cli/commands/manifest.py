@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+from src.core.manifest import build_manifest, diff_manifests, file_hashes, latest_path, load_manifest, write_manifest
+
+SHOW_LIMIT = 20
+
+
+def run_manifest(base: Optional[str] = None, dest: Optional[str] = None) -> None:
+    """引数を省略した項目だけ対話で尋ねる（空文字は既定のパス）."""
+    raw_base = base if base is not None else input(f"比較するマニフェスト（空欄で {latest_path()}）: ").strip()
+    raw_dest = dest if dest is not None else input(f"保存先（空欄で {latest_path()}）: ").strip()
+    previous = load_manifest(Path(raw_base) if raw_base else None)
+    # 前回のマニフェストがあれば (mtime, size) の同じファイルはハッシュを計算し直さない
+    manifest = build_manifest(load_manifest() or previous)
+    print(f"[manifest] root: {manifest['root']}")
+    for entity, ent in manifest["entities"].items():
+        count = sum(len(b["files"]) for b in ent["buckets"].values())
+        print(f"  {entity}: {ent['root'][:16]} ({count} 件)")
+
+    if previous is None:
+        print(f"比較対象がないため全 {len(file_hashes(manifest))} 件を新規として扱います")
+    else:
+        diff = diff_manifests(previous, manifest)
+        if not diff:
+            print("前回から変更はありません")
+        for label, paths in (("追加", diff.added), ("変更", diff.modified), ("削除", diff.removed)):
+            if not paths:
+                continue
+            print(f"  {label}: {len(paths)} 件")
+            for rel in paths[:SHOW_LIMIT]:
+                print(f"    - {rel}")
+            if len(paths) > SHOW_LIMIT:
+                print(f"    ...（ほか {len(paths) - SHOW_LIMIT} 件）")
+    saved = write_manifest(manifest, Path(raw_dest) if raw_dest else None)
+    print(f"保存しました: {saved}")
@@ -1,13 +1,109 @@
 from __future__ import annotations
 
+import hashlib
+import json
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, List, Optional
 
-from src.core.loader import load_json_file, load_json_files
+from jsonschema.exceptions import ValidationError
+
+from src.core.loader import load_json_file
+from src.core.manifest import build_manifest, diff_manifests, file_hash, file_hashes
 from src.core.validator import validate_with_schema
-from src.utils import data_dir, register_dir, schema_base_dir
+from src.core.writer import write_json_atomic
+from src.utils import data_dir, index_dir, register_dir, schema_base_dir
+
+
+def schema_for_path(path: Path) -> Optional[Path]:
+    """register/data 配下のファイルパスから対応するスキーマを返す（対象外は None）."""
+    base = schema_base_dir()
+    path = path.resolve()
+    for entity, schema_name in (
+        ("group", "group.register.schema.json"),
+        ("person", "person.register.schema.json"),
+        ("meeting", "meeting.basic.register.schema.json"),
+    ):
+        if path == (register_dir() / entity / "form.json").resolve():
+            return base / schema_name
+    data = data_dir().resolve()
+    if path.parent == data / "group" and path.suffix == ".json":
+        return base / "group.data.schema.json"
+    if path.parent == data / "person" and path.suffix == ".json":
+        return base / "person.data.schema.json"
+    if path.parent.parent == data / "meeting" and path.name == "basic.json":
+        return base / "meeting.basic.data.schema.json"
+    return None
+
+
+def validation_state_path() -> Path:
+    return index_dir() / "manifest" / "validated.json"
+
+
+def schema_key() -> str:
+    """検証結果を左右するファイル（スキーマ）の内容から作るキー."""
+    paths = sorted(schema_base_dir().glob("*.json"))
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(f"{path.name}\0{file_hash(path)}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+@dataclass
+class ValidateReport:
+    checked: List[str] = field(default_factory=list)
+    reused: int = 0
+    failures: Dict[str, str] = field(default_factory=dict)
 
 
-def run_validate() -> None:
+def validate_data(changed_only: bool = True) -> ValidateReport:
+    """data/ を検証する。changed_only なら前回の検証時のマニフェストと比べ、追加・変更されたファイルだけを検証する.
+
+    スキーマが変わっていたら全件を検証し直す。結果（失敗したファイル）はマニフェストと一緒に保存する。
+    """
+    try:
+        state = json.loads(validation_state_path().read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        state = {}
+    key = schema_key()
+    previous = state.get("manifest")
+    # ハッシュの再計算は schema に関係なく前回のマニフェストを使って省く
+    manifest = build_manifest(previous)
+    baseline = previous if changed_only and state.get("schema_key") == key else None
+
+    report = ValidateReport()
+    if baseline is None:
+        targets = sorted(file_hashes(manifest))
+    else:
+        diff = diff_manifests(baseline, manifest)
+        targets = diff.changed
+        skip = set(targets) | set(diff.removed)
+        report.failures = {rel: msg for rel, msg in (state.get("failures") or {}).items() if rel not in skip}
+        report.reused = len(file_hashes(manifest)) - len(targets)
+    for rel in targets:
+        path = data_dir() / rel
+        try:
+            validate_file(path)
+        except (ValidationError, ValueError) as e:
+            report.failures[rel] = getattr(e, "message", str(e))
+        report.checked.append(rel)
+
+    write_json_atomic(validation_state_path(), {"schema_key": key, "manifest": manifest, "failures": report.failures})
+    return report
+
+
+def validate_file(path: Path) -> bool:
+    """1ファイルだけを検証する。対象外のパスなら False を返す."""
+    schema = schema_for_path(path)
+    if schema is None:
+        return False
+    validate_with_schema(load_json_file(path), schema)
+    return True
+
+
+def run_validate(changed_only: Optional[bool] = None) -> None:
+    if changed_only is None:
+        changed_only = input("前回の検証から変更されたファイルだけを検証しますか？ (Y/n): ").strip().lower() != "n"
     base = schema_base_dir()
     # register
     register_targets = [
@@ -22,27 +118,14 @@ def run_validate() -> None:
         payload = load_json_file(path)
         validate_with_schema(payload, schema)
 
-    # data (group/person)
-    data_targets = [
-        (data_dir() / "group", base / "group.data.schema.json"),
-        (data_dir() / "person", base / "person.data.schema.json"),
-    ]
-    for dir_path, schema in data_targets:
-        if not dir_path.exists():
-            continue
-        schema_path = schema
-        for obj in load_json_files(dir_path):
-            validate_with_schema(obj, schema_path)
-
-    # meeting basic
-    meeting_dir = data_dir() / "meeting"
-    schema_path = base / "meeting.basic.data.schema.json"
-    if meeting_dir.exists():
-        for sub in meeting_dir.iterdir():
-            path = sub / "basic.json"
-            if path.exists():
-                payload = load_json_file(path)
-                validate_with_schema(payload, schema_path)
-                print(f"[validate data] {path}")
-
+    # data（group/person/meeting）
+    report = validate_data(changed_only=changed_only)
+    for rel in report.checked:
+        print(f"[validate data] {rel}")
+    if report.reused:
+        print(f"  前回の検証から変わっていない {report.reused} 件は結果を再利用しました")
+    if report.failures:
+        for rel, message in sorted(report.failures.items()):
+            print(f"[invalid] {rel}: {message}")
+        raise ValueError(f"スキーマ検証エラー: {len(report.failures)} 件")
     print("検証完了")
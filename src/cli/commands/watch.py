@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from src.cli.commands.fragment import write_fragment
+from src.cli.commands.validate import schema_for_path, validate_file
+from src.core.convert import convert_group, convert_meeting, convert_person, load_data_registry
+from src.core.loader import load_json_file
+from src.utils import data_dir, register_dir
+
+Stamp = Tuple[int, int]
+ENTITIES = ("group", "person", "meeting")
+
+
+def _scan_dir(dir_path: Path, out: Dict[Path, Stamp], nested: bool = False) -> None:
+    if not dir_path.exists():
+        return
+    with os.scandir(dir_path) as it:
+        for entry in it:
+            if nested:
+                if entry.is_dir():
+                    basic = Path(entry.path) / "basic.json"
+                    try:
+                        st = basic.stat()
+                    except FileNotFoundError:
+                        continue
+                    out[basic] = (st.st_mtime_ns, st.st_size)
+            elif entry.name.endswith(".json") and entry.is_file():
+                st = entry.stat()
+                out[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+
+
+def snapshot() -> Dict[Path, Stamp]:
+    """監視対象ファイルの (mtime_ns, size) を集める."""
+    stamps: Dict[Path, Stamp] = {}
+    for entity in ENTITIES:
+        form = register_dir() / entity / "form.json"
+        if form.exists():
+            st = form.stat()
+            stamps[form] = (st.st_mtime_ns, st.st_size)
+    _scan_dir(data_dir() / "group", stamps)
+    _scan_dir(data_dir() / "person", stamps)
+    _scan_dir(data_dir() / "meeting", stamps, nested=True)
+    return stamps
+
+
+def diff_snapshots(before: Dict[Path, Stamp], after: Dict[Path, Stamp]) -> Tuple[Set[Path], Set[Path]]:
+    """(変更・追加されたパス, 削除されたパス) を返す."""
+    changed = {p for p, stamp in after.items() if before.get(p) != stamp}
+    removed = set(before) - set(after)
+    return changed, removed
+
+
+@dataclass
+class WatchState:
+    stamps: Dict[Path, Stamp] = field(default_factory=dict)
+    # data/{group,person}/*.json の path→name（fragment 再生成の要否判定用）
+    names: Dict[str, Dict[Path, str]] = field(default_factory=lambda: {"group": {}, "person": {}})
+    strict_missing: bool = False
+
+    @classmethod
+    def initial(cls, strict_missing: bool = False) -> "WatchState":
+        state = cls(stamps=snapshot(), strict_missing=strict_missing)
+        for entity in ("group", "person"):
+            for path in state.stamps:
+                if path.parent == data_dir() / entity:
+                    state.names[entity][path] = _read_name(path)
+        return state
+
+
+def _read_name(path: Path) -> str:
+    try:
+        return load_json_file(path).get("name") or ""
+    except (OSError, ValueError):
+        return ""
+
+
+def _register_entity(path: Path) -> Optional[str]:
+    for entity in ENTITIES:
+        if path == register_dir() / entity / "form.json":
+            return entity
+    return None
+
+
+def _reconvert(entities: Set[str], strict_missing: bool) -> None:
+    """変更があった種別だけを register→data 変換する."""
+    group_registry = None
+    person_registry = None
+    if "group" in entities:
+        group_registry, result = convert_group()
+        print(f"[watch] group 再変換 created: {result.created}, updated: {result.updated}, unchanged: {result.unchanged}")
+    if "person" in entities:
+        person_registry, result = convert_person()
+        print(f"[watch] person 再変換 created: {result.created}, updated: {result.updated}, unchanged: {result.unchanged}")
+    if "meeting" in entities:
+        result = convert_meeting(
+            group_registry or load_data_registry("group"),
+            person_registry or load_data_registry("person"),
+            strict_missing=strict_missing,
+        )
+        print(
+            f"[watch] meeting 再変換 created: {result.created}, updated: {result.updated}, "
+            f"unchanged: {result.unchanged}, skipped: {result.skipped}"
+        )
+        for err in result.errors:
+            print(f"    - {err}")
+
+
+def _update_names(state: WatchState, changed: Set[Path], removed: Set[Path]) -> Set[str]:
+    """name の集合が変わった種別を返す."""
+    touched: Set[str] = set()
+    for entity in ("group", "person"):
+        dir_path = data_dir() / entity
+        names = state.names[entity]
+        before = set(names.values())
+        hit = False
+        for path in removed:
+            if path.parent == dir_path:
+                names.pop(path, None)
+                hit = True
+        for path in changed:
+            if path.parent == dir_path:
+                names[path] = _read_name(path)
+                hit = True
+        if hit and set(names.values()) != before:
+            touched.add(entity)
+    return touched
+
+
+def process_changes(state: WatchState, changed: Set[Path], removed: Set[Path]) -> None:
+    """1バッチ分の変更を処理する（再変換→対象ファイルのみ検証→必要ならfragment再生成）."""
+    entities = {e for e in (_register_entity(p) for p in changed) if e}
+    if entities:
+        _reconvert(entities, state.strict_missing)
+        # 変換で書き込まれた data もこのバッチで検証する
+        after = snapshot()
+        more_changed, more_removed = diff_snapshots(state.stamps, after)
+        changed = changed | more_changed
+        removed = removed | more_removed
+        state.stamps = after
+
+    failures = 0
+    checked = 0
+    for path in sorted(changed):
+        if schema_for_path(path) is None:
+            continue
+        try:
+            validate_file(path)
+            checked += 1
+        except Exception as e:  # noqa: BLE001
+            failures += 1
+            print(f"[watch] 検証エラー {path}: {e}")
+    if checked or failures:
+        print(f"[watch] 検証 {checked} 件OK, {failures} 件エラー")
+
+    for entity in sorted(_update_names(state, changed, removed)):
+        for dest in write_fragment(entity, state.names[entity].values()):
+            print(f"[watch] fragment 再生成: {dest}")
+
+
+def run_watch(
+    interval: float = 1.0,
+    debounce: float = 0.5,
+    strict_missing: bool = False,
+    max_batches: Optional[int] = None,
+) -> None:
+    """register/ と data/ をポーリング監視し、変更のあった部分だけを処理する.
+
+    変更検知後は debounce 秒間追加の変更が無くなるまで待ってからまとめて処理する。
+    """
+    state = WatchState.initial(strict_missing=strict_missing)
+    print(f"[watch] 監視開始（{len(state.stamps)} files, interval={interval}s）。Ctrl+C で終了")
+    batches = 0
+    try:
+        while max_batches is None or batches < max_batches:
+            time.sleep(interval)
+            current = snapshot()
+            changed, removed = diff_snapshots(state.stamps, current)
+            if not changed and not removed:
+                continue
+            # 連続した保存をまとめる
+            while True:
+                time.sleep(debounce)
+                latest = snapshot()
+                if latest == current:
+                    break
+                current = latest
+            changed, removed = diff_snapshots(state.stamps, current)
+            state.stamps = current
+            try:
+                process_changes(state, changed, removed)
+            except Exception as e:  # noqa: BLE001
+                print(f"[watch] 処理に失敗しました: {e}")
+            batches += 1
+    except KeyboardInterrupt:
+        print("[watch] 終了します")
@@ -1,26 +1,108 @@
 from __future__ import annotations
 
-from typing import Callable, Dict
+import argparse
+import importlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from src.cli.commands.convert import run_convert
-from src.cli.commands.fragment import run_fragment
-from src.cli.commands.validate import run_validate
+# コマンドの実装は選ばれたときに初めて import する（jsonschema などの重い依存を起動時に読まない）
+# メニュー番号 → (説明, "モジュール:関数")
+MENU: Dict[str, Tuple[str, str]] = {
+    "1": ("register→data 変換", "src.cli.commands.convert:run_convert"),
+    "2": ("スキーマ検証のみ", "src.cli.commands.validate:run_validate"),
+    "3": ("fragment生成", "src.cli.commands.fragment:run_fragment"),
+    "4": ("監視モード（変更分だけ変換・検証）", "src.cli.commands.watch:run_watch"),
+    "5": ("参照整合性チェック", "src.cli.commands.integrity:run_integrity"),
+    "6": ("重複候補の検出・統合", "src.cli.commands.dedup:run_dedup"),
+    "7": ("データセットのマニフェスト作成・比較", "src.cli.commands.manifest:run_manifest"),
+}
 
-MenuAction = Callable[[], None]
+# サブコマンド名 → "モジュール:関数"
+COMMANDS: Dict[str, str] = {
+    "convert": MENU["1"][1],
+    "validate": MENU["2"][1],
+    "fragment": MENU["3"][1],
+    "watch": MENU["4"][1],
+    "integrity": MENU["5"][1],
+    "dedup": MENU["6"][1],
+    "manifest": MENU["7"][1],
+}
+
+
+def load_command(target: str) -> Callable[..., Any]:
+    """"モジュール:関数" またはサブコマンド名から関数を import して返す."""
+    module_name, _, func_name = COMMANDS.get(target, target).partition(":")
+    return getattr(importlib.import_module(module_name), func_name)
 
 
 def run_menu() -> None:
-    menu: Dict[str, MenuAction] = {
-        "1": run_convert,
-        "2": run_validate,
-        "3": run_fragment,
-    }
-    print("1) register→data 変換")
-    print("2) スキーマ検証のみ")
-    print("3) fragment生成")
-    choice = input("選択肢を入力してください (1-3): ").strip()
-    action = menu.get(choice)
-    if action is None:
-        print("無効な選択です。1-3から選んでください。")
+    for key, (label, _) in MENU.items():
+        print(f"{key}) {label}")
+    choice = input(f"選択肢を入力してください (1-{len(MENU)}): ").strip()
+    entry = MENU.get(choice)
+    if entry is None:
+        print(f"無効な選択です。1-{len(MENU)}から選んでください。")
         return
-    action()
+    load_command(entry[1])()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="kaigitai データ管理CLI（サブコマンド省略時は対話メニュー）",
+    )
+    sub = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    p = sub.add_parser("convert", help="register→data 変換")
+    p.add_argument("--dry-run", action="store_true", help="書き込まずに計画だけを表示する")
+    p.add_argument("--no-strict", dest="strict", action="store_false", help="未登録nameをエラーにしない")
+    p.add_argument("--workers", type=int, default=1, help="meeting の検証・直列化に使うプロセス数（既定 1 = 逐次）")
+    p.set_defaults(kwargs=lambda a: {"dry_run": a.dry_run, "strict": a.strict, "workers": a.workers})
+
+    p = sub.add_parser("validate", help="スキーマ検証")
+    p.add_argument("--all", action="store_true", help="前回の結果を使わず全ファイルを検証する")
+    p.set_defaults(kwargs=lambda a: {"changed_only": not a.all})
+
+    p = sub.add_parser("fragment", help="nameフラグメント生成")
+    p.set_defaults(kwargs=lambda a: {})
+
+    p = sub.add_parser("watch", help="監視モード")
+    p.add_argument("--interval", type=float, default=1.0)
+    p.add_argument("--debounce", type=float, default=0.5)
+    p.add_argument("--strict", action="store_true", help="未登録nameをエラーにする")
+    p.set_defaults(kwargs=lambda a: {"interval": a.interval, "debounce": a.debounce, "strict_missing": a.strict})
+
+    p = sub.add_parser("integrity", help="参照整合性チェック")
+    p.set_defaults(kwargs=lambda a: {})
+
+    p = sub.add_parser("dedup", help="重複候補の一覧（統合は対話メニューから）")
+    p.set_defaults(kwargs=lambda a: {"interactive": False})
+
+    p = sub.add_parser("manifest", help="マニフェスト作成・比較")
+    p.add_argument("--base", help="比較するマニフェスト（省略時は前回保存分）")
+    p.add_argument("--out", help="保存先（省略時は data/index/manifest/latest.json）")
+    p.set_defaults(kwargs=lambda a: {"base": a.base or "", "dest": a.out or ""})
+    return parser
+
+
+def _describe_error(e: Exception) -> str:
+    # jsonschema の ValidationError は message だけで十分（str() はスキーマ全体を含む）
+    message = getattr(e, "message", None) or str(e)
+    # 入力の誤りとして送出する素の ValueError はメッセージだけ、それ以外は例外の種類も添える
+    return message if type(e) is ValueError else f"{type(e).__name__}: {message}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """サブコマンドがあれば非対話で実行し、終了コードを返す（失敗時 1）.
+
+    コマンドが送出した例外はトレースバックを出さずに1行で表示する。
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command is None:
+            run_menu()
+            return 0
+        ok = load_command(args.command)(**args.kwargs(args))
+    except Exception as e:  # noqa: BLE001
+        print(f"[error] {_describe_error(e)}")
+        return 1
+    return 1 if ok is False else 0
@@ -1,24 +1,78 @@
 from __future__ import annotations
 
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List
+from queue import Queue
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from uuid import uuid4
 
+from src.core.digest import DigestCache, payload_digest
+from src.core.journal import Mutation, record_changes
 from src.core.loader import load_json_file, load_json_files
-from src.core.resolver import NameRegistry
+from src.core.lock import locked
+from src.core.meeting_index import update_meetings
+from src.core.migrate import stamp_version
+from src.core.resolver import NameRegistry, UnresolvedName
+from src.core.sources import normalize_sources
 from src.core.validator import validate_with_schema
-from src.core.writer import write_json_file
+from src.core.writer import serialize_json, write_json_file, write_serialized
 from src.utils import data_dir, register_dir, schema_base_dir
 
+# パイプライン実行で、書き込み待ちとして溜めておく件数の上限
+WRITE_QUEUE_SIZE = 256
+
 
 @dataclass
 class ConvertResult:
     created: int
     updated: int
     skipped: int = 0
+    unchanged: int = 0
     errors: List[str] = field(default_factory=list)
     planned: List[Path] = field(default_factory=list)
+    # dry-run 時のレコードごとの判定（new / unchanged / modified）
+    plan: List["PlanEntry"] = field(default_factory=list)
+
+
+@dataclass
+class PlanEntry:
+    path: Path
+    status: str
+    changes: List[str] = field(default_factory=list)
+
+
+def _short(value: Any, limit: int = 60) -> str:
+    text = json.dumps(value, ensure_ascii=False)
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def field_diff(old: Any, new: Any, prefix: str = "") -> List[str]:
+    """2つのレコードの違いを「フィールド: 旧 → 新」の行で返す。dict は入れ子のキーまで辿る."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        lines: List[str] = []
+        for key in list(old) + [k for k in new if k not in old]:
+            name = f"{prefix}.{key}" if prefix else str(key)
+            if key not in new:
+                lines.append(f"{name}: 削除 ({_short(old[key])})")
+            elif key not in old:
+                lines.append(f"{name}: 追加 {_short(new[key])}")
+            elif old[key] != new[key]:
+                lines.extend(field_diff(old[key], new[key], name))
+        return lines
+    if old == new:
+        return []
+    if isinstance(old, list) and isinstance(new, list) and all(isinstance(x, str) for x in old + new):
+        added = [x for x in new if x not in old]
+        removed = [x for x in old if x not in new]
+        if not added and not removed:
+            return [f"{prefix}: 並び順のみ変更"]
+        parts = ([f"+{_short(added)}"] if added else []) + ([f"-{_short(removed)}"] if removed else [])
+        return [f"{prefix}: {' '.join(parts)}"]
+    return [f"{prefix}: {_short(old)} → {_short(new)}"]
 
 
 def _load_register(path: Path, schema: Path) -> List[Dict[str, Any]]:
@@ -45,51 +99,188 @@ def _load_existing_group_registry() -> Dict[str, str]:
     return existing
 
 
-def _normalize_sources(raw: Any) -> Dict[str, Any]:
-    """registerのsourcesを新スキーマに揃える."""
-    if not raw:
+def _person_key(name: str, yomi: Optional[str]) -> Tuple[str, str]:
+    return NameRegistry._normalize(name), NameRegistry._normalize(yomi or "")
+
+
+def _load_existing_person_registry() -> Dict[Tuple[str, str], str]:
+    """既存data/personの (name, name_yomi)→id を取得する."""
+    person_dir = data_dir() / "person"
+    if not person_dir.exists():
         return {}
-    if isinstance(raw, dict):
-        other_list = []
-        for item in raw.get("other") or []:
-            other_list.append({"url": item["url"], "title": item.get("title")})
-        return {
-            "meeting_page": raw.get("meeting_page"),
-            "transcript": raw.get("transcript"),
-            "announcement": raw.get("announcement") or raw.get("notice"),
-            "other": other_list,
-        }
-    # 旧形式(array)のフォールバック
-    meeting_page = None
-    transcript = None
-    announcement = None
-    other_items: List[Dict[str, Any]] = []
-    for item in raw:
-        url = item.get("url") if isinstance(item, dict) else None
-        if not url:
+    existing: Dict[Tuple[str, str], str] = {}
+    for rec in load_json_files(person_dir):
+        name = rec.get("name")
+        pid = rec.get("id")
+        if not name or not pid:
             continue
-        stype = item.get("source_type") if isinstance(item, dict) else None
-        title = item.get("title") if isinstance(item, dict) else None
-        if stype == "meeting_page" and not meeting_page:
-            meeting_page = url
-        elif stype in ("minutes", "transcript") and not transcript:
-            transcript = url
-        elif stype in ("announcement", "notice") and not announcement:
-            announcement = url
-        else:
-            other_items.append({"url": url, "title": title})
-    result: Dict[str, Any] = {}
-    if meeting_page:
-        result["meeting_page"] = meeting_page
-    if transcript:
-        result["transcript"] = transcript
-    if announcement:
-        result["announcement"] = announcement
-    if other_items:
-        result["other"] = other_items
-    return result
+        existing[_person_key(name, rec.get("name_yomi"))] = pid
+    return existing
+
+
+MeetingKey = Tuple[str, int, str]
+
+
+def _load_existing_meeting_registry() -> Dict[MeetingKey, str]:
+    """既存data/meetingの (main.group_id, main.num, date)→id を取得する."""
+    meeting_dir = data_dir() / "meeting"
+    if not meeting_dir.exists():
+        return {}
+    existing: Dict[MeetingKey, str] = {}
+    for folder in sorted(p for p in meeting_dir.iterdir() if p.is_dir()):
+        basic = folder / "basic.json"
+        if not basic.exists():
+            continue
+        rec = load_json_file(basic)
+        main = rec.get("main") or {}
+        if not main.get("group_id") or rec.get("date") is None:
+            continue
+        existing[(main["group_id"], main.get("num"), rec["date"])] = rec.get("id") or folder.name
+    return existing
+
+
+def _plan(result: ConvertResult, dest: Path, current: Optional[str], output: Dict[str, Any]) -> None:
+    if current is None:
+        result.plan.append(PlanEntry(dest, "new"))
+    else:
+        result.plan.append(PlanEntry(dest, "modified", field_diff(load_json_file(dest), output)))
+
+
+def _emit(
+    dest: Path,
+    output: Dict[str, Any],
+    data_schema: Path,
+    dry_run: bool,
+    result: ConvertResult,
+    digests: DigestCache,
+) -> bool:
+    """内容が変わらないレコードは検証・書き込みを省略し unchanged として数える。書き込んだら True.
+
+    既存ファイルとの比較は正規化した JSON のダイジェストで行い、前回から変わっていないファイルは読まない。
+    """
+    digest = payload_digest(output)
+    current = digests.digest(dest)
+    if dry_run:
+        result.planned.append(dest)
+    if current == digest:
+        result.unchanged += 1
+        if dry_run:
+            result.plan.append(PlanEntry(dest, "unchanged"))
+        return False
+    validate_with_schema(output, data_schema)
+    if dry_run:
+        _plan(result, dest, current, output)
+        return False
+    write_json_file(dest, output)
+    digests.record(dest, digest)
+    # 件数は書き込めた分だけ数える
+    result.updated += 1 if current is not None else 0
+    result.created += 0 if current is not None else 1
+    return True
+
 
+def _prepare(schema_path: str, output: Dict[str, Any]) -> Optional[str]:
+    """プロセスプール側で検証と直列化を行う。検証に失敗したら None（例外は親プロセスで作り直す）."""
+    try:
+        validate_with_schema(output, Path(schema_path))
+    except Exception:  # noqa: BLE001  例外オブジェクトはプロセス間で受け渡さない
+        return None
+    return serialize_json(output)
 
+
+def _emit_pipelined(
+    items: List[Tuple[Path, Dict[str, Any]]],
+    data_schema: Path,
+    dry_run: bool,
+    result: ConvertResult,
+    digests: DigestCache,
+    workers: int,
+    written: List[Dict[str, Any]],
+) -> None:
+    """_emit をまとめて行う並列版。書き込んだレコードは書き込んだ順に written へ追加する（途中で失敗しても残る）.
+
+    変更のあるレコードだけを検証・直列化のためプロセスプールへ送り、結果は元の順に受け取る。
+    書き込みは1本のスレッドが順に行う（待ち行列は WRITE_QUEUE_SIZE 件まで）。
+    件数・plan・書き込み順・例外は逐次版と同じになる。
+    """
+    stamped = []
+    pending: List[Dict[str, Any]] = []
+    # 同じ実行で先に出力する dest のダイジェスト（逐次版では書き込み後の digests.record で見えるもの）
+    seen: Dict[Path, str] = {}
+    for dest, output in items:
+        digest = payload_digest(output)
+        current = seen[dest] if dest in seen else digests.digest(dest)
+        stamped.append((dest, output, digest, current))
+        if current != digest:
+            pending.append(output)
+        if not dry_run:
+            seen[dest] = digest
+
+    queue: "Queue[Optional[Tuple[Path, str, str, bool, Dict[str, Any]]]]" = Queue(maxsize=WRITE_QUEUE_SIZE)
+    failures: List[BaseException] = []
+
+    def writer() -> None:
+        while True:
+            item = queue.get()
+            if item is None:
+                return
+            if failures:
+                continue
+            dest, text, digest, existed, output = item
+            try:
+                write_serialized(dest, text)
+                digests.record(dest, digest)
+                written.append(output)
+                # 件数は書き込めた分だけ数える（失敗後に読み捨てた分は含めない）
+                result.updated += 1 if existed else 0
+                result.created += 0 if existed else 1
+            except BaseException as e:  # noqa: BLE001
+                failures.append(e)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(pending) // (workers * 4))
+        prepared: Iterator[Optional[str]] = pool.map(partial(_prepare, str(data_schema)), pending, chunksize=chunksize)
+        # fork 後にスレッドを作る（map の時点でワーカープロセスは起動済み）
+        thread = threading.Thread(target=writer, name="convert-writer", daemon=True)
+        thread.start()
+        try:
+            for dest, output, digest, current in stamped:
+                if dry_run:
+                    result.planned.append(dest)
+                if current == digest:
+                    result.unchanged += 1
+                    if dry_run:
+                        result.plan.append(PlanEntry(dest, "unchanged"))
+                    continue
+                text = next(prepared)
+                if text is None:
+                    validate_with_schema(output, data_schema)
+                    text = serialize_json(output)
+                if dry_run:
+                    _plan(result, dest, current, output)
+                    continue
+                if failures:
+                    break
+                queue.put((dest, text, digest, current is not None, output))
+        finally:
+            queue.put(None)
+            thread.join()
+    if failures:
+        raise failures[0]
+
+
+def load_data_registry(entity: str) -> NameRegistry:
+    """既存data/{entity}の name→id から NameRegistry を作る（register を読まずに参照解決する用）."""
+    dir_path = data_dir() / entity
+    pairs: List[Dict[str, str]] = []
+    if dir_path.exists():
+        for rec in load_json_files(dir_path):
+            if rec.get("name") and rec.get("id"):
+                pairs.append({"name": rec["name"], "id": rec["id"], "name_yomi": rec.get("name_yomi") or ""})
+    return NameRegistry.from_lists(pairs)
+
+
+@locked
 def convert_group(dry_run: bool = False) -> tuple[NameRegistry, ConvertResult]:
     reg_path = register_dir() / "group" / "form.json"
     schema_path = schema_base_dir() / "group.register.schema.json"
@@ -99,6 +290,8 @@ def convert_group(dry_run: bool = False) -> tuple[NameRegistry, ConvertResult]:
     name_to_id: Dict[str, str] = _load_existing_group_registry()
     prepared: List[Dict[str, Any]] = []
     result = ConvertResult(created=0, updated=0)
+    digests = DigestCache("convert")
+    changes: List[Mutation] = []
     for rec in records:
         norm_name = NameRegistry._normalize(rec["name"])
         # registerで明示IDがあれば優先、無ければ既存データのIDを流用、それも無ければ新規採番
@@ -108,108 +301,147 @@ def convert_group(dry_run: bool = False) -> tuple[NameRegistry, ConvertResult]:
 
     registry = NameRegistry.from_lists([{"name": name, "id": gid} for name, gid in name_to_id.items()])
 
-    for rec in prepared:
-        parent_raw = rec.get("parent")
-        parent_id = None
-        if parent_raw:
-            try:
-                parent_id = registry.resolve(parent_raw)
-            except ValueError as e:
-                raise ValueError(f"親グループが未登録です: {parent_raw}") from e
-        output = {
-            "id": rec["id"],
-            "name": rec["name"],
-            "parent": parent_id,
-            "category": rec["category"],
-            "list_url": rec.get("list_url"),
-            "official_url": rec["official_url"],
-        }
-        validate_with_schema(output, data_schema)
-        dest = data_dir() / "group" / f"{rec['id']}.json"
-        if dry_run:
-            result.planned.append(dest)
-        else:
-            result.updated += 1 if dest.exists() else 0
-            result.created += 0 if dest.exists() else 1
-            write_json_file(dest, output)
+    try:
+        for rec in prepared:
+            parent_raw = rec.get("parent")
+            parent_id = None
+            if parent_raw:
+                try:
+                    parent_id = registry.resolve(parent_raw)
+                except UnresolvedName as e:
+                    hint = f"（候補: {', '.join(e.suggestions)}）" if e.suggestions else ""
+                    raise ValueError(f"親グループが未登録です: {parent_raw}{hint}") from e
+            output = stamp_version("group", {
+                "id": rec["id"],
+                "name": rec["name"],
+                "parent": parent_id,
+                "category": rec["category"],
+                "list_url": rec.get("list_url"),
+                "official_url": rec["official_url"],
+            })
+            dest = data_dir() / "group" / f"{rec['id']}.json"
+            if _emit(dest, output, data_schema, dry_run, result, digests):
+                changes.append(("group", rec["id"], output))
+    finally:
+        # 途中で失敗しても、書き込み済みの分は必ず記録する
+        digests.save()
+        record_changes(changes)
     return registry, result
 
 
+@locked
 def convert_person(dry_run: bool = False) -> tuple[NameRegistry, ConvertResult]:
     reg_path = register_dir() / "person" / "form.json"
     schema_path = schema_base_dir() / "person.register.schema.json"
     data_schema = schema_base_dir() / "person.data.schema.json"
     records = _load_register(reg_path, schema_path)
+    # 既存dataの (name, よみ) からIDを再利用し、再実行しても重複ファイルを作らない
+    key_to_id = _load_existing_person_registry()
     name_to_id_list: List[Dict[str, str]] = []
     result = ConvertResult(created=0, updated=0)
-    for rec in records:
-        person_id = rec.get("id") or str(uuid4())
-        output = {
-          "id": person_id,
-          "name": rec["name"],
-          "name_yomi": rec.get("name_yomi"),
-        }
-        validate_with_schema(output, data_schema)
-        dest = data_dir() / "person" / f"{person_id}.json"
-        if dry_run:
-            result.planned.append(dest)
-        else:
-            result.updated += 1 if dest.exists() else 0
-            result.created += 0 if dest.exists() else 1
-            write_json_file(dest, output)
-        name_to_id_list.append({"name": rec["name"], "id": person_id})
+    digests = DigestCache("convert")
+    changes: List[Mutation] = []
+    try:
+        for rec in records:
+            key = _person_key(rec["name"], rec.get("name_yomi"))
+            person_id = rec.get("id") or key_to_id.get(key) or str(uuid4())
+            key_to_id[key] = person_id
+            output = stamp_version("person", {
+              "id": person_id,
+              "name": rec["name"],
+              "name_yomi": rec.get("name_yomi"),
+            })
+            dest = data_dir() / "person" / f"{person_id}.json"
+            if _emit(dest, output, data_schema, dry_run, result, digests):
+                changes.append(("person", person_id, output))
+            name_to_id_list.append({"name": rec["name"], "id": person_id, "name_yomi": rec.get("name_yomi") or ""})
+    finally:
+        digests.save()
+        record_changes(changes)
     return NameRegistry.from_lists(name_to_id_list), result
 
 
+@locked
 def convert_meeting(
     group_registry: NameRegistry,
     person_registry: NameRegistry,
     dry_run: bool = False,
     strict_missing: bool = True,
+    workers: int = 1,
 ) -> ConvertResult:
+    """register/meeting を data/meeting/<uuid>/basic.json へ変換する.
+
+    workers > 1 なら name 解決だけをこのプロセスで行い、検証と直列化はプロセスプールに任せる（大量の一括投入向け）。
+    結果と書き込み順は workers=1 と同じ。
+    """
     reg_path = register_dir() / "meeting" / "form.json"
     schema_path = schema_base_dir() / "meeting.basic.register.schema.json"
     data_schema = schema_base_dir() / "meeting.basic.data.schema.json"
     records = _load_register(reg_path, schema_path)
+    # 既存dataの (main団体, 号数, 開催日) からIDを再利用する
+    key_to_id = _load_existing_meeting_registry()
     result = ConvertResult(created=0, updated=0)
-    for rec in records:
-        meeting_id = rec.get("id") or str(uuid4())
-        main = rec["main"]
-        try:
-            main_id = group_registry.resolve(main["group_id"])
-            sub_list = []
-            for sub in rec.get("sub", []):
-                sub_list.append({
-                  "group_id": group_registry.resolve(sub["group_id"]),
-                  "num": sub["num"],
-                })
-            attendee_ids = [person_registry.resolve(a) for a in rec.get("attendee", [])]
-        except ValueError as e:
-            if strict_missing:
-                raise
-            result.skipped += 1
-            result.errors.append(str(e))
-            continue
-        sources = _normalize_sources(rec.get("sources"))
-        output = {
-          "id": meeting_id,
-          "main": {"group_id": main_id, "num": main["num"]},
-          "sub": sub_list,
-          "date": rec["date"],
-          "holding": rec["holding"],
-          "start_time": rec.get("start_time"),
-          "end_time": rec.get("end_time"),
-          "agenda": rec.get("agenda", []),
-          "attendee": attendee_ids,
-          "sources": sources,
-          "materials": rec.get("materials", []),
-        }
-        validate_with_schema(output, data_schema)
-        dest = data_dir() / "meeting" / meeting_id / "basic.json"
-        if dry_run:
-            result.planned.append(dest)
+    digests = DigestCache("convert")
+
+    def outputs() -> Iterator[Dict[str, Any]]:
+        for rec in records:
+            main = rec["main"]
+            try:
+                main_id = group_registry.resolve(main["group_id"])
+                sub_list = []
+                for sub in rec.get("sub", []):
+                    sub_list.append({
+                      "group_id": group_registry.resolve(sub["group_id"]),
+                      "num": sub["num"],
+                    })
+                attendee_ids = [person_registry.resolve(a) for a in rec.get("attendee", [])]
+            except ValueError as e:
+                if strict_missing:
+                    raise
+                result.skipped += 1
+                result.errors.append(str(e))
+                continue
+            key = (main_id, main["num"], rec["date"])
+            meeting_id = rec.get("id") or key_to_id.get(key) or str(uuid4())
+            key_to_id[key] = meeting_id
+            sources = normalize_sources(rec.get("sources"))
+            yield stamp_version("meeting", {
+              "id": meeting_id,
+              "main": {"group_id": main_id, "num": main["num"]},
+              "sub": sub_list,
+              "date": rec["date"],
+              "holding": rec["holding"],
+              "start_time": rec.get("start_time"),
+              "end_time": rec.get("end_time"),
+              "agenda": rec.get("agenda", []),
+              "attendee": attendee_ids,
+              "sources": sources,
+              "materials": rec.get("materials", []),
+            })
+
+    written: List[Dict[str, Any]] = []
+    try:
+        if workers > 1:
+            items: List[Tuple[Path, Dict[str, Any]]] = []
+            unresolved: Optional[ValueError] = None
+            try:
+                for output in outputs():
+                    items.append((data_dir() / "meeting" / output["id"] / "basic.json", output))
+            except ValueError as e:
+                # 逐次版と同じく、解決できなかったレコードより前の分は出力してから送出する
+                unresolved = e
+            _emit_pipelined(items, data_schema, dry_run, result, digests, workers, written)
+            if unresolved is not None:
+                raise unresolved
         else:
-            result.updated += 1 if dest.exists() else 0
-            result.created += 0 if dest.exists() else 1
-            write_json_file(dest, output)
+            for output in outputs():
+                dest = data_dir() / "meeting" / output["id"] / "basic.json"
+                if _emit(dest, output, data_schema, dry_run, result, digests):
+                    written.append(output)
+    finally:
+        # 途中で失敗しても、書き込み済みの分はインデックス・ジャーナル・ダイジェストに必ず反映する
+        digests.save()
+        if written:
+            update_meetings(written)
+            record_changes(("meeting", m["id"], m) for m in written)
     return result
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from src.core.integrity import iter_entity_records, iter_meeting_records
+from src.core.journal import Mutation, record_changes
+from src.core.lock import locked
+from src.core.meeting_index import update_meetings
+from src.core.resolver import name_bigrams, normalize_name, normalize_yomi
+from src.core.validator import validate_with_schema
+from src.core.writer import write_json_file
+from src.utils import data_dir, schema_base_dir
+
+# これより大きいブロックは絞り込みに役立たないので比較しない（全体をほぼ線形に保つ）
+MAX_BLOCK = 200
+# 同じブロック内のペアを重複候補とみなす name 類似度（bigram の Dice 係数）。
+# 会議体の名前は「〜に関する〜委員会」のように共通部分が多いので高めにとる
+NAME_THRESHOLD = 0.85
+# official_url が同じ / よみが同じ場合はこの類似度でも候補にする
+WEAK_THRESHOLD = 0.5
+YOMI_PREFIX = 3
+
+
+@dataclass
+class Cluster:
+    entity: str
+    ids: List[str]
+    reasons: List[str] = field(default_factory=list)
+
+
+def _host(url: Optional[str]) -> str:
+    if not url:
+        return ""
+    host = (urlsplit(url.strip()).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def blocking_keys(entity: str, rec: Dict[str, Any]) -> List[str]:
+    """候補を絞るためのキー。同じキーを持つレコード同士だけを比較する."""
+    name = normalize_name(rec.get("name") or "")
+    keys = [f"name:{name}"] if name else []
+    if entity == "person":
+        yomi = normalize_yomi(rec.get("name_yomi") or "")
+        if yomi:
+            keys.append(f"yomi:{yomi[:YOMI_PREFIX]}")
+    else:
+        host = _host(rec.get("official_url"))
+        if host:
+            # ホストだけだと省庁単位で巨大になるので name の先頭も組み合わせる
+            keys.append(f"host:{host}|{name[:2]}")
+    return keys
+
+
+def _distinct(entity: str, a: Dict[str, Any], b: Dict[str, Any]) -> Optional[str]:
+    """同名・類似名でも別物として扱うべき理由（親の違う group、よみの違う person）。無ければ None."""
+    if entity == "person":
+        ya = normalize_yomi(a.get("name_yomi") or "")
+        yb = normalize_yomi(b.get("name_yomi") or "")
+        # よみの片方が空なら同一人物の可能性を残す
+        return "よみが異なる" if ya and yb and ya != yb else None
+    if (a.get("parent") or None) != (b.get("parent") or None):
+        return "親グループが異なる"
+    return None
+
+
+def _similarity(entity: str, a: Dict[str, Any], b: Dict[str, Any]) -> Tuple[float, str]:
+    distinct = _distinct(entity, a, b)
+    if distinct:
+        return 0.0, distinct
+    na = normalize_name(a.get("name") or "")
+    nb = normalize_name(b.get("name") or "")
+    if na and na == nb:
+        return 1.0, "同名"
+    ga, gb = name_bigrams(na), name_bigrams(nb)
+    score = 2 * len(ga & gb) / (len(ga) + len(gb)) if ga and gb else 0.0
+    if entity == "person":
+        ya = normalize_yomi(a.get("name_yomi") or "")
+        if ya and ya == normalize_yomi(b.get("name_yomi") or "") and score >= WEAK_THRESHOLD:
+            return 1.0, f"同よみ・name類似度 {score:.2f}"
+    elif a.get("official_url") and a.get("official_url") == b.get("official_url") and score >= WEAK_THRESHOLD:
+        return 1.0, f"同URL・name類似度 {score:.2f}"
+    return score, f"name類似度 {score:.2f}"
+
+
+class _UnionFind:
+    def __init__(self) -> None:
+        self.parent: Dict[str, str] = {}
+
+    def find(self, x: str) -> str:
+        self.parent.setdefault(x, x)
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: str, b: str) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def find_duplicates(entity: str, records: Iterable[Dict[str, Any]]) -> List[Cluster]:
+    """ブロッキングキーで候補ペアを作り、類似と判定したものを union-find でクラスタにまとめる."""
+    by_id: Dict[str, Dict[str, Any]] = {}
+    blocks: Dict[str, List[str]] = {}
+    for rec in records:
+        by_id[rec["id"]] = rec
+        for key in blocking_keys(entity, rec):
+            blocks.setdefault(key, []).append(rec["id"])
+
+    uf = _UnionFind()
+    reasons: Dict[Tuple[str, str], str] = {}
+    # クラスタの代表 id → 構成 id（2件以上のものだけ）
+    members: Dict[str, List[str]] = {}
+    for key, ids in blocks.items():
+        if len(ids) < 2 or len(ids) > MAX_BLOCK:
+            continue
+        for i, a in enumerate(ids):
+            for b in ids[i + 1:]:
+                pair = (min(a, b), max(a, b))
+                if pair in reasons:
+                    continue
+                score, reason = _similarity(entity, by_id[a], by_id[b])
+                if score < NAME_THRESHOLD:
+                    continue
+                ra, rb = uf.find(a), uf.find(b)
+                if ra != rb:
+                    left, right = members.get(ra, [ra]), members.get(rb, [rb])
+                    # よみの無い人物などを介して、互いに別物のレコードを同じクラスタにつながない
+                    if any(_distinct(entity, by_id[x], by_id[y]) for x in left for y in right):
+                        continue
+                    members.pop(ra, None)
+                    members.pop(rb, None)
+                    uf.union(a, b)
+                    members[uf.find(a)] = left + right
+                reasons[pair] = reason
+
+    clusters: List[Cluster] = []
+    for ids in members.values():
+        ids.sort()
+        id_set = set(ids)
+        notes = sorted({f"{a} ~ {b}: {r}" for (a, b), r in reasons.items() if a in id_set})
+        clusters.append(Cluster(entity, ids, notes))
+    clusters.sort(key=lambda c: c.ids[0])
+    return clusters
+
+
+def reference_counts(entity: str, meetings: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """id ごとの会議からの参照数（残す id を決める目安）."""
+    counts: Dict[str, int] = {}
+    for m in meetings:
+        if entity == "person":
+            refs = list(m.get("attendee") or [])
+        else:
+            refs = [(m.get("main") or {}).get("group_id")] + [s.get("group_id") for s in m.get("sub") or []]
+        for rid in refs:
+            if rid:
+                counts[rid] = counts.get(rid, 0) + 1
+    return counts
+
+
+def run_scan() -> Dict[str, List[Cluster]]:
+    return {
+        "group": find_duplicates("group", iter_entity_records(data_dir() / "group")),
+        "person": find_duplicates("person", iter_entity_records(data_dir() / "person")),
+    }
+
+
+@dataclass
+class MergeResult:
+    meetings: List[str] = field(default_factory=list)
+    groups: List[str] = field(default_factory=list)
+    removed: List[Path] = field(default_factory=list)
+    # 統合で重複する (団体, 号数)。空でなければ dry-run 以外では何も書かずに失敗する
+    conflicts: List[str] = field(default_factory=list)
+
+
+def _rewrite_meeting(entity: str, m: Dict[str, Any], mapping: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """参照を付け替えた会議を返す（変化が無ければ None）."""
+    if entity == "person":
+        attendee = m.get("attendee") or []
+        if not any(pid in mapping for pid in attendee):
+            return None
+        merged: List[str] = []
+        for pid in attendee:
+            pid = mapping.get(pid, pid)
+            if pid not in merged:
+                merged.append(pid)
+        return {**m, "attendee": merged}
+    main = m.get("main") or {}
+    subs = m.get("sub") or []
+    if main.get("group_id") not in mapping and not any(s.get("group_id") in mapping for s in subs):
+        return None
+    main_gid = mapping.get(main.get("group_id"), main.get("group_id"))
+    # 統合で main と同じ団体になった sub・同じ団体が重なった sub は落とす
+    seen = {main_gid}
+    merged_subs: List[Dict[str, Any]] = []
+    for s in subs:
+        gid = mapping.get(s.get("group_id"), s.get("group_id"))
+        if gid not in seen:
+            seen.add(gid)
+            merged_subs.append({**s, "group_id": gid})
+    return {**m, "main": {**main, "group_id": main_gid}, "sub": merged_subs}
+
+
+def _num_conflicts(meetings: Iterable[Dict[str, Any]], mapping: Dict[str, str]) -> List[str]:
+    """統合で新たに生じる (団体, 号数) の重複を返す.
+
+    統合前は別の団体だった参照が、統合後に同じ (団体, 号数) で別の会議を指すものだけを数える
+    （統合前から同じ団体の中で重なっていたものは対象外）。
+    """
+    survivors = set(mapping.values())
+    # 統合後の (団体, 号数) → 統合前の団体 → 会議 id
+    refs: Dict[Tuple[str, int], Dict[str, Set[str]]] = {}
+    for m in meetings:
+        for ref in [m.get("main") or {}, *(m.get("sub") or [])]:
+            gid = ref.get("group_id")
+            if gid is None or ref.get("num") is None or mapping.get(gid, gid) not in survivors:
+                continue
+            refs.setdefault((mapping.get(gid, gid), ref["num"]), {}).setdefault(gid, set()).add(m["id"])
+    conflicts: List[str] = []
+    for (gid, num), by_source in sorted(refs.items()):
+        mids = set().union(*by_source.values())
+        if len(by_source) > 1 and len(mids) > 1:
+            conflicts.append(f"{gid} 第{num}回: {', '.join(sorted(mids))}")
+    return conflicts
+
+
+@locked
+def merge(entity: str, survivor: str, duplicates: List[str], dry_run: bool = False) -> MergeResult:
+    """duplicates を survivor に統合する.
+
+    会議（main/sub/attendee）と group.parent の参照をすべて付け替え、重複側のファイルを削除する。
+    先に全件の書き換え結果を作ってスキーマ検証し、1件でも失敗したら何も書かない。
+    group の統合で (団体, 号数) が別の会議と重なる場合も何も書かずに ValueError を送出する。
+    """
+    mapping = {dup: survivor for dup in duplicates if dup != survivor}
+    entity_dir = data_dir() / entity
+    if not (entity_dir / f"{survivor}.json").exists():
+        raise ValueError(f"統合先が存在しません: {survivor}")
+    result = MergeResult()
+    meeting_schema = schema_base_dir() / "meeting.basic.data.schema.json"
+    group_schema = schema_base_dir() / "group.data.schema.json"
+
+    meeting_updates: List[Dict[str, Any]] = []
+    meetings = list(iter_meeting_records())
+    for m in meetings:
+        updated = _rewrite_meeting(entity, m, mapping)
+        if updated is not None:
+            validate_with_schema(updated, meeting_schema)
+            meeting_updates.append(updated)
+    if entity == "group":
+        result.conflicts = _num_conflicts(meetings, mapping)
+    group_updates: List[Dict[str, Any]] = []
+    if entity == "group":
+        for g in iter_entity_records(entity_dir):
+            if g["id"] in mapping or g.get("parent") not in mapping:
+                continue
+            parent = mapping[g["parent"]]
+            updated = {**g, "parent": None if parent == g["id"] else parent}
+            validate_with_schema(updated, group_schema)
+            group_updates.append(updated)
+
+    result.meetings = [m["id"] for m in meeting_updates]
+    result.groups = [g["id"] for g in group_updates]
+    result.removed = [entity_dir / f"{dup}.json" for dup in mapping if (entity_dir / f"{dup}.json").exists()]
+    if dry_run:
+        return result
+    if result.conflicts:
+        raise ValueError(f"統合すると号数が重複する会議があります: {'; '.join(result.conflicts)}")
+
+    # 参照元（会議・子グループ）をすべて書き換えてから重複側を消す。各ファイルは一時ファイル経由で置き換えるので、
+    # 途中で止まっても書きかけのファイルや、消えた id を指す参照は残らない（重複側が残るだけで、再実行すればよい）
+    written: List[Dict[str, Any]] = []
+    changes: List[Mutation] = []
+    try:
+        for m in meeting_updates:
+            write_json_file(data_dir() / "meeting" / m["id"] / "basic.json", m)
+            written.append(m)
+            changes.append(("meeting", m["id"], m))
+        for g in group_updates:
+            write_json_file(entity_dir / f"{g['id']}.json", g)
+            changes.append((entity, g["id"], g))
+        for path in result.removed:
+            path.unlink()
+            changes.append((entity, path.stem, None))
+    finally:
+        # 書き込めた分は必ずインデックスとジャーナルに反映する
+        if written:
+            update_meetings(written)
+        record_changes(changes)
+    return result
+
+
+def describe(rec: Dict[str, Any]) -> str:
+    extra = rec.get("name_yomi") or rec.get("official_url") or ""
+    return f"{rec.get('name') or '-'}{f' / {extra}' if extra else ''}"
+
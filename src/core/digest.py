@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.core.writer import write_json_atomic
+from src.utils import data_dir, index_dir
+
+DIGEST_VERSION = 1
+
+
+def canonical_json(data: Any) -> str:
+    """キー順・空白に依存しない比較用の文字列化."""
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def payload_digest(data: Any) -> str:
+    return hashlib.sha256(canonical_json(data).encode("utf-8")).hexdigest()
+
+
+class DigestCache:
+    """data/ のファイル → 内容ダイジェストを (mtime, size) が変わるまで覚えておく.
+
+    変わっていないファイルは stat だけで済むので、件数が増えても読み直しのコストがかからない。
+    """
+
+    def __init__(self, name: str) -> None:
+        self.path = index_dir() / "digest" / f"{name}.json"
+        self._entries: Dict[str, List[Any]] = {}
+        self._dirty = False
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return
+        if payload.get("version") == DIGEST_VERSION:
+            self._entries = payload.get("files") or {}
+
+    @staticmethod
+    def _stamp(path: Path) -> Optional[List[int]]:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        try:
+            return path.relative_to(data_dir()).as_posix()
+        except ValueError:
+            return str(path)
+
+    def digest(self, path: Path) -> Optional[str]:
+        """ファイル内容（JSON）のダイジェスト。ファイルが無ければ None."""
+        stamp = self._stamp(path)
+        if stamp is None:
+            return None
+        key = self._key(path)
+        hit = self._entries.get(key)
+        if hit is not None and hit[:2] == stamp:
+            return hit[2]
+        value = payload_digest(json.loads(path.read_text(encoding="utf-8")))
+        self._entries[key] = [*stamp, value]
+        self._dirty = True
+        return value
+
+    def record(self, path: Path, digest: str) -> None:
+        """書き込んだ直後のファイルを読み直さずに登録する."""
+        stamp = self._stamp(path)
+        if stamp is not None:
+            self._entries[self._key(path)] = [*stamp, digest]
+            self._dirty = True
+
+    def save(self) -> None:
+        if self._dirty:
+            write_json_atomic(self.path, {"version": DIGEST_VERSION, "files": self._entries})
+            self._dirty = False
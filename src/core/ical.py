@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set
+
+from src.core.sources import normalize_sources
+from src.utils import data_dir
+
+# 出力形式を変えたら上げる（全フィードのフィンガープリントが変わり、作り直される）
+ICAL_VERSION = 1
+TZID = "Asia/Tokyo"
+PRODID = "-//kaigitai//meeting feed//JA"
+HOLDING_LABELS = {"onsite": "対面", "online": "オンライン", "hybrid": "ハイブリッド", "document": "書面"}
+
+# 日本は夏時間が無いので固定オフセットの VTIMEZONE で足りる
+_VTIMEZONE = (
+    "BEGIN:VTIMEZONE",
+    f"TZID:{TZID}",
+    "BEGIN:STANDARD",
+    "DTSTART:19700101T000000",
+    "TZOFFSETFROM:+0900",
+    "TZOFFSETTO:+0900",
+    "TZNAME:JST",
+    "END:STANDARD",
+    "END:VTIMEZONE",
+)
+
+
+@dataclass
+class Feed:
+    """1つのカレンダーフィード。key は出力パス（ical/<key>.ics）を兼ねる: all / group/<id> / tree/<id>."""
+
+    key: str
+    title: str
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+
+    def fingerprint(self, group_names: Mapping[str, str], version: str) -> str:
+        """含まれる会議の (id, mtime)・表示に使う団体名・描画の版（version）から作る。変わらなければ出力も変わらない."""
+        h = hashlib.sha256(f"{ICAL_VERSION}\0{version}\0{self.key}\0{self.title}\n".encode("utf-8"))
+        names: Set[str] = set()
+        for row in sorted(self.rows, key=lambda r: r["id"]):
+            h.update(f"{row['id']}\0{row.get('mtime_ns') or 0}\n".encode("utf-8"))
+            names.update(_group_ids(row))
+        for gid in sorted(names):
+            h.update(f"{gid}\0{group_names.get(gid, '')}\n".encode("utf-8"))
+        return h.hexdigest()[:32]
+
+
+def _group_ids(meeting: Mapping[str, Any]) -> List[str]:
+    ids = [(meeting.get("main") or {}).get("group_id")]
+    ids.extend(s.get("group_id") for s in meeting.get("sub") or [])
+    return [gid for gid in ids if gid]
+
+
+def subtree_ids(group_id: str, groups: Iterable[Mapping[str, Any]]) -> Set[str]:
+    """group_id 自身と、その子孫の団体 id."""
+    by_parent: Dict[Optional[str], List[str]] = {}
+    for g in groups:
+        by_parent.setdefault(g.get("parent"), []).append(g["id"])
+    found: Set[str] = set()
+    stack = [group_id]
+    while stack:
+        gid = stack.pop()
+        if gid in found:
+            continue
+        found.add(gid)
+        stack.extend(by_parent.get(gid, []))
+    return found
+
+
+def _by_group(summaries: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    by_group: Dict[str, List[Dict[str, Any]]] = {}
+    for row in summaries:
+        for gid in set(_group_ids(row)):
+            by_group.setdefault(gid, []).append(row)
+    return by_group
+
+
+def _collect(ids: Iterable[str], by_group: Mapping[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    seen: Set[str] = set()
+    rows: List[Dict[str, Any]] = []
+    for gid in ids:
+        for row in by_group.get(gid, []):
+            if row["id"] not in seen:
+                seen.add(row["id"])
+                rows.append(row)
+    rows.sort(key=lambda r: (r.get("date") or "", r["main"].get("num") or 0), reverse=True)
+    return rows
+
+
+def build_feeds(
+    groups: List[Mapping[str, Any]],
+    summaries: List[Dict[str, Any]],
+    keys: Optional[Iterable[str]] = None,
+) -> Dict[str, Feed]:
+    """サマリインデックスの行からフィードを組み立てる（basic.json は開かない）.
+
+    keys を省略すると全会議・団体ごと・子孫を含む団体ごとの全フィードを作る。
+    """
+    names = {g["id"]: g.get("name") or g["id"] for g in groups}
+    by_group = _by_group(summaries)
+    wanted = list(keys) if keys is not None else (
+        ["all"] + [f"group/{gid}" for gid in names] + [f"tree/{gid}" for gid in names]
+    )
+    feeds: Dict[str, Feed] = {}
+    for key in wanted:
+        kind, _, gid = key.partition("/")
+        if kind == "all" and not gid:
+            feeds[key] = Feed(key, "kaigitai 全会議", list(summaries))
+        elif kind == "group" and gid in names:
+            feeds[key] = Feed(key, f"kaigitai {names[gid]}", _collect([gid], by_group))
+        elif kind == "tree" and gid in names:
+            feeds[key] = Feed(key, f"kaigitai {names[gid]}（下位団体を含む）", _collect(sorted(subtree_ids(gid, groups)), by_group))
+    return feeds
+
+
+def escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line: str) -> str:
+    """RFC 5545 の行折り返し（75オクテットごとに CRLF + 空白）。マルチバイト文字の途中では切らない."""
+    out: List[str] = []
+    chunk = ""
+    size = 0
+    limit = 75
+    for ch in line:
+        n = len(ch.encode("utf-8"))
+        if size + n > limit:
+            out.append(chunk)
+            chunk, size, limit = "", 0, 74
+        chunk += ch
+        size += n
+    out.append(chunk)
+    return "\r\n ".join(out) + "\r\n"
+
+
+def _stamp(mtime_ns: int) -> str:
+    # 生成時刻ではなく basic.json の更新時刻を使い、同じデータからは同じバイト列を出す
+    return datetime.fromtimestamp(mtime_ns / 1e9, tz=timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def meeting_title(meeting: Mapping[str, Any], group_names: Mapping[str, str]) -> str:
+    """「団体名 第N回（合同: …）」形式の見出し."""
+    main = meeting.get("main") or {}
+    title = f"{group_names.get(main.get('group_id'), main.get('group_id'))} 第{main.get('num')}回"
+    subs = [group_names.get(s.get("group_id"), s.get("group_id")) for s in meeting.get("sub") or []]
+    if subs:
+        title += f"（合同: {'、'.join(subs)}）"
+    return title
+
+
+def _event_lines(meeting: Mapping[str, Any], mtime_ns: int, group_names: Mapping[str, str]) -> List[str]:
+    day = date.fromisoformat(meeting["date"])
+    summary = meeting_title(meeting, group_names)
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{meeting['id']}@kaigitai",
+        f"DTSTAMP:{_stamp(mtime_ns)}",
+    ]
+    start, end = meeting.get("start_time"), meeting.get("end_time")
+    if start:
+        lines.append(f"DTSTART;TZID={TZID}:{day:%Y%m%d}T{start.replace(':', '')}00")
+        if end and end > start:
+            lines.append(f"DTEND;TZID={TZID}:{day:%Y%m%d}T{end.replace(':', '')}00")
+    else:
+        lines.append(f"DTSTART;VALUE=DATE:{day:%Y%m%d}")
+        lines.append(f"DTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}")
+    lines.append(f"SUMMARY:{escape_text(summary)}")
+    description = []
+    holding = meeting.get("holding")
+    if holding:
+        description.append(f"開催形式: {HOLDING_LABELS.get(holding, holding)}")
+        lines.append(f"CATEGORIES:{escape_text(HOLDING_LABELS.get(holding, holding))}")
+    description.extend(f"・{item}" for item in meeting.get("agenda") or [])
+    if description:
+        lines.append(f"DESCRIPTION:{escape_text(chr(10).join(description))}")
+    page = normalize_sources(meeting.get("sources")).get("meeting_page")
+    if page:
+        lines.append(f"URL:{page}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def _load_basic(meeting_id: str) -> Optional[Dict[str, Any]]:
+    path = data_dir() / "meeting" / meeting_id / "basic.json"
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    payload["id"] = meeting_id
+    return payload
+
+
+def iter_calendar(feed: Feed, group_names: Mapping[str, str]) -> Iterator[str]:
+    """VCALENDAR を1行ずつ返す。basic.json は1件ずつ読むので、全会議のフィードでもメモリに溜めない."""
+    for line in ("BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN",
+                 f"X-WR-CALNAME:{escape_text(feed.title)}", f"X-WR-TIMEZONE:{TZID}", *_VTIMEZONE):
+        yield fold(line)
+    for row in feed.rows:
+        if not row.get("date"):
+            continue
+        meeting = _load_basic(row["id"])
+        if meeting is None or not meeting.get("date"):
+            continue
+        try:
+            lines = _event_lines(meeting, row.get("mtime_ns") or 0, group_names)
+        except ValueError:
+            # スキーマは書式しか見ないので 2024-13-45 のような日付も通る。途中で止めずにその会議だけ飛ばす
+            continue
+        for line in lines:
+            yield fold(line)
+    yield fold("END:VCALENDAR")
+
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.core.loader import load_json_file
+from src.core.resolver import NameRegistry
+from src.utils import data_dir
+
+
+@dataclass
+class IntegrityIssue:
+    kind: str
+    entity: str
+    id: str
+    message: str
+    ref: Optional[str] = None
+
+
+@dataclass
+class IntegrityReport:
+    issues: List[IntegrityIssue] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    def by_kind(self) -> Dict[str, List[IntegrityIssue]]:
+        grouped: Dict[str, List[IntegrityIssue]] = {}
+        for issue in self.issues:
+            grouped.setdefault(issue.kind, []).append(issue)
+        return grouped
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "counts": self.counts,
+            "issues": [issue.__dict__ for issue in self.issues],
+        }
+
+
+@dataclass
+class IdIndex:
+    """参照先の存在確認に使う ID 集合と、重複・循環検出用の補助インデックス."""
+
+    group_ids: Set[str]
+    person_ids: Set[str]
+    parents: Dict[str, Optional[str]] = field(default_factory=dict)
+    group_names: Dict[str, Set[str]] = field(default_factory=dict)
+    person_names: Dict[Tuple[str, str], Set[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_records(cls, groups: Iterable[Dict[str, Any]], persons: Iterable[Dict[str, Any]]) -> "IdIndex":
+        index = cls(group_ids=set(), person_ids=set())
+        for g in groups:
+            index.add_group(g)
+        for p in persons:
+            index.add_person(p)
+        return index
+
+    @classmethod
+    def load_ids(cls) -> "IdIndex":
+        """ファイル名だけから ID 集合を作る（中身は読まない）."""
+        group_dir = data_dir() / "group"
+        person_dir = data_dir() / "person"
+        return cls(
+            group_ids={p.stem for p in group_dir.glob("*.json")} if group_dir.exists() else set(),
+            person_ids={p.stem for p in person_dir.glob("*.json")} if person_dir.exists() else set(),
+        )
+
+    def add_group(self, rec: Dict[str, Any]) -> None:
+        gid = rec["id"]
+        self.group_ids.add(gid)
+        self.parents[gid] = rec.get("parent") or None
+        if rec.get("name"):
+            self.group_names.setdefault(NameRegistry._normalize(rec["name"]), set()).add(gid)
+
+    def add_person(self, rec: Dict[str, Any]) -> None:
+        pid = rec["id"]
+        self.person_ids.add(pid)
+        if rec.get("name"):
+            key = (NameRegistry._normalize(rec["name"]), NameRegistry._normalize(rec.get("name_yomi") or ""))
+            self.person_names.setdefault(key, set()).add(pid)
+
+
+def check_group(index: IdIndex, rec: Dict[str, Any]) -> List[IntegrityIssue]:
+    """1件の group の参照・重複・循環を検査する（保存前フック用）."""
+    issues: List[IntegrityIssue] = []
+    gid = rec["id"]
+    parent = rec.get("parent") or None
+    if parent and parent not in index.group_ids and parent != gid:
+        issues.append(IntegrityIssue("dangling_parent", "group", gid, f"親グループが存在しません: {parent}", parent))
+    if rec.get("name"):
+        # 親が違えば同名でもよい（部会・分科会の名前は審議会ごとに重なる）
+        others = {
+            other for other in index.group_names.get(NameRegistry._normalize(rec["name"]), set()) - {gid}
+            if index.parents.get(other) == parent
+        }
+        if others:
+            issues.append(IntegrityIssue(
+                "duplicate_name", "group", gid, f"同名のグループがあります: {rec['name']} ({', '.join(sorted(others))})",
+            ))
+    # 保存後の親子関係で循環しないか確認する
+    seen = {gid}
+    current = parent
+    while current:
+        if current in seen:
+            issues.append(IntegrityIssue("parent_cycle", "group", gid, f"親子関係が循環しています: {gid} → {current}", current))
+            break
+        seen.add(current)
+        current = index.parents.get(current)
+    return issues
+
+
+def check_person(index: IdIndex, rec: Dict[str, Any]) -> List[IntegrityIssue]:
+    pid = rec["id"]
+    if not rec.get("name"):
+        return []
+    key = (NameRegistry._normalize(rec["name"]), NameRegistry._normalize(rec.get("name_yomi") or ""))
+    others = index.person_names.get(key, set()) - {pid}
+    if others:
+        return [IntegrityIssue(
+            "duplicate_name", "person", pid, f"同名・同よみの人物がいます: {rec['name']} ({', '.join(sorted(others))})",
+        )]
+    return []
+
+
+def check_meeting(index: IdIndex, rec: Dict[str, Any]) -> List[IntegrityIssue]:
+    mid = rec["id"]
+    issues: List[IntegrityIssue] = []
+    main_gid = (rec.get("main") or {}).get("group_id")
+    if main_gid not in index.group_ids:
+        issues.append(IntegrityIssue("dangling_group", "meeting", mid, f"main.group_id が存在しません: {main_gid}", main_gid))
+    for sub in rec.get("sub") or []:
+        gid = sub.get("group_id")
+        if gid not in index.group_ids:
+            issues.append(IntegrityIssue("dangling_group", "meeting", mid, f"sub.group_id が存在しません: {gid}", gid))
+    for pid in rec.get("attendee") or []:
+        if pid not in index.person_ids:
+            issues.append(IntegrityIssue("dangling_attendee", "meeting", mid, f"attendee が存在しません: {pid}", pid))
+    return issues
+
+
+def _find_cycles(parents: Dict[str, Optional[str]]) -> List[List[str]]:
+    """親ポインタの循環を線形時間で列挙する（各ノードの親は高々1つ）."""
+    state: Dict[str, int] = {}  # 1: 探索中, 2: 確定
+    cycles: List[List[str]] = []
+    for start in sorted(parents):
+        if state.get(start):
+            continue
+        path: List[str] = []
+        position: Dict[str, int] = {}
+        node: Optional[str] = start
+        while node is not None and node in parents and not state.get(node):
+            state[node] = 1
+            position[node] = len(path)
+            path.append(node)
+            node = parents[node]
+        if node is not None and state.get(node) == 1 and node in position:
+            cycles.append(path[position[node]:])
+        for n in path:
+            state[n] = 2
+    return cycles
+
+
+def check_dataset(
+    groups: Iterable[Dict[str, Any]],
+    persons: Iterable[Dict[str, Any]],
+    meetings: Iterable[Dict[str, Any]],
+) -> IntegrityReport:
+    """ID集合を1度作り、全レコードの参照を1パスで検査する."""
+    groups = list(groups)
+    persons = list(persons)
+    index = IdIndex.from_records(groups, persons)
+    report = IntegrityReport()
+    report.counts = {"group": len(groups), "person": len(persons), "meeting": 0}
+
+    for g in groups:
+        parent = g.get("parent") or None
+        if parent and parent not in index.group_ids:
+            report.issues.append(IntegrityIssue("dangling_parent", "group", g["id"], f"親グループが存在しません: {parent}", parent))
+    for norm, ids in sorted(index.group_names.items()):
+        # 同じ親の下での同名だけを重複とみなす
+        by_parent: Dict[Optional[str], List[str]] = {}
+        for gid in sorted(ids):
+            by_parent.setdefault(index.parents.get(gid), []).append(gid)
+        for siblings in by_parent.values():
+            if len(siblings) > 1:
+                for gid in siblings:
+                    report.issues.append(IntegrityIssue("duplicate_name", "group", gid, f"同名のグループがあります: {norm}"))
+    for (name, _), ids in sorted(index.person_names.items()):
+        if len(ids) > 1:
+            for pid in sorted(ids):
+                report.issues.append(IntegrityIssue("duplicate_name", "person", pid, f"同名・同よみの人物がいます: {name}"))
+    for cycle in _find_cycles(index.parents):
+        report.issues.append(IntegrityIssue(
+            "parent_cycle", "group", cycle[0], f"親子関係が循環しています: {' → '.join(cycle + [cycle[0]])}",
+        ))
+
+    # (group_id, num) → 最初に見つかった meeting id
+    seen_nums: Dict[Tuple[str, int], str] = {}
+    for m in meetings:
+        report.counts["meeting"] += 1
+        report.issues.extend(check_meeting(index, m))
+        refs = [m.get("main") or {}] + list(m.get("sub") or [])
+        for ref in refs:
+            key = (ref.get("group_id"), ref.get("num"))
+            first = seen_nums.setdefault(key, m["id"])
+            if first != m["id"]:
+                report.issues.append(IntegrityIssue(
+                    "duplicate_meeting_num", "meeting", m["id"],
+                    f"同じ団体・号数の会議が重複しています: {key[0]} #{key[1]} ({first})", first,
+                ))
+    return report
+
+
+def iter_entity_records(dir_path: Path) -> List[Dict[str, Any]]:
+    records: List[Dict[str, Any]] = []
+    if not dir_path.exists():
+        return records
+    for file in sorted(dir_path.glob("*.json")):
+        rec = load_json_file(file)
+        rec["id"] = file.stem
+        records.append(rec)
+    return records
+
+
+def iter_meeting_records() -> Iterable[Dict[str, Any]]:
+    meeting_dir = data_dir() / "meeting"
+    if not meeting_dir.exists():
+        return
+    for folder in sorted(p for p in meeting_dir.iterdir() if p.is_dir()):
+        basic = folder / "basic.json"
+        if not basic.exists():
+            continue
+        rec = load_json_file(basic)
+        rec["id"] = folder.name
+        yield rec
+
+
+def run_check() -> IntegrityReport:
+    """data/ 全体の参照整合性を検査する."""
+    return check_dataset(iter_entity_records(data_dir() / "group"), iter_entity_records(data_dir() / "person"), iter_meeting_records())
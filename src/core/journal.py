@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.core.digest import payload_digest
+from src.core.lock import data_lock
+from src.core.writer import write_json_atomic
+from src.utils import index_dir
+
+JOURNAL_VERSION = 1
+# 1セグメントに入る seq の幅。読み出しはカーソル以降のセグメントだけを開く
+SEGMENT_SIZE = 10000
+
+# (entity, id, 保存した内容 or 削除なら None)
+Mutation = Tuple[str, str, Optional[Any]]
+
+
+class CursorExpired(RuntimeError):
+    """カーソルより新しい削除記録がコンパクションで捨てられている（全件を読み直す必要がある）."""
+
+
+@dataclass(frozen=True)
+class Change:
+    seq: int
+    op: str
+    entity: str
+    id: str
+    hash: Optional[str]
+    ts: str
+
+    def to_json(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def journal_dir() -> Path:
+    return index_dir() / "journal"
+
+
+def _meta_path() -> Path:
+    return journal_dir() / "_meta.json"
+
+
+def _cursors_path() -> Path:
+    return journal_dir() / "_cursors.json"
+
+
+def _segment_start(seq: int) -> int:
+    return (seq - 1) // SEGMENT_SIZE * SEGMENT_SIZE + 1
+
+
+def _segment_path(start: int) -> Path:
+    return journal_dir() / f"{start:012d}.jsonl"
+
+
+def _segments() -> List[Tuple[int, Path]]:
+    if not journal_dir().exists():
+        return []
+    return sorted((int(p.stem), p) for p in journal_dir().glob("*.jsonl") if p.stem.isdigit())
+
+
+def _load_meta() -> Dict[str, int]:
+    try:
+        payload = json.loads(_meta_path().read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {"head": 0, "floor": 0}
+    if payload.get("version") != JOURNAL_VERSION:
+        return {"head": 0, "floor": 0}
+    return {"head": int(payload.get("head") or 0), "floor": int(payload.get("floor") or 0)}
+
+
+def _last_line(path: Path) -> Optional[str]:
+    """ファイル末尾の1行だけを読む（全体は読まない）."""
+    with path.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        chunk = b""
+        pos = end
+        while pos > 0:
+            step = min(4096, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step) + chunk
+            lines = chunk.rstrip(b"\n").split(b"\n")
+            if len(lines) > 1 or pos == 0:
+                last = lines[-1].decode("utf-8")
+                return last or None
+    return None
+
+
+def head() -> int:
+    """最後に記録した seq（記録が無ければ 0）."""
+    seq = _load_meta()["head"]
+    segments = _segments()
+    if segments:
+        line = _last_line(segments[-1][1])
+        if line:
+            seq = max(seq, json.loads(line)["seq"])
+    return seq
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def record_changes(mutations: Iterable[Mutation]) -> List[Change]:
+    """変更をまとめて追記する。seq は data_lock の中で採番するので、管理UIとCLIが同時に書いても重複しない."""
+    items = list(mutations)
+    if not items:
+        return []
+    with data_lock():
+        seq = head()
+        ts = _now()
+        changes: List[Change] = []
+        for entity, entity_id, payload in items:
+            seq += 1
+            if payload is None:
+                changes.append(Change(seq, "delete", entity, entity_id, None, ts))
+            else:
+                changes.append(Change(seq, "put", entity, entity_id, payload_digest(payload), ts))
+        journal_dir().mkdir(parents=True, exist_ok=True)
+        by_segment: Dict[int, List[str]] = {}
+        for change in changes:
+            line = json.dumps(change.to_json(), ensure_ascii=False, separators=(",", ":"))
+            by_segment.setdefault(_segment_start(change.seq), []).append(line + "\n")
+        for start, lines in by_segment.items():
+            with _segment_path(start).open("a", encoding="utf-8") as f:
+                f.write("".join(lines))
+    return changes
+
+
+def record(entity: str, entity_id: str, payload: Optional[Any] = None) -> Change:
+    """1件分の保存（payload）または削除（None）を記録する."""
+    return record_changes([(entity, entity_id, payload)])[0]
+
+
+def _read_segment(path: Path) -> List[Change]:
+    changes: List[Change] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line:
+            changes.append(Change(**json.loads(line)))
+    return changes
+
+
+def read_since(cursor: int, limit: Optional[int] = None) -> List[Change]:
+    """cursor より後の変更を seq 順に返す。次のカーソルは返した最後の seq."""
+    if cursor < _load_meta()["floor"]:
+        raise CursorExpired(f"カーソル {cursor} はコンパクション済みです。全件を読み直してください")
+    segments = _segments()
+    changes: List[Change] = []
+    for i, (start, path) in enumerate(segments):
+        following = segments[i + 1][0] if i + 1 < len(segments) else None
+        if following is not None and following <= cursor + 1:
+            continue
+        for change in _read_segment(path):
+            if change.seq > cursor:
+                changes.append(change)
+                if limit is not None and len(changes) >= limit:
+                    return changes
+    return changes
+
+
+def load_cursor(name: str) -> int:
+    try:
+        return int(json.loads(_cursors_path().read_text(encoding="utf-8")).get(name, 0))
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def save_cursor(name: str, seq: int) -> None:
+    """下流の処理（キャッシュ・静的出力など）がどこまで取り込んだかを記録する。コンパクションの目安にもなる."""
+    with data_lock():
+        try:
+            cursors = json.loads(_cursors_path().read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            cursors = {}
+        cursors[name] = seq
+        write_json_atomic(_cursors_path(), cursors)
+
+
+def compact() -> Tuple[int, int]:
+    """(entity, id) ごとに最新の記録だけを残す。(前の件数, 後の件数) を返す.
+
+    seq は振り直さないので既存のカーソルはそのまま使える。削除の記録は全カーソルが通過済みなら捨て、
+    それより古いカーソルで読もうとすると CursorExpired になる。
+    """
+    with data_lock():
+        meta = _load_meta()
+        last_seq = head()
+        changes = [c for _, path in _segments() for c in _read_segment(path)]
+        latest: Dict[Tuple[str, str], Change] = {}
+        for change in changes:
+            latest[(change.entity, change.id)] = change
+        try:
+            cursors = json.loads(_cursors_path().read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            cursors = {}
+        passed = min(cursors.values()) if cursors else 0
+        kept: List[Change] = []
+        floor = meta["floor"]
+        for change in sorted(latest.values(), key=lambda c: c.seq):
+            if change.op == "delete" and change.seq <= passed:
+                floor = max(floor, change.seq)
+                continue
+            kept.append(change)
+
+        by_segment: Dict[int, List[str]] = {}
+        for change in kept:
+            line = json.dumps(change.to_json(), ensure_ascii=False, separators=(",", ":"))
+            by_segment.setdefault(_segment_start(change.seq), []).append(line + "\n")
+        for start, path in _segments():
+            if start not in by_segment:
+                path.unlink()
+        for start, lines in by_segment.items():
+            dest = _segment_path(start)
+            tmp = dest.with_suffix(".jsonl.tmp")
+            tmp.write_text("".join(lines), encoding="utf-8")
+            os.replace(tmp, dest)
+        write_json_atomic(_meta_path(), {"version": JOURNAL_VERSION, "head": last_seq, "floor": floor})
+    return len(changes), len(kept)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """変更ジャーナルの確認・コンパクション（--compact）."""
+    args = argv if argv is not None else sys.argv[1:]
+    if "--compact" in args:
+        before, after = compact()
+        print(f"コンパクション: {before} 件 → {after} 件")
+        return
+    cursor = int(args[0]) if args else max(head() - 20, 0)
+    for change in read_since(cursor):
+        print(f"{change.seq:>8} {change.ts} {change.op:<6} {change.entity:<7} {change.id} {change.hash or ''}")
+    print(f"head: {head()}")
+
+
+if __name__ == "__main__":
+    main()
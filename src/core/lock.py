@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # Windows: プロセス間のロックは無し（同一プロセス内のスレッドだけ排他する）
+    fcntl = None  # type: ignore[assignment]
+
+from src.utils import data_dir
+
+LOCK_TIMEOUT = 30.0
+_POLL = 0.05
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class LockTimeout(RuntimeError):
+    """data/ のロックを時間内に取得できなかった."""
+
+
+class VersionConflict(ValueError):
+    """編集を始めたあとに別の保存でファイルが変わっていた."""
+
+    def __init__(self, entity: str, entity_id: str, current: Optional[Dict[str, Any]], version: str) -> None:
+        self.entity = entity
+        self.entity_id = entity_id
+        self.current = current
+        self.version = version
+        super().__init__(f"{entity} {entity_id} は編集中に他の保存で更新されました")
+
+
+def lock_path() -> Path:
+    return data_dir() / ".lock"
+
+
+_local = threading.local()
+# fcntl が無い環境用（プロセス内だけの排他）
+_fallback = threading.RLock()
+
+
+@contextmanager
+def data_lock(timeout: float = LOCK_TIMEOUT) -> Iterator[None]:
+    """data/ 全体の排他ロック（flock による advisory lock）。管理UIとCLIで共有する.
+
+    同じスレッド内では入れ子にできる。別スレッド・別プロセスとは排他になる。
+    """
+    depth = getattr(_local, "depth", 0)
+    if depth:
+        _local.depth = depth + 1
+        try:
+            yield
+        finally:
+            _local.depth -= 1
+        return
+
+    if fcntl is None:
+        if not _fallback.acquire(timeout=timeout):
+            raise LockTimeout(f"data/ のロックを取得できませんでした（{timeout:.0f}秒）")
+        release: Callable[[], None] = _fallback.release
+    else:
+        path = lock_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # flock はオープンしたファイルごとに効くので、スレッドごとに開き直せばスレッド間でも排他になる
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise LockTimeout(f"data/ のロックを取得できませんでした（{timeout:.0f}秒）") from None
+                time.sleep(_POLL)
+
+        def release() -> None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    _local.depth = 1
+    try:
+        yield
+    finally:
+        _local.depth = 0
+        release()
+
+
+def locked(func: F) -> F:
+    """関数全体を data_lock の中で実行する."""
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with data_lock():
+            return func(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def version_token(path: Path) -> str:
+    """ファイル内容から作る版トークン（ファイルが無ければ空文字）."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+    except FileNotFoundError:
+        return ""
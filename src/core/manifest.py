@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.core.writer import write_json_atomic
+from src.utils import data_dir, index_dir
+
+MANIFEST_VERSION = 1
+ENTITIES = ("group", "person", "meeting")
+
+# manifest = {"version", "root", "entities": {entity: {"root", "buckets": {bucket: {"hash", "files": {path: [hash, mtime_ns, size]}}}}}}
+# ファイル → バケット（パスのハッシュ先頭2桁）→ entity → 全体 の順にハッシュを積み上げる
+Manifest = Dict[str, Any]
+
+
+def entity_files(entity: str) -> List[Path]:
+    if entity == "meeting":
+        base = data_dir() / "meeting"
+        if not base.exists():
+            return []
+        return sorted(p / "basic.json" for p in base.iterdir() if (p / "basic.json").is_file())
+    return sorted((data_dir() / entity).glob("*.json"))
+
+
+def relative_path(path: Path) -> str:
+    return path.relative_to(data_dir()).as_posix()
+
+
+def latest_path() -> Path:
+    return index_dir() / "manifest" / "latest.json"
+
+
+def _bucket(rel: str) -> str:
+    return hashlib.md5(rel.encode("utf-8")).hexdigest()[:2]
+
+
+def _roll_up(pairs: Iterable[Tuple[str, str]]) -> str:
+    h = hashlib.sha256()
+    for name, value in sorted(pairs):
+        h.update(f"{name}\0{value}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _previous_entries(previous: Optional[Manifest]) -> Dict[str, List[Any]]:
+    entries: Dict[str, List[Any]] = {}
+    if previous and previous.get("version") == MANIFEST_VERSION:
+        for ent in previous["entities"].values():
+            for bucket in ent["buckets"].values():
+                entries.update(bucket["files"])
+    return entries
+
+
+def build_manifest(previous: Optional[Manifest] = None) -> Manifest:
+    """data/ の全ファイルのハッシュを集めてマニフェストを作る.
+
+    previous を渡すと (mtime, size) が同じファイルはハッシュを計算し直さない。
+    """
+    known = _previous_entries(previous)
+    entities: Dict[str, Any] = {}
+    for entity in ENTITIES:
+        buckets: Dict[str, Dict[str, Any]] = {}
+        for path in entity_files(entity):
+            rel = relative_path(path)
+            st = path.stat()
+            hit = known.get(rel)
+            if hit is not None and hit[1:] == [st.st_mtime_ns, st.st_size]:
+                digest = hit[0]
+            else:
+                digest = file_hash(path)
+            buckets.setdefault(_bucket(rel), {"files": {}})["files"][rel] = [digest, st.st_mtime_ns, st.st_size]
+        for bucket in buckets.values():
+            bucket["hash"] = _roll_up((rel, entry[0]) for rel, entry in bucket["files"].items())
+        entities[entity] = {
+            "root": _roll_up((name, b["hash"]) for name, b in buckets.items()),
+            "buckets": dict(sorted(buckets.items())),
+        }
+    return {
+        "version": MANIFEST_VERSION,
+        "root": _roll_up((entity, e["root"]) for entity, e in entities.items()),
+        "entities": entities,
+    }
+
+
+def file_hashes(manifest: Manifest) -> Dict[str, str]:
+    return {rel: entry[0] for rel, entry in _previous_entries(manifest).items()}
+
+
+def load_manifest(path: Optional[Path] = None) -> Optional[Manifest]:
+    try:
+        payload = json.loads((path or latest_path()).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    return payload if payload.get("version") == MANIFEST_VERSION else None
+
+
+def write_manifest(manifest: Manifest, path: Optional[Path] = None) -> Path:
+    dest = path or latest_path()
+    write_json_atomic(dest, manifest)
+    return dest
+
+
+@dataclass
+class ManifestDiff:
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> List[str]:
+        """今のデータで検証し直すべきファイル（追加・変更）."""
+        return sorted(self.added + self.modified)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+def diff_manifests(old: Optional[Manifest], new: Manifest) -> ManifestDiff:
+    """ルート → entity → バケットの順にハッシュを比べ、違うバケットのファイルだけを突き合わせる."""
+    diff = ManifestDiff()
+    if old is not None and old.get("root") == new["root"]:
+        return diff
+    old_entities = (old or {}).get("entities", {})
+    for entity in sorted(set(old_entities) | set(new["entities"])):
+        old_ent = old_entities.get(entity, {"root": None, "buckets": {}})
+        new_ent = new["entities"].get(entity, {"root": None, "buckets": {}})
+        if old_ent["root"] == new_ent["root"]:
+            continue
+        for name in sorted(set(old_ent["buckets"]) | set(new_ent["buckets"])):
+            old_b = old_ent["buckets"].get(name, {"hash": None, "files": {}})
+            new_b = new_ent["buckets"].get(name, {"hash": None, "files": {}})
+            if old_b["hash"] == new_b["hash"]:
+                continue
+            for rel, entry in new_b["files"].items():
+                before = old_b["files"].get(rel)
+                if before is None:
+                    diff.added.append(rel)
+                elif before[0] != entry[0]:
+                    diff.modified.append(rel)
+            diff.removed.extend(rel for rel in old_b["files"] if rel not in new_b["files"])
+    diff.added.sort()
+    diff.removed.sort()
+    diff.modified.sort()
+    return diff
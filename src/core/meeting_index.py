@@ -0,0 +1,508 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.core.lock import LOCK_TIMEOUT, LockTimeout, data_lock
+from src.core.stats import Aggregates
+from src.core.writer import write_json_atomic
+from src.utils import data_dir, index_dir
+
+INDEX_VERSION = 4
+# 一覧表示に必要な項目だけを列ごとの配列で持つ
+COLUMNS = ("id", "date", "main_group_id", "main_num", "sub", "holding", "attendee", "mtime_ns")
+# 同一プロセス内で data/meeting との突き合わせ（全件stat）を行う最短間隔（秒）
+REFRESH_INTERVAL = 5.0
+# 表示側の突き合わせで data/ のロックを待つ上限（秒）。取れなければ保存済みのインデックスで表示する
+REFRESH_LOCK_TIMEOUT = 1.0
+
+
+def index_root() -> Path:
+    return index_dir() / "meeting"
+
+
+def _manifest_path() -> Path:
+    # 月→件数だけを持つ小さなファイル。月別表示はこれと対象月のパーティションしか読まない
+    return index_root() / "_manifest.json"
+
+
+def _locator_path() -> Path:
+    # id→月。書き込み時に日付が変わった会議を元の月から外すために使う
+    return index_root() / "_locator.json"
+
+
+def _partition_path(month: str) -> Path:
+    return index_root() / f"{month}.json"
+
+
+def _stats_path() -> Path:
+    # 団体×年・開催形式・出席者の集計（src/core/stats.py）
+    return index_root() / "_stats.json"
+
+
+def _sequence_path(group_id: str) -> Path:
+    # 団体ごとの号数表。id のハッシュ先頭2桁で256分割し、1団体の参照で1ファイルだけ読む
+    shard = hashlib.md5(group_id.encode("utf-8")).hexdigest()[:2]
+    return index_root() / "sequence" / f"{shard}.json"
+
+
+def _basic_path(meeting_id: str) -> Path:
+    return data_dir() / "meeting" / meeting_id / "basic.json"
+
+
+def month_of(date: Optional[str]) -> str:
+    return (date or "")[:7] or "unknown"
+
+
+class MeetingSummaryIndex:
+    """meeting の一覧用サマリを列指向で保持する（1パーティション＝1か月分）.
+
+    basic.json の agenda/sources/materials は持たず、一覧・月別表示に要る列だけを並行配列で管理する。
+    """
+
+    def __init__(self, columns: Optional[Dict[str, List[Any]]] = None) -> None:
+        self.columns: Dict[str, List[Any]] = {name: list((columns or {}).get(name, [])) for name in COLUMNS}
+        self.pos: Dict[str, int] = {mid: i for i, mid in enumerate(self.columns["id"])}
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def __contains__(self, meeting_id: str) -> bool:
+        return meeting_id in self.pos
+
+    def upsert(self, meeting: Dict[str, Any], mtime_ns: int = 0) -> None:
+        main = meeting.get("main") or {}
+        row = {
+            "id": meeting["id"],
+            "date": meeting.get("date") or "",
+            "main_group_id": main.get("group_id"),
+            "main_num": main.get("num"),
+            "sub": [[s.get("group_id"), s.get("num")] for s in meeting.get("sub") or []],
+            "holding": meeting.get("holding"),
+            "attendee": list(meeting.get("attendee") or []),
+            "mtime_ns": mtime_ns,
+        }
+        idx = self.pos.get(row["id"])
+        if idx is None:
+            self.pos[row["id"]] = len(self)
+            for name in COLUMNS:
+                self.columns[name].append(row[name])
+        else:
+            for name in COLUMNS:
+                self.columns[name][idx] = row[name]
+
+    def remove(self, meeting_id: str) -> bool:
+        idx = self.pos.pop(meeting_id, None)
+        if idx is None:
+            return False
+        last = len(self) - 1
+        # 末尾の行を空いた位置へ移して O(1) で削除する
+        for name in COLUMNS:
+            col = self.columns[name]
+            col[idx] = col[last]
+            col.pop()
+        if idx != last:
+            self.pos[self.columns["id"][idx]] = idx
+        return True
+
+    def row(self, idx: int) -> Dict[str, Any]:
+        c = self.columns
+        return {
+            "id": c["id"][idx],
+            "date": c["date"][idx],
+            "main": {"group_id": c["main_group_id"][idx], "num": c["main_num"][idx]},
+            "sub": [{"group_id": gid, "num": num} for gid, num in c["sub"][idx]],
+            "holding": c["holding"][idx],
+            "attendee": c["attendee"][idx],
+            "attendee_count": len(c["attendee"][idx]),
+            "mtime_ns": c["mtime_ns"][idx],
+        }
+
+    def sorted_ids(self) -> List[str]:
+        """日付・号数の降順に並べた id."""
+        dates = self.columns["date"]
+        nums = self.columns["main_num"]
+        order = sorted(range(len(self)), key=lambda i: (dates[i] or "", nums[i] or 0), reverse=True)
+        ids = self.columns["id"]
+        return [ids[i] for i in order]
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        """load_meetings と同じ並び（日付・号数の降順）でサマリを返す."""
+        return [self.row(self.pos[mid]) for mid in self.sorted_ids()]
+
+    def copy(self) -> "MeetingSummaryIndex":
+        return MeetingSummaryIndex({name: list(col) for name, col in self.columns.items()})
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"version": INDEX_VERSION, "columns": self.columns}
+
+    @classmethod
+    def from_json(cls, payload: Dict[str, Any]) -> "MeetingSummaryIndex":
+        if payload.get("version") != INDEX_VERSION:
+            return cls()
+        return cls(payload.get("columns") or {})
+
+
+# インデックスのファイルはビューア・管理UI・CLI が別プロセスから書き換えるので、書き込みは必ず
+# data_lock（プロセス間）→ _lock（プロセス内のキャッシュ）の順で取って行う
+_lock = threading.RLock()
+# path → ((mtime_ns, size), 読み込んだ内容)。同一プロセス内での再読込を省く
+_cache: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+_last_refresh: Dict[Path, float] = {}
+
+
+def _read_cached(path: Path, parse: Any, default: Any) -> Any:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return default()
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+    value = parse(json.loads(path.read_text(encoding="utf-8")))
+    with _lock:
+        _cache[path] = (stamp, value)
+    return value
+
+
+def _write_cached(path: Path, payload: Any, value: Any) -> None:
+    write_json_atomic(path, payload)
+    st = path.stat()
+    with _lock:
+        _cache[path] = ((st.st_mtime_ns, st.st_size), value)
+
+
+def _parse_counts(payload: Dict[str, Any]) -> Dict[str, int]:
+    if payload.get("version") != INDEX_VERSION:
+        return {}
+    return dict(payload.get("months") or {})
+
+
+def _parse_locator(payload: Dict[str, Any]) -> Dict[str, str]:
+    if payload.get("version") != INDEX_VERSION:
+        return {}
+    return dict(payload.get("ids") or {})
+
+
+class MeetingIndex:
+    """月ごとに分割したサマリインデックス.
+
+    パーティションは必要になったときに読み込む。月別表示は manifest と対象月の1ファイルしか開かない。
+    """
+
+    def __init__(self, counts: Dict[str, int]) -> None:
+        self.counts = counts
+        self._partitions: Dict[str, MeetingSummaryIndex] = {}
+
+    @classmethod
+    def load(cls) -> "MeetingIndex":
+        return cls(_read_cached(_manifest_path(), _parse_counts, dict))
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+    def months(self) -> List[str]:
+        return sorted((m for m, n in self.counts.items() if n and m != "unknown"), reverse=True)
+
+    def partition(self, month: str) -> MeetingSummaryIndex:
+        part = self._partitions.get(month)
+        if part is None:
+            part = _read_cached(_partition_path(month), MeetingSummaryIndex.from_json, MeetingSummaryIndex)
+            self._partitions[month] = part
+        return part
+
+    def _partition_keys(self) -> List[str]:
+        return self.months() + (["unknown"] if self.counts.get("unknown") else [])
+
+    def summaries(self, month: Optional[str] = None) -> List[Dict[str, Any]]:
+        """month（"2024-05" や "2024" などの前方一致）に該当するパーティションだけを読む."""
+        keys = self._partition_keys()
+        if month:
+            keys = [m for m in keys if m.startswith(month)]
+        # 月の降順に各パーティション（月内は降順）を連結すれば全体でも降順になる
+        rows: List[Dict[str, Any]] = []
+        for m in keys:
+            rows.extend(self.partition(m).summaries())
+        return rows
+
+    def ids_newest_first(self) -> Iterator[str]:
+        for m in self._partition_keys():
+            yield from self.partition(m).sorted_ids()
+
+
+Ref = Tuple[str, str, int]  # (role, group_id, num)
+
+
+def _refs(meeting: Dict[str, Any]) -> List[Ref]:
+    """会議が使っている (役割, 団体, 号数) の一覧."""
+    refs: List[Ref] = []
+    items = [("main", meeting.get("main") or {})] + [("sub", s) for s in meeting.get("sub") or []]
+    for role, ref in items:
+        gid, num = ref.get("group_id"), ref.get("num")
+        if isinstance(gid, str) and gid and isinstance(num, (int, float)) and not isinstance(num, bool):
+            refs.append((role, gid, int(num)))
+    return refs
+
+
+def _parse_sequence(payload: Dict[str, Any]) -> Dict[str, Dict[str, Dict[str, List[str]]]]:
+    if payload.get("version") != INDEX_VERSION:
+        return {}
+    return payload.get("groups") or {}
+
+
+def _load_sequence(group_id: str) -> Dict[str, Dict[str, Dict[str, List[str]]]]:
+    return _read_cached(_sequence_path(group_id), _parse_sequence, dict)
+
+
+def group_sequence(group_id: str) -> Dict[int, List[Tuple[str, str]]]:
+    """団体の号数 → [(meeting id, 役割)]（main/sub の両方）."""
+    used: Dict[int, List[Tuple[str, str]]] = {}
+    for role, nums in (_load_sequence(group_id).get(group_id) or {}).items():
+        for num, mids in nums.items():
+            used.setdefault(int(num), []).extend((mid, role) for mid in mids)
+    return used
+
+
+def next_meeting_num(group_id: str) -> int:
+    used = group_sequence(group_id)
+    return max(used) + 1 if used else 1
+
+
+def sequence_report(group_id: str) -> Dict[str, Any]:
+    """使用済み号数・欠番（1〜最大の間）・重複（複数の会議が同じ号数）をまとめる."""
+    used = group_sequence(group_id)
+    last = max(used) if used else 0
+    return {
+        "nums": sorted(used),
+        "next": last + 1,
+        "gaps": [n for n in range(1, last + 1) if n not in used],
+        "duplicates": {n: sorted(used[n]) for n in sorted(used) if len(used[n]) > 1},
+    }
+
+
+def meeting_num_conflicts(meeting: Dict[str, Any]) -> List[Tuple[str, int, str]]:
+    """meeting と同じ (団体, 号数) を使っている別の会議を (団体, 号数, meeting id) で返す."""
+    conflicts: List[Tuple[str, int, str]] = []
+    for _, gid, num in _refs(meeting):
+        for other, _role in group_sequence(gid).get(num, []):
+            if other != meeting.get("id"):
+                conflicts.append((gid, num, other))
+    return conflicts
+
+
+def _parse_stats(payload: Dict[str, Any]) -> Optional[Aggregates]:
+    if payload.get("index_version") != INDEX_VERSION:
+        return None
+    return Aggregates.from_json(payload)
+
+
+def _stats_payload(stats: Aggregates) -> Dict[str, Any]:
+    return {"index_version": INDEX_VERSION, **stats.to_json()}
+
+
+def meeting_stats() -> Aggregates:
+    """保存済みの集計を返す。最新にしたい場合は先に current_index() を呼ぶ.
+
+    集計ファイルが無い・古い場合はパーティションのサマリを1回なめて作り直す。
+    """
+    stats = _read_cached(_stats_path(), _parse_stats, lambda: None)
+    if stats is None:
+        with data_lock(), _lock:
+            stats = Aggregates.from_meetings(load_index().summaries())
+            _write_cached(_stats_path(), _stats_payload(stats), stats)
+    return stats
+
+
+def load_index() -> MeetingIndex:
+    """保存済みのインデックスを読む（無ければ空）."""
+    return MeetingIndex.load()
+
+
+def _apply(
+    upserts: Iterable[Tuple[Dict[str, Any], int]],
+    removals: Iterable[str],
+    lock_timeout: float = LOCK_TIMEOUT,
+) -> MeetingIndex:
+    """変更をパーティション単位で反映し、変わったファイルだけ書き戻す（号数表・集計も含めて data_lock の中で行う）."""
+    with data_lock(lock_timeout), _lock:
+        locator = dict(_read_cached(_locator_path(), _parse_locator, dict))
+        index = load_index()
+        counts = dict(index.counts)
+        dirty: Dict[str, MeetingSummaryIndex] = {}
+        dirty_seq: Dict[Path, Dict[str, Dict[str, Dict[str, List[str]]]]] = {}
+        stats = meeting_stats().copy()
+
+        def part(month: str) -> MeetingSummaryIndex:
+            if month not in dirty:
+                dirty[month] = index.partition(month).copy()
+            return dirty[month]
+
+        def seq(group_id: str) -> Dict[str, Dict[str, List[str]]]:
+            path = _sequence_path(group_id)
+            if path not in dirty_seq:
+                dirty_seq[path] = copy.deepcopy(_load_sequence(group_id))
+            return dirty_seq[path].setdefault(group_id, {})
+
+        def drop_refs(month: str, mid: str) -> None:
+            """古い行の号数と集計への寄与を取り消す."""
+            partition = part(month)
+            if mid not in partition:
+                return
+            row = partition.row(partition.pos[mid])
+            stats.remove(row)
+            for role, gid, num in _refs(row):
+                mids = seq(gid).get(role, {}).get(str(num), [])
+                if mid in mids:
+                    mids.remove(mid)
+
+        for mid in removals:
+            month = locator.pop(mid, None)
+            if month is not None:
+                drop_refs(month, mid)
+                part(month).remove(mid)
+        for meeting, mtime in upserts:
+            month = month_of(meeting.get("date"))
+            old = locator.get(meeting["id"])
+            if old is not None:
+                drop_refs(old, meeting["id"])
+                if old != month:
+                    part(old).remove(meeting["id"])
+            partition = part(month)
+            partition.upsert(meeting, mtime)
+            stats.add(partition.row(partition.pos[meeting["id"]]))
+            locator[meeting["id"]] = month
+            for role, gid, num in _refs(meeting):
+                mids = seq(gid).setdefault(role, {}).setdefault(str(num), [])
+                if meeting["id"] not in mids:
+                    mids.append(meeting["id"])
+        if not dirty:
+            return index
+
+        for path, groups in dirty_seq.items():
+            # 空になった号数・団体は残さない
+            for gid in list(groups):
+                roles = {role: {n: ids for n, ids in nums.items() if ids} for role, nums in groups[gid].items()}
+                groups[gid] = {role: nums for role, nums in roles.items() if nums}
+                if not groups[gid]:
+                    del groups[gid]
+            _write_cached(path, {"version": INDEX_VERSION, "groups": groups}, groups)
+
+        for month, partition in dirty.items():
+            counts[month] = len(partition)
+            if len(partition):
+                _write_cached(_partition_path(month), partition.to_json(), partition)
+            else:
+                counts.pop(month, None)
+                _partition_path(month).unlink(missing_ok=True)
+        _write_cached(_stats_path(), _stats_payload(stats), stats)
+        _write_cached(_locator_path(), {"version": INDEX_VERSION, "ids": locator}, locator)
+        _write_cached(_manifest_path(), {"version": INDEX_VERSION, "months": counts}, counts)
+        return MeetingIndex.load()
+
+
+def _scan_mtimes() -> Dict[str, int]:
+    meeting_dir = data_dir() / "meeting"
+    seen: Dict[str, int] = {}
+    if not meeting_dir.exists():
+        return seen
+    with os.scandir(meeting_dir) as it:
+        for entry in it:
+            if not entry.is_dir():
+                continue
+            try:
+                seen[entry.name] = os.stat(os.path.join(entry.path, "basic.json")).st_mtime_ns
+            except FileNotFoundError:
+                continue
+    return seen
+
+
+def refresh_index(lock_timeout: float = LOCK_TIMEOUT) -> MeetingIndex:
+    """data/meeting と突き合わせ、追加・変更（mtime差分）・削除された会議だけを反映する.
+
+    basic.json は stat するだけで、変更があったものしか開かない。
+    反映するときは data_lock を取る（lock_timeout 秒で取れなければ LockTimeout）。
+    """
+    seen = _scan_mtimes()
+    locator = _read_cached(_locator_path(), _parse_locator, dict)
+    index = load_index()
+    known: Dict[str, int] = {}
+    for month in set(locator.values()):
+        columns = index.partition(month).columns
+        known.update(zip(columns["id"], columns["mtime_ns"]))
+    stale = [mid for mid, mtime in seen.items() if known.get(mid) != mtime]
+    removed = [mid for mid in known if mid not in seen]
+    with _lock:
+        _last_refresh[index_root()] = time.monotonic()
+    if not stale and not removed:
+        return index
+
+    def load(mid: str) -> Tuple[Dict[str, Any], int]:
+        payload = json.loads(_basic_path(mid).read_text(encoding="utf-8"))
+        payload["id"] = mid
+        return payload, seen[mid]
+
+    return _apply((load(mid) for mid in stale), removed, lock_timeout)
+
+
+def current_index(max_age: float = REFRESH_INTERVAL) -> MeetingIndex:
+    """表示用。直近 max_age 秒以内に突き合わせ済みなら保存済みインデックスをそのまま使う.
+
+    同じプロセスでの保存・削除は update_meetings/remove_meetings で即時反映される。
+    別プロセスが data/ のロックを持っている間（convert など）は待たずに保存済みのインデックスを返す。
+    """
+    with _lock:
+        last = _last_refresh.get(index_root())
+    if last is not None and time.monotonic() - last < max_age:
+        return load_index()
+    try:
+        return refresh_index(REFRESH_LOCK_TIMEOUT)
+    except LockTimeout:
+        return load_index()
+
+
+def update_meetings(meetings: Iterable[Dict[str, Any]]) -> None:
+    """書き込み済みの会議をまとめてインデックスへ反映する（convert / save_meeting 用）."""
+    upserts: List[Tuple[Dict[str, Any], int]] = []
+    for m in meetings:
+        try:
+            upserts.append((m, _basic_path(m["id"]).stat().st_mtime_ns))
+        except FileNotFoundError:
+            continue
+    _apply(upserts, [])
+
+
+def remove_meetings(meeting_ids: Iterable[str]) -> None:
+    _apply([], list(meeting_ids))
+
+
+def iter_meetings() -> Iterator[Dict[str, Any]]:
+    """basic.json を新しい順に1件ずつ読み込んで返す（必要な月のパーティションだけを読む）."""
+    for mid in refresh_index().ids_newest_first():
+        path = _basic_path(mid)
+        if not path.exists():
+            continue
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload["id"] = mid
+        yield payload
+
+
+def rebuild_index() -> MeetingIndex:
+    """フラットな data/meeting/<uuid>/ から月別パーティションを作り直す."""
+    with data_lock():
+        with _lock:
+            shutil.rmtree(index_root(), ignore_errors=True)
+            # v1 の単一ファイル形式が残っていれば片付ける
+            (index_dir() / "meeting_summary.json").unlink(missing_ok=True)
+            for path in list(_cache):
+                if index_root() in path.parents:
+                    _cache.pop(path, None)
+        return refresh_index()
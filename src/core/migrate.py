@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import copy
+import difflib
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from src.core.journal import record_changes
+from src.core.lock import locked
+from src.core.manifest import ENTITIES, entity_files, relative_path
+from src.core.sources import normalize_sources
+from src.core.validator import validate_with_schema
+from src.core.writer import serialize_json, write_json_atomic, write_json_file
+from src.utils import index_dir, schema_base_dir
+
+VERSION_KEY = "schema_version"
+SCHEMAS = {
+    "group": "group.data.schema.json",
+    "person": "person.data.schema.json",
+    "meeting": "meeting.basic.data.schema.json",
+}
+CHUNK_SIZE = 64
+
+Payload = Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class Migration:
+    entity: str
+    version: int
+    name: str
+    apply: Callable[[Payload], Payload]
+
+
+_REGISTRY: Dict[str, List[Migration]] = {entity: [] for entity in ENTITIES}
+
+
+def migration(entity: str, version: int, name: str) -> Callable[[Callable[[Payload], Payload]], Callable[[Payload], Payload]]:
+    """マイグレーションを登録する。version は entity ごとに 1 から連番で増やす.
+
+    関数は1件分の dict を受け取って新しい dict を返す。同じデータに2回かけても結果が変わらないように書く。
+    """
+    def register(func: Callable[[Payload], Payload]) -> Callable[[Payload], Payload]:
+        chain = _REGISTRY[entity]
+        expected = chain[-1].version + 1 if chain else 1
+        if version != expected:
+            raise ValueError(f"{entity} のマイグレーション番号が連番ではありません: {version}（期待値 {expected}）")
+        chain.append(Migration(entity, version, name, func))
+        return func
+
+    return register
+
+
+def migrations_for(entity: str) -> List[Migration]:
+    return list(_REGISTRY[entity])
+
+
+def current_version(entity: str) -> int:
+    chain = _REGISTRY[entity]
+    return chain[-1].version if chain else 0
+
+
+def stamp_version(entity: str, payload: Payload) -> Payload:
+    """現行の書式で作ったレコードに schema_version を付ける（マイグレーションが無ければ付けない）."""
+    version = current_version(entity)
+    if version:
+        payload[VERSION_KEY] = version
+    return payload
+
+
+def migrate_payload(entity: str, payload: Payload) -> tuple[Payload, List[str]]:
+    """未適用のマイグレーションを順にかけ、(結果, 適用した名前) を返す。元の dict は変更しない."""
+    version = payload.get(VERSION_KEY) or 0
+    pending = [m for m in _REGISTRY[entity] if m.version > version]
+    result = copy.deepcopy(payload)
+    for m in pending:
+        result = m.apply(result)
+    if pending:
+        result[VERSION_KEY] = pending[-1].version
+    return result, [f"{m.version:03d}_{m.name}" for m in pending]
+
+
+@dataclass
+class FileResult:
+    entity: str
+    path: str
+    applied: List[str] = field(default_factory=list)
+    changed: bool = False
+    diff: str = ""
+    error: Optional[str] = None
+    # 書き込んだ内容（ジャーナル記録用。dry-run では None）
+    payload: Optional[Payload] = field(default=None, repr=False)
+
+
+@dataclass
+class MigrationRun:
+    results: List[FileResult] = field(default_factory=list)
+    resumed: int = 0
+    dry_run: bool = False
+
+    @property
+    def changed(self) -> List[FileResult]:
+        return [r for r in self.results if r.changed]
+
+    @property
+    def errors(self) -> List[FileResult]:
+        return [r for r in self.results if r.error]
+
+
+def migrate_file(entity: str, path: Path, dry_run: bool = False) -> FileResult:
+    """1ファイルを移行する。結果はスキーマで検証し、通らなければ書かずに error を返す."""
+    rel = relative_path(path)
+    try:
+        before = json.loads(path.read_text(encoding="utf-8"))
+        after, applied = migrate_payload(entity, before)
+        result = FileResult(entity, rel, applied, changed=after != before)
+        if not result.changed:
+            return result
+        validate_with_schema(after, schema_base_dir() / SCHEMAS[entity])
+    except Exception as e:  # 1件の失敗で全体を止めない
+        return FileResult(entity, rel, error=f"{type(e).__name__}: {getattr(e, 'message', e)}")
+    if dry_run:
+        result.diff = "".join(difflib.unified_diff(
+            serialize_json(before).splitlines(keepends=True),
+            serialize_json(after).splitlines(keepends=True),
+            fromfile=f"a/{rel}",
+            tofile=f"b/{rel}",
+        ))
+    else:
+        # 一時ファイル経由で置き換えるので、中断しても書きかけのファイルは残らない
+        write_json_file(path, after)
+        result.payload = after
+    return result
+
+
+def checkpoint_path() -> Path:
+    return index_dir() / "migrate" / "checkpoint.json"
+
+
+def _load_checkpoint(targets: Dict[str, int]) -> Dict[str, set]:
+    """同じ移行先バージョンで中断した実行の「済み」ファイル一覧を返す."""
+    try:
+        payload = json.loads(checkpoint_path().read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+    if payload.get("targets") != targets:
+        return {}
+    return {entity: set(paths) for entity, paths in (payload.get("done") or {}).items()}
+
+
+def _save_checkpoint(targets: Dict[str, int], done: Dict[str, set]) -> None:
+    write_json_atomic(checkpoint_path(), {
+        "targets": targets,
+        "done": {entity: sorted(paths) for entity, paths in done.items()},
+    })
+
+
+def _chunks(items: List[Path], size: int) -> Iterable[List[Path]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _migrate_chunk(entity: str, paths: List[Path], dry_run: bool) -> List[FileResult]:
+    return [migrate_file(entity, p, dry_run) for p in paths]
+
+
+@locked
+def run_migrations(
+    entities: Optional[Iterable[str]] = None,
+    dry_run: bool = False,
+    workers: int = 4,
+    restart: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    on_result: Optional[Callable[[FileResult], None]] = None,
+) -> MigrationRun:
+    """data/ の各ファイルに未適用のマイグレーションをかける.
+
+    ファイルはチャンクに分けてスレッドプールで処理し、終わったチャンクごとに
+    data/index/migrate/checkpoint.json へ記録する。中断後に再実行すると記録済みのファイルは読まずに飛ばす。
+    dry_run では何も書かず、変更されるファイルの差分だけを返す。
+    """
+    selected = list(entities or ENTITIES)
+    targets = {entity: current_version(entity) for entity in selected}
+    if restart and checkpoint_path().exists():
+        checkpoint_path().unlink()
+    done = {} if dry_run else _load_checkpoint(targets)
+    run = MigrationRun(dry_run=dry_run)
+
+    jobs: List[tuple[str, List[Path]]] = []
+    for entity in selected:
+        if not targets[entity]:
+            continue
+        finished = done.setdefault(entity, set())
+        pending = []
+        for path in entity_files(entity):
+            if relative_path(path) in finished:
+                run.resumed += 1
+            else:
+                pending.append(path)
+        jobs.extend((entity, chunk) for chunk in _chunks(pending, chunk_size))
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(_migrate_chunk, entity, chunk, dry_run) for entity, chunk in jobs]
+        for future in as_completed(futures):
+            for result in future.result():
+                run.results.append(result)
+                if not result.error:
+                    done[result.entity].add(result.path)
+                if on_result is not None:
+                    on_result(result)
+            if not dry_run:
+                _save_checkpoint(targets, done)
+
+    run.results.sort(key=lambda r: (r.entity, r.path))
+    record_changes(
+        (r.entity, Path(r.path).parent.name if r.entity == "meeting" else Path(r.path).stem, r.payload)
+        for r in run.results
+        if r.payload is not None
+    )
+    # 失敗が残っていれば次回はそのファイルだけをやり直せるよう記録を残す
+    if not dry_run and not run.errors and checkpoint_path().exists():
+        checkpoint_path().unlink()
+    return run
+
+
+# ---- マイグレーション定義（追加するときは末尾に番号を増やして書く） ----
+
+
+@migration("meeting", 1, "normalize_sources")
+def _meeting_sources_dict(payload: Payload) -> Payload:
+    """旧形式の sources（配列）を meeting_page/transcript/announcement/other の dict に揃える."""
+    payload["sources"] = normalize_sources(payload.get("sources"))
+    return payload
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar
+
+from src.core.loader import load_json_file
+
+R = TypeVar("R", bound="_Record")
+
+
+class IdTable:
+    """UUID 文字列を整数ハンドルへ割り当てる。同じ id の文字列はテーブル内で1つだけ保持する.
+
+    テーブルは増える一方なので、読み込み1回（ビューアでは1リクエスト）ごとに作って捨てる。
+    """
+
+    __slots__ = ("_ids", "_handles", "_lock")
+
+    def __init__(self) -> None:
+        self._ids: List[str] = []
+        self._handles: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def handle(self, value: str) -> int:
+        h = self._handles.get(value)
+        if h is not None:
+            return h
+        with self._lock:
+            h = self._handles.get(value)
+            if h is None:
+                h = len(self._ids)
+                self._ids.append(sys.intern(value))
+                self._handles[self._ids[h]] = h
+            return h
+
+    def id(self, handle: int) -> str:
+        return self._ids[handle]
+
+    def intern(self, value: Any) -> Any:
+        """文字列なら共有インスタンスを返す（それ以外はそのまま）."""
+        if not isinstance(value, str):
+            return value
+        return self._ids[self.handle(value)]
+
+
+class _Record:
+    """JSON のキー名をそのまま属性名にしたスロット付きレコードの基底.
+
+    テンプレートや既存コードからは dict と同じく get()/[] でも読める。
+    JSON に存在したキーだけを _present のビットで覚え、to_json() で元の形に戻す。
+    """
+
+    __slots__ = ("_present", "_extra")
+    FIELDS: Tuple[str, ...] = ()
+
+    def __init__(self) -> None:
+        self._present = 0
+        self._extra: Optional[Dict[str, Any]] = None
+        for name in self.FIELDS:
+            setattr(self, name, None)
+
+    @classmethod
+    def from_json(cls: Type[R], data: Dict[str, Any], table: IdTable) -> R:
+        rec = cls()
+        for key, value in data.items():
+            if key in cls.FIELDS:
+                rec._set(key, value, table)
+            else:
+                if rec._extra is None:
+                    rec._extra = {}
+                rec._extra[key] = value
+        return rec
+
+    def _set(self, key: str, value: Any, table: IdTable) -> None:
+        setattr(self, key, self._decode(key, value, table))
+        self._present |= 1 << self.FIELDS.index(key)
+
+    def _decode(self, key: str, value: Any, table: IdTable) -> Any:
+        return value
+
+    def _encode(self, key: str, value: Any) -> Any:
+        return value
+
+    def to_json(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for i, key in enumerate(self.FIELDS):
+            if self._present >> i & 1:
+                out[key] = self._encode(key, getattr(self, key))
+        if self._extra:
+            out.update(self._extra)
+        return out
+
+    def __contains__(self, key: str) -> bool:
+        if key in self.FIELDS:
+            return bool(self._present >> self.FIELDS.index(key) & 1)
+        return bool(self._extra) and key in self._extra
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self:
+            raise KeyError(key)
+        if key in self.FIELDS:
+            return getattr(self, key)
+        return self._extra[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self.FIELDS:
+            table = getattr(self, "_table", None)
+            self._set(key, value, IdTable() if table is None else table)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _Record):
+            return type(self) is type(other) and self.to_json() == other.to_json()
+        if isinstance(other, dict):
+            return self.to_json() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_json()!r})"
+
+
+class GroupRef(_Record):
+    """meeting.main / meeting.sub[] の {group_id, num}."""
+
+    __slots__ = ("group_id", "num")
+    FIELDS = ("group_id", "num")
+
+    def _decode(self, key: str, value: Any, table: IdTable) -> Any:
+        return table.intern(value) if key == "group_id" else value
+
+
+class Group(_Record):
+    __slots__ = ("id", "name", "parent", "category", "list_url", "official_url")
+    FIELDS = ("id", "name", "parent", "category", "list_url", "official_url")
+
+    def _decode(self, key: str, value: Any, table: IdTable) -> Any:
+        return table.intern(value) if key in ("id", "parent") else value
+
+
+class Person(_Record):
+    __slots__ = ("id", "name", "name_yomi")
+    FIELDS = ("id", "name", "name_yomi")
+
+    def _decode(self, key: str, value: Any, table: IdTable) -> Any:
+        return table.intern(value) if key == "id" else value
+
+
+class Meeting(_Record):
+    """attendee は IdTable のハンドル（array('I')）で保持し、参照時に id 文字列へ戻す."""
+
+    __slots__ = (
+        "id", "main", "sub", "date", "holding", "start_time", "end_time",
+        "agenda", "_attendee", "sources", "materials", "_table",
+    )
+    FIELDS = (
+        "id", "main", "sub", "date", "holding", "start_time", "end_time",
+        "agenda", "attendee", "sources", "materials",
+    )
+
+    def __init__(self) -> None:
+        self._table: Optional[IdTable] = None
+        super().__init__()
+
+    def _decode(self, key: str, value: Any, table: IdTable) -> Any:
+        if key == "id":
+            return table.intern(value)
+        if key == "main" and isinstance(value, dict):
+            return GroupRef.from_json(value, table)
+        if key == "sub" and isinstance(value, list):
+            return [GroupRef.from_json(s, table) if isinstance(s, dict) else s for s in value]
+        if key == "attendee" and isinstance(value, list) and all(isinstance(p, str) for p in value):
+            self._table = table
+            return array("I", [table.handle(p) for p in value])
+        return value
+
+    def _encode(self, key: str, value: Any) -> Any:
+        if key == "main" and isinstance(value, GroupRef):
+            return value.to_json()
+        if key == "sub" and isinstance(value, list):
+            return [s.to_json() if isinstance(s, GroupRef) else s for s in value]
+        return value
+
+    @property
+    def attendee(self) -> Any:
+        value = self._attendee
+        if isinstance(value, array) and self._table is not None:
+            return [self._table.id(h) for h in value]
+        return value
+
+    @attendee.setter
+    def attendee(self, value: Any) -> None:
+        self._attendee = value
+
+
+def load_records(cls: Type[R], dir_path: Path, table: Optional[IdTable] = None) -> List[R]:
+    """data/{group,person}/*.json をレコードとして読む（id はファイル名）。table を省略したら読み込みごとに作る."""
+    table = IdTable() if table is None else table
+    records: List[R] = []
+    if not dir_path.exists():
+        return records
+    for file in sorted(dir_path.glob("*.json")):
+        data = load_json_file(file)
+        data["id"] = file.stem
+        records.append(cls.from_json(data, table))
+    return records
+
+
+def to_meetings(items: Iterable[Dict[str, Any]], table: Optional[IdTable] = None) -> Iterator[Meeting]:
+    table = IdTable() if table is None else table
+    for data in items:
+        yield Meeting.from_json(data, table)
@@ -1,41 +1,128 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
 from uuid import uuid4
 
+_SPACES = re.compile(r"\s+")
+# カタカナ→ひらがな（よみの表記ゆれ吸収用）
+_KATA_TO_HIRA = {cp: cp - 0x60 for cp in range(ord("ァ"), ord("ヶ") + 1)}
+
+
+def normalize_name(name: str) -> str:
+    """NFKC 正規化し、空白（全角含む）を取り除いた照合用キー."""
+    return _SPACES.sub("", unicodedata.normalize("NFKC", name))
+
+
+def normalize_yomi(yomi: str) -> str:
+    return normalize_name(yomi).translate(_KATA_TO_HIRA)
+
+
+def name_bigrams(key: str) -> Set[str]:
+    if len(key) < 2:
+        return {key} if key else set()
+    return {key[i:i + 2] for i in range(len(key) - 1)}
+
+
+class UnresolvedName(ValueError):
+    """未登録（または複数に一致する）名前。近い候補を suggestions に持つ."""
+
+    def __init__(self, name: str, suggestions: List[str], ambiguous: bool = False) -> None:
+        self.name = name
+        self.suggestions = suggestions
+        self.ambiguous = ambiguous
+        message = f"複数の登録に一致する名前です: {name}" if ambiguous else f"未登録の名前です: {name}"
+        if suggestions:
+            message += f"（候補: {', '.join(suggestions)}）"
+        super().__init__(message)
+
 
 @dataclass
 class NameRegistry:
-    name_to_id: Dict[str, str]
+    # 正規化キー → id の集合（同名の別団体・同名異よみの人物がありうる）
+    name_to_ids: Dict[str, Set[str]]
+    # 正規化キー → 表示用の元の名前（候補提示用）
+    display: Dict[str, str] = field(default_factory=dict)
+    yomi_to_ids: Dict[str, Set[str]] = field(default_factory=dict)
+    _grams: Optional[Dict[str, Set[str]]] = field(default=None, repr=False, compare=False)
 
     @classmethod
     def from_lists(cls, pairs: List[Dict[str, str]]) -> "NameRegistry":
-        mapping: Dict[str, str] = {}
+        registry = cls({})
         for item in pairs:
-            name = item["name"]
-            value_id = item["id"]
-            key = cls._normalize(name)
-            mapping[key] = value_id
-            # UUIDが直接指定された場合も解決できるよう、ID自体もキーに登録する
-            mapping[cls._normalize(value_id)] = value_id
-        return cls(mapping)
+            registry.add(item["name"], item["id"], item.get("name_yomi"))
+        return registry
 
     @staticmethod
     def _normalize(name: str) -> str:
-        return name.strip()
+        return normalize_name(name)
 
-    def resolve(self, name: str) -> str:
+    def add(self, name: str, value_id: str, yomi: Optional[str] = None) -> None:
         key = self._normalize(name)
-        if key not in self.name_to_id:
-            raise ValueError(f"未登録の名前です: {name}")
-        return self.name_to_id[key]
+        self.name_to_ids.setdefault(key, set()).add(value_id)
+        self.display[key] = name.strip()
+        # UUIDが直接指定された場合も解決できるよう、ID自体もキーに登録する
+        self.name_to_ids.setdefault(self._normalize(value_id), set()).add(value_id)
+        if yomi and normalize_yomi(yomi):
+            self.yomi_to_ids.setdefault(normalize_yomi(yomi), set()).add(value_id)
+        self._grams = None
+
+    def candidates(self, name: str) -> Set[str]:
+        """name → id・よみの順で一致する id を返す（name で当たればよみは見ない）."""
+        ids = self.name_to_ids.get(self._normalize(name))
+        if ids:
+            return ids
+        return self.yomi_to_ids.get(normalize_yomi(name), set())
+
+    def lookup(self, name: str) -> Optional[str]:
+        """name → id・よみの順で引く。複数の id に当たる場合は解決しない."""
+        ids = self.candidates(name)
+        if len(ids) == 1:
+            return next(iter(ids))
+        return None
+
+    def resolve(self, name: str) -> str:
+        """name を id にする。複数に当たる場合は推測せず、候補の id を添えて UnresolvedName を送出する."""
+        ids = self.candidates(name)
+        if len(ids) > 1:
+            raise UnresolvedName(name, sorted(ids), ambiguous=True)
+        if not ids:
+            raise UnresolvedName(name, self.suggest(name))
+        return next(iter(ids))
 
     def resolve_or_create(self, name: str) -> str:
-        key = self._normalize(name)
-        found = self.name_to_id.get(key)
-        if found:
-            return found
+        if self.candidates(name):
+            return self.resolve(name)
         new_id = str(uuid4())
-        self.name_to_id[key] = new_id
+        self.add(name, new_id)
         return new_id
+
+    def _gram_index(self) -> Dict[str, Set[str]]:
+        """bigram → 正規化キー の転置インデックス（初回の未解決時に作る）."""
+        if self._grams is None:
+            grams: Dict[str, Set[str]] = {}
+            for key in self.display:
+                for g in name_bigrams(key):
+                    grams.setdefault(g, set()).add(key)
+            self._grams = grams
+        return self._grams
+
+    def suggest(self, name: str, limit: int = 3, threshold: float = 0.3) -> List[str]:
+        """bigram の Dice 係数で近い登録名を返す。共通の bigram を持つ名前だけを比較する."""
+        query = name_bigrams(self._normalize(name))
+        if not query:
+            return []
+        index = self._gram_index()
+        overlap: Dict[str, int] = {}
+        for g in query:
+            for key in index.get(g, ()):
+                overlap[key] = overlap.get(key, 0) + 1
+        scored = []
+        for key, common in overlap.items():
+            score = 2 * common / (len(query) + len(name_bigrams(key)))
+            if score >= threshold:
+                scored.append((-score, key))
+        scored.sort()
+        return [self.display[key] for _, key in scored[:limit]]
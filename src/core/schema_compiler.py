@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import json
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Check = Callable[[Any], bool]
+
+# 生成コードで扱うキーワード。これ以外を含むスキーマはコンパイルせず jsonschema に任せる
+ANNOTATIONS = {"$schema", "$id", "$comment", "title", "description", "examples", "default", "format"}
+SUPPORTED = ANNOTATIONS | {
+    "type", "enum", "pattern", "minLength", "maxLength",
+    "properties", "required", "additionalProperties", "items",
+}
+
+# jsonschema（Draft 2020-12）の型判定に合わせる: bool は integer/number に含めず、1.0 は integer とみなす
+TYPE_TESTS = {
+    "string": "isinstance({v}, str)",
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "null": "{v} is None",
+    "boolean": "({v} is True or {v} is False)",
+    "integer": "((isinstance({v}, int) and not isinstance({v}, bool)) or (isinstance({v}, float) and {v}.is_integer()))",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+}
+
+
+class UnsupportedSchema(ValueError):
+    """生成コードで表現できないキーワードを含む."""
+
+
+class _Emitter:
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.consts: Dict[str, Any] = {}
+        self._vars = 0
+
+    def const(self, value: Any) -> str:
+        name = f"_c{len(self.consts)}"
+        self.consts[name] = value
+        return name
+
+    def var(self) -> str:
+        self._vars += 1
+        return f"v{self._vars}"
+
+    def emit(self, line: str, depth: int) -> None:
+        self.lines.append("    " * depth + line)
+
+    def fail_unless(self, cond: str, depth: int) -> None:
+        self.emit(f"if not ({cond}):", depth)
+        self.emit("return False", depth + 1)
+
+    def schema(self, schema: Any, v: str, depth: int) -> None:
+        if schema is True or schema == {}:
+            return
+        if schema is False:
+            self.emit("return False", depth)
+            return
+        if not isinstance(schema, dict):
+            raise UnsupportedSchema(f"スキーマが object ではありません: {schema!r}")
+        unknown = set(schema) - SUPPORTED
+        if unknown:
+            raise UnsupportedSchema(f"未対応のキーワード: {', '.join(sorted(unknown))}")
+
+        types = schema.get("type")
+        if isinstance(types, str):
+            types = [types]
+        if types is not None:
+            if any(t not in TYPE_TESTS for t in types):
+                raise UnsupportedSchema(f"未対応の type: {types}")
+            self.fail_unless(" or ".join(TYPE_TESTS[t].format(v=v) for t in types), depth)
+
+        if "enum" in schema:
+            values = schema["enum"]
+            if not all(isinstance(x, str) for x in values):
+                raise UnsupportedSchema("文字列以外の enum")
+            self.fail_unless(f"isinstance({v}, str) and {v} in {self.const(frozenset(values))}", depth)
+
+        self._string(schema, v, depth, types)
+        self._object(schema, v, depth, types)
+        self._array(schema, v, depth, types)
+
+    def _guard(self, kind: str, v: str, depth: int, types: Optional[List[str]]) -> int:
+        """型が kind に確定していなければ isinstance で囲み、本体のインデントを返す."""
+        if types == [kind]:
+            return depth
+        self.emit(f"if {TYPE_TESTS[kind].format(v=v)}:", depth)
+        return depth + 1
+
+    def _string(self, schema: Dict[str, Any], v: str, depth: int, types: Optional[List[str]]) -> None:
+        keys = [k for k in ("pattern", "minLength", "maxLength") if k in schema]
+        if not keys:
+            return
+        d = self._guard("string", v, depth, types)
+        if "minLength" in schema:
+            self.fail_unless(f"len({v}) >= {int(schema['minLength'])}", d)
+        if "maxLength" in schema:
+            self.fail_unless(f"len({v}) <= {int(schema['maxLength'])}", d)
+        if "pattern" in schema:
+            # jsonschema と同じく re.search（部分一致）で判定する
+            self.fail_unless(f"{self.const(re.compile(schema['pattern']))}.search({v}) is not None", d)
+
+    def _object(self, schema: Dict[str, Any], v: str, depth: int, types: Optional[List[str]]) -> None:
+        keys = [k for k in ("properties", "required", "additionalProperties") if k in schema]
+        if not keys:
+            return
+        d = self._guard("object", v, depth, types)
+        for name in schema.get("required", []):
+            self.fail_unless(f"{json.dumps(name)} in {v}", d)
+        props: Dict[str, Any] = schema.get("properties", {})
+        additional = schema.get("additionalProperties", True)
+        if additional is False:
+            self.fail_unless(f"{self.const(frozenset(props))}.issuperset({v})", d)
+        elif additional is not True:
+            key = self.var()
+            child = self.var()
+            self.emit(f"for {key}, {child} in {v}.items():", d)
+            self.emit(f"if {key} not in {self.const(frozenset(props))}:", d + 1)
+            self.schema(additional, child, d + 2)
+        for name, sub in props.items():
+            if sub is True or sub == {}:
+                continue
+            child = self.var()
+            self.emit(f"{child} = {v}.get({json.dumps(name)}, _MISSING)", d)
+            self.emit(f"if {child} is not _MISSING:", d)
+            self.schema(sub, child, d + 1)
+
+    def _array(self, schema: Dict[str, Any], v: str, depth: int, types: Optional[List[str]]) -> None:
+        items = schema.get("items", True)
+        if items is True or items == {}:
+            return
+        d = self._guard("array", v, depth, types)
+        child = self.var()
+        self.emit(f"for {child} in {v}:", d)
+        self.schema(items, child, d + 1)
+
+
+def generate_source(schema: Any, name: str = "check") -> Tuple[str, Dict[str, Any]]:
+    """スキーマを検証関数の Python ソースへ変換する。(ソース, 定数の名前空間) を返す."""
+    emitter = _Emitter()
+    emitter.schema(schema, "v0", 1)
+    source = "\n".join([f"def {name}(v0):", *emitter.lines, "    return True", ""])
+    return source, emitter.consts
+
+
+def compile_schema(schema: Any, filename: str = "<schema>") -> Check:
+    """スキーマ専用の検証関数を生成する。True なら jsonschema でも必ず valid."""
+    source, consts = generate_source(schema)
+    namespace: Dict[str, Any] = {"_MISSING": object(), **consts}
+    exec(compile(source, filename, "exec"), namespace)
+    return namespace["check"]
+
+
+_cache: Dict[Path, Tuple[Tuple[int, int], Any, Optional[Check], Any]] = {}
+_lock = threading.Lock()
+
+
+def load_compiled(schema_path: Path) -> Tuple[Any, Optional[Check], Any]:
+    """(スキーマ, 生成した検証関数 or None, jsonschema の validator) をファイルの更新まで使い回す."""
+    from jsonschema.validators import validator_for
+
+    st = schema_path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _lock:
+        hit = _cache.get(schema_path)
+    if hit is not None and hit[0] == stamp:
+        return hit[1], hit[2], hit[3]
+
+    schema = json.loads(schema_path.read_text(encoding="utf-8"))
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    try:
+        check: Optional[Check] = compile_schema(schema, filename=f"<schema {schema_path.name}>")
+    except (UnsupportedSchema, re.error):
+        check = None
+    entry = (stamp, schema, check, cls(schema))
+    with _lock:
+        _cache[schema_path] = entry
+    return entry[1], entry[2], entry[3]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """docs/schema/base の各スキーマから生成されるソースを表示する（確認用）."""
+    from src.utils import schema_base_dir
+
+    paths = [Path(p) for p in (argv if argv is not None else sys.argv[1:])]
+    for path in paths or sorted(schema_base_dir().glob("*.schema.json")):
+        print(f"# {path.name}")
+        try:
+            print(generate_source(json.loads(path.read_text(encoding="utf-8")))[0])
+        except UnsupportedSchema as e:
+            print(f"# jsonschema にフォールバック: {e}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+
+def clean_url(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    v = value.strip()
+    return v or None
+
+
+def _other_item(item: Any) -> Optional[Dict[str, Any]]:
+    url = clean_url(item.get("url")) if isinstance(item, dict) else None
+    if not url:
+        return None
+    return {"url": url, "title": item.get("title")}
+
+
+def normalize_sources(raw: Any) -> Dict[str, Any]:
+    """旧形式(list)も受け取り、新形式のdictに揃える.
+
+    data/ の正規形は常に4つのキーをすべて持つ形（値の無いものは None / []）。
+    convert・管理UI・マイグレーションはどれもこの形で書くので、互いの出力を書き換え合わない。
+    """
+    if not raw:
+        result: Dict[str, Any] = {"meeting_page": None, "transcript": None, "announcement": None, "other": []}
+    elif isinstance(raw, dict):
+        result = {
+            "meeting_page": clean_url(raw.get("meeting_page")),
+            "transcript": clean_url(raw.get("transcript")),
+            "announcement": clean_url(raw.get("announcement") or raw.get("notice")),
+            "other": [o for o in map(_other_item, raw.get("other") or []) if o],
+        }
+    else:
+        meeting_page = None
+        transcript = None
+        announcement = None
+        other_items: List[Dict[str, Any]] = []
+        for item in raw:
+            other = _other_item(item)
+            if other is None:
+                continue
+            url = other["url"]
+            stype = item.get("source_type")
+            if stype == "meeting_page" and not meeting_page:
+                meeting_page = url
+            elif stype in ("minutes", "transcript") and not transcript:
+                transcript = url
+            elif stype in ("announcement", "notice") and not announcement:
+                announcement = url
+            else:
+                other_items.append(other)
+        result = {
+            "meeting_page": meeting_page,
+            "transcript": transcript,
+            "announcement": announcement,
+            "other": other_items,
+        }
+    return result
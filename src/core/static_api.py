@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.core.meeting_index import current_index
+from src.core.sources import normalize_sources
+from src.utils import data_dir
+
+API_VERSION = "v1"
+PAGE_SIZE = 100
+# 一覧ページに載せる項目（詳細は個別ドキュメントを取りに行く）
+LIST_FIELDS = {
+    "group": ("id", "name", "category", "parent"),
+    "person": ("id", "name", "name_yomi"),
+}
+
+# 出力（api/v1/ 配下）
+#   index.json                 全ファイルのパス → 内容ハッシュ。クライアントはこれだけ取れば更新分が分かる
+#   {group,person,meeting}/<id>.json           個別ドキュメント
+#   {group,person,meeting}/pages/<n>.json      一覧（PAGE_SIZE 件ずつ、1 始まり）
+#   group/tree.json            団体の親子ツリー
+#   meeting/months.json        月 → 件数・ハッシュ
+#   meeting/month/<YYYY-MM>.json  その月の会議サマリ
+
+
+def dumps(data: Any) -> bytes:
+    """公開用のコンパクトな直列化（キー順固定で、同じデータなら同じバイト列）."""
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()[:16]
+
+
+@dataclass
+class ApiBuild:
+    written: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    files: Dict[str, str] = field(default_factory=dict)
+
+
+class _Writer:
+    """内容が変わったファイルだけを書き、前回の出力に残っている不要なファイルを消す."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.result = ApiBuild()
+
+    def put(self, rel: str, data: Any) -> str:
+        content = dumps(data)
+        path = self.root / rel
+        try:
+            previous: Optional[bytes] = path.read_bytes()
+        except FileNotFoundError:
+            previous = None
+        if previous == content:
+            self.result.unchanged.append(rel)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(content)
+            self.result.written.append(rel)
+        digest = content_hash(content)
+        self.result.files[rel] = digest
+        return digest
+
+    def finish(self, index: Dict[str, Any]) -> ApiBuild:
+        index["files"] = dict(sorted(self.result.files.items()))
+        self.put("index.json", index)
+        keep = set(self.result.files)
+        if self.root.exists():
+            for path in sorted(self.root.rglob("*.json")):
+                rel = path.relative_to(self.root).as_posix()
+                if rel not in keep:
+                    path.unlink()
+                    self.result.removed.append(rel)
+        return self.result
+
+
+def _load_dir(entity: str) -> List[Dict[str, Any]]:
+    records = []
+    for path in sorted((data_dir() / entity).glob("*.json")):
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload["id"] = path.stem
+        payload.pop("schema_version", None)
+        records.append(payload)
+    return records
+
+
+def _pages(writer: _Writer, entity: str, items: List[Dict[str, Any]]) -> int:
+    pages = max(1, -(-len(items) // PAGE_SIZE))
+    for n in range(1, pages + 1):
+        chunk = items[(n - 1) * PAGE_SIZE:n * PAGE_SIZE]
+        writer.put(f"{entity}/pages/{n}.json", {
+            "page": n,
+            "pages": pages,
+            "total": len(items),
+            "items": chunk,
+            "prev": f"{entity}/pages/{n - 1}.json" if n > 1 else None,
+            "next": f"{entity}/pages/{n + 1}.json" if n < pages else None,
+        })
+    return pages
+
+
+def _summary(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": row["id"],
+        "date": row["date"] or None,
+        "main": row["main"],
+        "sub": row["sub"],
+        "holding": row["holding"],
+        "attendee_count": row["attendee_count"],
+    }
+
+
+def _tree(groups: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    by_parent: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for g in groups:
+        by_parent.setdefault(g.get("parent"), []).append(g)
+    ids = {g["id"] for g in groups}
+
+    def build(parent_id: Optional[str], seen: frozenset) -> List[Dict[str, Any]]:
+        return [
+            {"id": g["id"], "name": g.get("name"), "children": build(g["id"], seen | {g["id"]})}
+            for g in sorted(by_parent.get(parent_id, []), key=lambda g: (g.get("name") or "", g["id"]))
+            if g["id"] not in seen
+        ]
+
+    # 親が見つからない団体もルートとして出す
+    roots = [p for p in by_parent if p is None or p not in ids]
+    return [node for parent in sorted(roots, key=lambda p: p or "") for node in build(parent, frozenset())]
+
+
+def build_api(destination: Path) -> ApiBuild:
+    """data/ とサマリインデックスから読み取り専用の JSON API を destination（…/api/v1）へ書き出す."""
+    writer = _Writer(destination)
+    index = current_index()
+    summaries = index.summaries()
+    groups = _load_dir("group")
+    persons = _load_dir("person")
+
+    group_meetings: Dict[str, Dict[str, List[str]]] = {}
+    person_meetings: Dict[str, List[str]] = {}
+    for row in summaries:
+        group_meetings.setdefault(row["main"]["group_id"], {"main": [], "sub": []})["main"].append(row["id"])
+        for sub in row["sub"]:
+            group_meetings.setdefault(sub["group_id"], {"main": [], "sub": []})["sub"].append(row["id"])
+        for pid in dict.fromkeys(row["attendee"]):
+            person_meetings.setdefault(pid, []).append(row["id"])
+
+    children: Dict[str, List[str]] = {}
+    for g in groups:
+        if g.get("parent"):
+            children.setdefault(g["parent"], []).append(g["id"])
+    for g in groups:
+        writer.put(f"group/{g['id']}.json", {
+            **g,
+            "children": sorted(children.get(g["id"], [])),
+            "meetings": group_meetings.get(g["id"], {"main": [], "sub": []}),
+        })
+    for p in persons:
+        writer.put(f"person/{p['id']}.json", {**p, "meetings": person_meetings.get(p["id"], [])})
+    # 会議本体は1件ずつ読んで書く
+    for row in summaries:
+        path = data_dir() / "meeting" / row["id"] / "basic.json"
+        if not path.exists():
+            continue
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload.pop("schema_version", None)
+        payload["id"] = row["id"]
+        payload["sources"] = normalize_sources(payload.get("sources"))
+        writer.put(f"meeting/{row['id']}.json", payload)
+
+    def listing(entity: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        items = [{k: r.get(k) for k in LIST_FIELDS[entity]} for r in records]
+        return sorted(items, key=lambda r: (r.get("name") or "", r["id"]))
+
+    pages = {
+        "group": _pages(writer, "group", listing("group", groups)),
+        "person": _pages(writer, "person", listing("person", persons)),
+        "meeting": _pages(writer, "meeting", [_summary(r) for r in summaries]),
+    }
+    writer.put("group/tree.json", _tree(groups))
+
+    months = []
+    for month in index.months() + (["unknown"] if index.counts.get("unknown") else []):
+        rows = [_summary(r) for r in index.summaries(month)]
+        digest = writer.put(f"meeting/month/{month}.json", {"month": month, "items": rows})
+        months.append({"month": month, "count": len(rows), "hash": digest, "path": f"meeting/month/{month}.json"})
+    writer.put("meeting/months.json", months)
+
+    return writer.finish({
+        "version": API_VERSION,
+        "page_size": PAGE_SIZE,
+        "counts": {"group": len(groups), "person": len(persons), "meeting": len(summaries)},
+        "pages": pages,
+    })
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from src.core.ical import meeting_title
+from src.core.meeting_index import MeetingIndex
+from src.core.writer import write_json_atomic
+from src.utils import data_dir, index_dir
+
+STATE_VERSION = 1
+ATOM_VERSION = 1
+ATOM_SIZE = 50
+
+# ---- 静的出力の差分更新 ----
+# freeze のたびに「URL → そのページの材料から作ったフィンガープリント」を記録し、
+# 次回は出力済みでフィンガープリントが同じページを描画し直さない（Frozen-Flask の FREEZER_SKIP_EXISTING）
+
+
+def _state_path() -> Path:
+    return index_dir() / "freeze" / "state.json"
+
+
+def load_state(destination: Path) -> Dict[str, str]:
+    """destination に前回書き出したページの URL → フィンガープリント."""
+    try:
+        payload = json.loads(_state_path().read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+    if payload.get("version") != STATE_VERSION:
+        return {}
+    return dict((payload.get("destinations") or {}).get(str(destination.resolve()), {}))
+
+
+def save_state(destination: Path, fingerprints: Mapping[str, str]) -> None:
+    try:
+        payload = json.loads(_state_path().read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        payload = {}
+    if payload.get("version") != STATE_VERSION:
+        payload = {"version": STATE_VERSION, "destinations": {}}
+    payload["destinations"][str(destination.resolve())] = dict(fingerprints)
+    write_json_atomic(_state_path(), payload)
+
+
+def _row_fingerprint(h: Any, row: Mapping[str, Any], group_names: Mapping[str, str]) -> None:
+    gid = row["main"]["group_id"]
+    h.update(f"{row['id']}\0{row.get('mtime_ns') or 0}\0{gid}\0{group_names.get(gid, '')}\n".encode("utf-8"))
+
+
+def month_fingerprints(index: MeetingIndex, group_names: Mapping[str, str], version: str) -> Dict[str, str]:
+    """月別一覧ページごとのフィンガープリント。月の選択肢は全ページに出るので、月の一覧も材料に含める.
+
+    version は描画の版（テンプレート・描画コード）。変われば全ページを作り直す。
+    """
+    months = index.months()
+    head = version + "\0" + "\0".join(months)
+    result: Dict[str, str] = {}
+    for month in months:
+        h = hashlib.sha256(f"{head}\n{month}\n".encode("utf-8"))
+        for row in index.partition(month).summaries():
+            _row_fingerprint(h, row, group_names)
+        result[month] = h.hexdigest()[:32]
+    return result
+
+
+# ---- Atom フィード（最近追加・更新された会議） ----
+
+
+def _iso(mtime_ns: int) -> str:
+    return datetime.fromtimestamp(mtime_ns / 1e9, tz=timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def recent_rows(index: MeetingIndex, limit: int = ATOM_SIZE) -> List[Dict[str, Any]]:
+    """basic.json の更新が新しい順（同時刻なら開催日の新しい順）."""
+    rows = index.summaries()
+    rows.sort(key=lambda r: (r.get("mtime_ns") or 0, r.get("date") or "", r["id"]), reverse=True)
+    return rows[:limit]
+
+
+def _atom_cache_path() -> Path:
+    return index_dir() / "freeze" / "atom.json"
+
+
+def _entry_xml(meeting: Mapping[str, Any], updated: str, link: str, group_names: Mapping[str, str]) -> str:
+    summary = [f"開催日: {meeting.get('date') or '-'}"]
+    if meeting.get("start_time"):
+        summary.append(f"時刻: {meeting['start_time']}〜{meeting.get('end_time') or ''}")
+    summary.extend(f"・{item}" for item in meeting.get("agenda") or [])
+    return (
+        "<entry>"
+        f"<id>urn:kaigitai:meeting:{escape(meeting['id'])}</id>"
+        f"<title>{escape(meeting_title(meeting, group_names))}</title>"
+        f"<link rel=\"alternate\" href=\"{escape(link)}\"/>"
+        f"<updated>{updated}</updated>"
+        f"<summary>{escape(chr(10).join(summary))}</summary>"
+        "</entry>"
+    )
+
+
+def render_atom(
+    index: MeetingIndex,
+    group_names: Mapping[str, str],
+    feed_url: str,
+    meeting_url: Any,
+    version: str,
+    title: str = "kaigitai 会議の追加・更新",
+    limit: int = ATOM_SIZE,
+) -> str:
+    """Atom フィードを作る。エントリは (id, mtime, 団体名, 描画の版) が前回と同じなら保存済みの XML を使い、basic.json を読まない."""
+    try:
+        cache = json.loads(_atom_cache_path().read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        cache = {}
+    entries: Dict[str, List[str]] = cache.get("entries", {}) if cache.get("version") == ATOM_VERSION else {}
+
+    kept: Dict[str, List[str]] = {}
+    parts: List[str] = []
+    rows = recent_rows(index, limit)
+    for row in rows:
+        updated = _iso(row.get("mtime_ns") or 0)
+        link = meeting_url(row["id"])
+        gids = [row["main"]["group_id"]] + [s["group_id"] for s in row["sub"]]
+        key = hashlib.sha256(
+            "\0".join([version, row["id"], updated, link] + [f"{g}={group_names.get(g, '')}" for g in gids]).encode("utf-8")
+        ).hexdigest()[:32]
+        hit = entries.get(row["id"])
+        if hit is not None and hit[0] == key:
+            xml = hit[1]
+        else:
+            path = data_dir() / "meeting" / row["id"] / "basic.json"
+            try:
+                meeting = {**json.loads(path.read_text(encoding="utf-8")), "id": row["id"]}
+            except FileNotFoundError:
+                continue
+            xml = _entry_xml(meeting, updated, link, group_names)
+        kept[row["id"]] = [key, xml]
+        parts.append(xml)
+    if kept != entries:
+        write_json_atomic(_atom_cache_path(), {"version": ATOM_VERSION, "entries": kept})
+
+    updated = _iso(rows[0].get("mtime_ns") or 0) if rows else _iso(0)
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom">'
+        f"<id>{escape(feed_url)}</id>"
+        f"<title>{escape(title)}</title>"
+        f"<link rel=\"self\" href=\"{escape(feed_url)}\"/>"
+        f"<updated>{updated}</updated>"
+        + "".join(parts)
+        + "</feed>\n"
+    )
+
+
+# ---- サイトマップ ----
+
+
+def render_sitemap(urls: Iterable[Tuple[str, Optional[str]]]) -> str:
+    """(絶対URL, lastmod or None) の並びから sitemap.xml を作る."""
+    lines = ['<?xml version="1.0" encoding="utf-8"?>', '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for loc, lastmod in urls:
+        if lastmod:
+            lines.append(f"<url><loc>{escape(loc)}</loc><lastmod>{lastmod}</lastmod></url>")
+        else:
+            lines.append(f"<url><loc>{escape(loc)}</loc></url>")
+    lines.append("</urlset>")
+    return "\n".join(lines) + "\n"
+
+
+def lastmod(mtime_ns: int) -> str:
+    return datetime.fromtimestamp(mtime_ns / 1e9, tz=timezone.utc).strftime("%Y-%m-%d")
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import heapq
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+STATS_VERSION = 1
+HOLDINGS = ("onsite", "online", "hybrid", "document")
+
+
+def year_of(date: Optional[str]) -> str:
+    return (date or "")[:4] or "unknown"
+
+
+def _bump(counter: Dict[str, int], key: str, n: int) -> None:
+    value = counter.get(key, 0) + n
+    if value:
+        counter[key] = value
+    else:
+        counter.pop(key, None)
+
+
+def _bump_nested(table: Dict[str, Dict[str, int]], outer: str, inner: str, n: int) -> None:
+    row = table.setdefault(outer, {})
+    _bump(row, inner, n)
+    if not row:
+        del table[outer]
+
+
+class Aggregates:
+    """会議の集計（団体×年、開催形式×年、出席者ごとの回数）.
+
+    会議1件ぶんを add / remove で足し引きできるので、保存・削除のたびに差分だけ反映すればよい。
+    入力はサマリインデックスの行（id/date/main/sub/holding/attendee）と同じ形の dict。
+    """
+
+    def __init__(self, payload: Optional[Mapping[str, Any]] = None) -> None:
+        payload = payload or {}
+        self.total: int = int(payload.get("total") or 0)
+        self.group_year: Dict[str, Dict[str, int]] = {g: dict(v) for g, v in (payload.get("group_year") or {}).items()}
+        self.holding_year: Dict[str, Dict[str, int]] = {y: dict(v) for y, v in (payload.get("holding_year") or {}).items()}
+        self.attendee: Dict[str, int] = dict(payload.get("attendee") or {})
+
+    @classmethod
+    def from_meetings(cls, meetings: Iterable[Mapping[str, Any]]) -> "Aggregates":
+        """全件を1回なめて作る."""
+        agg = cls()
+        for m in meetings:
+            agg.add(m)
+        return agg
+
+    def add(self, meeting: Mapping[str, Any], sign: int = 1) -> None:
+        year = year_of(meeting.get("date"))
+        self.total += sign
+        groups = {(meeting.get("main") or {}).get("group_id")}
+        groups.update(s.get("group_id") for s in meeting.get("sub") or [])
+        # 合同開催は関わった団体それぞれに1回と数える
+        for gid in groups:
+            if gid:
+                _bump_nested(self.group_year, gid, year, sign)
+        _bump_nested(self.holding_year, year, meeting.get("holding") or "unknown", sign)
+        for pid in set(meeting.get("attendee") or []):
+            _bump(self.attendee, pid, sign)
+
+    def remove(self, meeting: Mapping[str, Any]) -> None:
+        self.add(meeting, -1)
+
+    def copy(self) -> "Aggregates":
+        return Aggregates(self.to_json())
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "version": STATS_VERSION,
+            "total": self.total,
+            "group_year": self.group_year,
+            "holding_year": self.holding_year,
+            "attendee": self.attendee,
+        }
+
+    @classmethod
+    def from_json(cls, payload: Mapping[str, Any]) -> "Aggregates":
+        if payload.get("version") != STATS_VERSION:
+            return cls()
+        return cls(payload)
+
+    def years(self) -> List[str]:
+        years = set(self.holding_year)
+        for per_year in self.group_year.values():
+            years.update(per_year)
+        return sorted(years, reverse=True)
+
+    def holding_totals(self) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for per_holding in self.holding_year.values():
+            for holding, n in per_holding.items():
+                _bump(totals, holding, n)
+        return totals
+
+    def top_attendees(self, limit: int = 20) -> List[Tuple[str, int]]:
+        return heapq.nlargest(limit, self.attendee.items(), key=lambda kv: (kv[1], kv[0]))
+
+
+def build_report(
+    agg: Aggregates,
+    group_names: Mapping[str, str],
+    person_names: Mapping[str, str],
+    top: int = 20,
+) -> Dict[str, Any]:
+    """統計ページ用に表の形へ並べ替える."""
+    years = agg.years()
+    groups = [
+        {
+            "id": gid,
+            "name": group_names.get(gid, gid),
+            "total": sum(per_year.values()),
+            "years": [per_year.get(y, 0) for y in years],
+        }
+        for gid, per_year in agg.group_year.items()
+    ]
+    groups.sort(key=lambda g: (-g["total"], g["name"]))
+    holdings = [h for h in HOLDINGS] + sorted(set(agg.holding_totals()) - set(HOLDINGS))
+    return {
+        "total": agg.total,
+        "years": years,
+        "holdings": holdings,
+        "holding_totals": agg.holding_totals(),
+        "holding_by_year": [
+            {"year": y, "counts": [agg.holding_year.get(y, {}).get(h, 0) for h in holdings]} for y in years
+        ],
+        "groups": groups,
+        "attendees": [
+            {"id": pid, "name": person_names.get(pid, pid), "count": n} for pid, n in agg.top_attendees(top)
+        ],
+    }
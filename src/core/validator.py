@@ -3,11 +3,17 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
-import jsonschema
-
-from src.core.loader import load_json_file
+from src.core.schema_compiler import load_compiled
 
 
 def validate_with_schema(data: Any, schema_path: Path) -> None:
-    schema = load_json_file(schema_path)
-    jsonschema.validate(instance=data, schema=schema)
+    """スキーマ専用に生成した関数でまず判定し、失敗したときだけ jsonschema で詳細なエラーを作る."""
+    _, check, validator = load_compiled(schema_path)
+    if check is not None and check(data):
+        return
+    # エラーの組み立てにしか使わないので、検証しないコマンドでは jsonschema を読み込まない
+    from jsonschema.exceptions import best_match
+
+    error = best_match(validator.iter_errors(data))
+    if error is not None:
+        raise error
@@ -1,11 +1,43 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 from typing import Any
+from uuid import uuid4
+
+
+def serialize_json(data: Any) -> str:
+    """data/ に書き出すときと同じ書式で文字列化する."""
+    return json.dumps(data, ensure_ascii=False, indent=2)
 
 
 def write_json_file(path: Path, data: Any) -> None:
+    write_serialized(path, serialize_json(data))
+
+
+def write_serialized(path: Path, text: str) -> None:
+    """serialize_json 済みの文字列を書き出す（直列化を別プロセスで済ませた場合用）.
+
+    data/ のファイルも一時ファイル経由で置き換え、読み手や中断に書きかけを見せない。
+    """
+    _replace_text(path, text)
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """インデックス類をコンパクトに書き出す。一時ファイル経由で置き換え、読み手に書きかけを見せない."""
+    _replace_text(path, json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+
+
+def _replace_text(path: Path, text: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    text = json.dumps(data, ensure_ascii=False, indent=2)
-    path.write_text(text, encoding="utf-8")
+    # mkstemp は 0600 で作るので、umask どおりの権限になる通常の open で一時ファイルを作る
+    tmp = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+    try:
+        with open(tmp, "x", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        if tmp.exists():
+            tmp.unlink()
+        raise
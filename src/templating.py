@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Hashable, Mapping
+
+from flask import Flask
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import Markup
+
+from src.utils import repo_root
+
+# 一覧で使うカードの描画結果を何件まで覚えておくか（会議数より多めでよい）
+FRAGMENT_CACHE_SIZE = 8192
+# テンプレート以外の描画コード（ビュー・フィード・Atom の組み立て）の出力を変えたら上げる
+RENDER_VERSION = 1
+
+
+def bytecode_cache_dir() -> Path:
+    # テンプレートのコンパイル結果。ソースのチェックサムで検証されるので、テンプレートを直せば自動で作り直される
+    return repo_root() / ".cache" / "jinja"
+
+
+class FragmentCache:
+    """描画済みの HTML 断片を入力のキーで覚えておく LRU."""
+
+    def __init__(self, maxsize: int = FRAGMENT_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._items: "OrderedDict[Hashable, Markup]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable, render: Callable[[], Any]) -> Markup:
+        with self._lock:
+            html = self._items.get(key)
+            if html is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return html
+        html = Markup(render())
+        with self._lock:
+            self.misses += 1
+            self._items[key] = html
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return html
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+def meeting_card_key(meeting: Mapping[str, Any], group_map: Mapping[str, str]) -> Hashable:
+    """カードに出る値だけで作るキー。どれかが変われば別のキーになるので無効化は要らない."""
+    main = meeting.get("main") or {}
+    gid = main.get("group_id")
+    return (meeting.get("id"), meeting.get("date"), meeting.get("holding"), gid, main.get("num"), group_map.get(gid))
+
+
+def setup_templates(app: Flask) -> FragmentCache:
+    """バイトコードキャッシュを有効にし、会議カードをキャッシュ付きのグローバル関数 meeting_card として登録する."""
+    cache_dir = bytecode_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    env = app.jinja_env
+    env.bytecode_cache = FileSystemBytecodeCache(str(cache_dir), f"{app.name}-%s.cache")
+    cards = FragmentCache()
+
+    def meeting_card(meeting: Mapping[str, Any], group_map: Mapping[str, str]) -> Markup:
+        # マクロは url_for を使うので、アプリごと（= env ごと）にキャッシュを分ける
+        macro = env.get_template("components/meeting_card.html").module.meeting_card  # type: ignore[attr-defined]
+        return cards.get(meeting_card_key(meeting, group_map), lambda: macro(meeting, group_map))
+
+    env.globals["meeting_card"] = meeting_card
+    app.extensions["meeting_card_cache"] = cards
+    return cards
+
+
+def render_version(app: Flask) -> str:
+    """テンプレート一式の内容と RENDER_VERSION から作る描画の版.
+
+    静的出力の差分更新や ETag のフィンガープリントに混ぜ、テンプレート・描画コードが変わったら作り直させる。
+    テンプレートを自動で読み直さない設定ならプロセス内で1回だけ計算する。
+    """
+    env = app.jinja_env
+    cached = app.extensions.get("render_version")
+    if cached is not None and not env.auto_reload:
+        return cached
+    h = hashlib.sha256(f"{RENDER_VERSION}\n".encode("utf-8"))
+    for name in sorted(env.list_templates()):
+        source, _, _ = env.loader.get_source(env, name)  # type: ignore[union-attr]
+        h.update(f"{name}\0{source}\0".encode("utf-8"))
+    version = h.hexdigest()[:16]
+    app.extensions["render_version"] = version
+    return version
+
+
+def compile_templates(app: Flask) -> int:
+    """templates/ を全部読み込んでバイトコードキャッシュを作っておく（起動直後・freeze の初回描画でコンパイルしない）."""
+    env = app.jinja_env
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
@@ -22,3 +22,8 @@ def schema_base_dir() -> Path:
 
 def schema_fragment_dir() -> Path:
     return repo_root() / "docs" / "schema" / "fragment"
+
+
+def index_dir() -> Path:
+    # data/ から再生成できる派生ファイル（インデックス類）の置き場
+    return data_dir() / "index"
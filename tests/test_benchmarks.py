@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import jsonschema
+
+from benchmarks.generate import SCALES, generate_dataset, use_root
+from src.core.convert import convert_group, convert_meeting, convert_person
+
+
+def _snapshot(root: Path) -> dict:
+    return {
+        str(p.relative_to(root)): p.read_text(encoding="utf-8")
+        for p in sorted(root.rglob("*.json"))
+        if "docs" not in p.parts
+    }
+
+
+def test_generate_dataset_is_deterministic(tmp_path: Path) -> None:
+    counts_a = generate_dataset(tmp_path / "a", SCALES["tiny"], seed=1)
+    counts_b = generate_dataset(tmp_path / "b", SCALES["tiny"], seed=1)
+    assert counts_a == counts_b
+    assert _snapshot(tmp_path / "a") == _snapshot(tmp_path / "b")
+
+
+def test_generated_register_converts_to_valid_data(tmp_path: Path) -> None:
+    generate_dataset(tmp_path, SCALES["tiny"], seed=2)
+    base = tmp_path / "docs" / "schema" / "base"
+    with use_root(tmp_path):
+        group_registry, _ = convert_group(dry_run=True)
+        person_registry, _ = convert_person(dry_run=True)
+        result = convert_meeting(group_registry, person_registry, dry_run=True)
+    assert result.skipped == 0
+    assert len(result.planned) == SCALES["tiny"].meetings
+
+    schema = json.loads((base / "meeting.basic.data.schema.json").read_text(encoding="utf-8"))
+    for basic in (tmp_path / "data" / "meeting").glob("*/basic.json"):
+        jsonschema.validate(json.loads(basic.read_text(encoding="utf-8")), schema)
+
+
+def test_loadtest_reports_percentiles(tmp_path: Path) -> None:
+    from benchmarks.loadtest import run_loadtest
+
+    generate_dataset(tmp_path, SCALES["tiny"], seed=3)
+    with use_root(tmp_path):
+        report = run_loadtest("viewer", "inprocess", threads=2, requests=20)
+    total = report["summary"]["total"]
+    assert total["requests"] == 20
+    assert total["errors"] == 0
+    assert total["p50_ms"] <= total["p99_ms"] <= total["max_ms"]
+    assert "meeting_list" in report["summary"]["routes"]
+
+
+def test_loadtest_against_url_does_not_import_the_app(monkeypatch, tmp_path: Path) -> None:
+    from benchmarks import loadtest
+
+    def fail(target: str) -> None:
+        raise AssertionError("--url 指定時にアプリを読み込んだ")
+
+    monkeypatch.setattr(loadtest, "_load_app", fail)
+    monkeypatch.setattr(loadtest, "_http_requester", lambda base_url: lambda: lambda path: 200)
+    generate_dataset(tmp_path, SCALES["tiny"], seed=3)
+    with use_root(tmp_path):
+        report = loadtest.run_loadtest("viewer", "server", threads=1, requests=5, base_url="http://127.0.0.1:9")
+    assert report["summary"]["total"]["requests"] == 5
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import src.utils as utils
+from benchmarks.generate import SCALES, generate_dataset
+from benchmarks.startup import probe
+from src.cli.main import main
+
+
+def test_light_subcommands_do_not_import_jsonschema() -> None:
+    assert probe("-")["loaded"] == []
+    assert probe("fragment")["loaded"] == []
+    assert probe("convert")["loaded"] == []
+
+
+def test_non_interactive_convert_and_validate(monkeypatch, tmp_path: Path, capsys) -> None:
+    generate_dataset(tmp_path, SCALES["tiny"], seed=11)
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    monkeypatch.setattr("builtins.input", lambda *_: (_ for _ in ()).throw(AssertionError("input() を呼んではいけない")))
+    before = sorted(p.relative_to(tmp_path) for p in (tmp_path / "data").rglob("*.json"))
+
+    assert main(["convert", "--dry-run", "--no-strict"]) == 0
+    assert "dry-runのためファイルは書き込みません" in capsys.readouterr().out
+    after = sorted(p.relative_to(tmp_path) for p in (tmp_path / "data").rglob("*.json") if "index" not in p.parts)
+    assert after == [p for p in before if "index" not in p.parts]
+
+    assert main(["validate", "--all"]) == 0
+    assert "検証完了" in capsys.readouterr().out
+    (tmp_path / "data" / "person" / "broken.json").write_text('{"name": 1}', encoding="utf-8")
+    assert main(["validate"]) == 1
+    assert "[invalid] person/broken.json" in capsys.readouterr().out
+
+
+def test_command_errors_are_reported_without_traceback(monkeypatch, tmp_path: Path, capsys) -> None:
+    generate_dataset(tmp_path, SCALES["tiny"], seed=11)
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    (tmp_path / "register" / "person" / "form.json").write_text("[{broken", encoding="utf-8")
+    assert main(["convert", "--no-strict"]) == 1
+    out = capsys.readouterr().out
+    assert out.splitlines()[-1].startswith("[error] JSONDecodeError: ")
+    assert "Traceback" not in out
@@ -5,9 +5,14 @@ import shutil
 from pathlib import Path
 
 import jsonschema
+import pytest
 
-from src.core.convert import convert_group, convert_meeting, convert_person
 import src.utils as utils
+from benchmarks.generate import SCALES, generate_dataset
+from src.core.convert import ConvertResult, convert_group, convert_meeting, convert_person, field_diff
+from src.core.journal import read_since
+from src.core.meeting_index import load_index
+from src.core.resolver import UnresolvedName
 
 
 def _load_json(path: Path) -> dict:
@@ -48,3 +53,173 @@ def test_convert_register_to_data(monkeypatch, tmp_path: Path) -> None:
         for subdir in meeting_dir.iterdir():
             basic = subdir / "basic.json"
             _validate(_load_json(basic), base / "meeting.basic.data.schema.json")
+
+
+def test_reconvert_reuses_person_and_meeting_ids(monkeypatch, tmp_path: Path) -> None:
+    repo_root = Path(__file__).resolve().parent.parent
+    shutil.copytree(repo_root / "docs" / "schema" / "base", tmp_path / "docs" / "schema" / "base")
+    register = tmp_path / "register"
+    for entity, rows in {
+        "group": [{"name": "G", "category": "c", "official_url": "https://example.com"}],
+        "person": [{"name": "山田 太郎", "name_yomi": "やまだ たろう"}],
+        "meeting": [{
+            "main": {"group_id": "G", "num": 1},
+            "date": "2024-01-01",
+            "holding": "online",
+            "attendee": ["山田 太郎"],
+        }],
+    }.items():
+        (register / entity).mkdir(parents=True)
+        (register / entity / "form.json").write_text(json.dumps(rows, ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+
+    def run():
+        group_registry, _ = convert_group()
+        person_registry, person_result = convert_person()
+        meeting_result = convert_meeting(group_registry, person_registry)
+        return person_result, meeting_result
+
+    first_person, first_meeting = run()
+    assert (first_person.created, first_meeting.created) == (1, 1)
+    second_person, second_meeting = run()
+    assert (second_person.created, second_person.updated, second_person.unchanged) == (0, 0, 1)
+    assert (second_meeting.created, second_meeting.updated, second_meeting.unchanged) == (0, 0, 1)
+    assert len(list((tmp_path / "data" / "person").glob("*.json"))) == 1
+    assert len(list((tmp_path / "data" / "meeting").iterdir())) == 1
+
+
+def test_dry_run_plan_reports_field_changes(monkeypatch, tmp_path: Path) -> None:
+    repo_root = Path(__file__).resolve().parent.parent
+    shutil.copytree(repo_root / "docs" / "schema" / "base", tmp_path / "docs" / "schema" / "base")
+    form = tmp_path / "register" / "group" / "form.json"
+    form.parent.mkdir(parents=True)
+    rows = [
+        {"name": "A", "category": "c", "official_url": "https://example.com/a"},
+        {"name": "B", "category": "c", "official_url": "https://example.com/b"},
+    ]
+    form.write_text(json.dumps(rows), encoding="utf-8")
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    convert_group()
+
+    rows[1]["category"] = "d"
+    rows.append({"name": "C", "category": "c", "official_url": "https://example.com/c"})
+    form.write_text(json.dumps(rows), encoding="utf-8")
+    _, result = convert_group(dry_run=True)
+    assert [e.status for e in result.plan] == ["unchanged", "modified", "new"]
+    assert result.plan[1].changes == ['category: "c" → "d"']
+    assert not result.plan[2].path.exists()
+
+    assert field_diff(
+        {"sources": {"transcript": None}, "attendee": ["p1", "p2"]},
+        {"sources": {"transcript": "https://t"}, "attendee": ["p2", "p3"]},
+    ) == ['sources.transcript: null → "https://t"', 'attendee: +["p3"] -["p1"]']
+
+
+def test_parallel_convert_matches_serial(monkeypatch, tmp_path: Path) -> None:
+    def run(root: Path, workers: int):
+        generate_dataset(root, SCALES["tiny"], seed=3)
+        shutil.rmtree(root / "data" / "meeting")
+        monkeypatch.setattr(utils, "repo_root", lambda: root)
+        group_registry, _ = convert_group()
+        person_registry, _ = convert_person()
+        first = convert_meeting(group_registry, person_registry, workers=workers)
+        # 1件だけ変えて dry-run の計画と2回目の結果も比べる
+        form = root / "register" / "meeting" / "form.json"
+        rows = _load_json(form)
+        rows[1]["agenda"] = rows[1].get("agenda", []) + ["追加議題"]
+        form.write_text(json.dumps(rows, ensure_ascii=False), encoding="utf-8")
+        plan = convert_meeting(group_registry, person_registry, dry_run=True, workers=workers).plan
+        second = convert_meeting(group_registry, person_registry, workers=workers)
+        files = {
+            p.relative_to(root).as_posix(): p.read_text(encoding="utf-8")
+            for p in sorted((root / "data" / "meeting").rglob("basic.json"))
+        }
+        journal = [(c.op, c.entity, c.id) for c in read_since(0) if c.entity == "meeting"]
+        counts = [(r.created, r.updated, r.unchanged, r.skipped) for r in (first, second)]
+        statuses = [(e.path.relative_to(root).as_posix(), e.status, e.changes) for e in plan]
+        return counts, statuses, files, journal
+
+    serial = run(tmp_path / "serial", 1)
+    parallel = run(tmp_path / "parallel", 2)
+    assert serial[0][0][0] > 0 and serial[0][1][:2] == (0, 1)
+    assert parallel == serial
+
+
+def test_parallel_convert_matches_serial_with_duplicate_rows(monkeypatch, tmp_path: Path) -> None:
+    def run(root: Path, workers: int):
+        generate_dataset(root, SCALES["tiny"], seed=3)
+        shutil.rmtree(root / "data" / "meeting")
+        # 同じ (main, num, date) の行を重ねる（2行目は同じ会議 id への更新になる）
+        form = root / "register" / "meeting" / "form.json"
+        rows = _load_json(form)
+        rows.append({**rows[0], "agenda": rows[0].get("agenda", []) + ["追加議題"]})
+        form.write_text(json.dumps(rows, ensure_ascii=False), encoding="utf-8")
+        monkeypatch.setattr(utils, "repo_root", lambda: root)
+        group_registry, _ = convert_group()
+        person_registry, _ = convert_person()
+        result = convert_meeting(group_registry, person_registry, workers=workers)
+        again = convert_meeting(group_registry, person_registry, workers=workers)
+        files = [p.read_text(encoding="utf-8") for p in sorted((root / "data" / "meeting").rglob("basic.json"))]
+        return [(r.created, r.updated, r.unchanged) for r in (result, again)], files
+
+    serial = run(tmp_path / "serial", 1)
+    assert serial[0][0][1] == 1
+    assert run(tmp_path / "parallel", 2) == serial
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_write_failure_counts_only_written_meetings(monkeypatch, tmp_path: Path, workers: int) -> None:
+    import src.core.convert as convert
+    import src.core.writer as writer
+
+    generate_dataset(tmp_path, SCALES["tiny"], seed=3)
+    shutil.rmtree(tmp_path / "data" / "meeting")
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    group_registry, _ = convert_group()
+    person_registry, _ = convert_person()
+    results = []
+    monkeypatch.setattr(convert, "ConvertResult", lambda **kw: results.append(ConvertResult(**kw)) or results[-1])
+    replace_text = writer._replace_text
+    calls = []
+
+    def failing(path: Path, text: str) -> None:
+        calls.append(path)
+        if len(calls) == 3:
+            raise OSError("disk full")
+        replace_text(path, text)
+
+    monkeypatch.setattr(writer, "_replace_text", failing)
+    with pytest.raises(OSError):
+        convert_meeting(group_registry, person_registry, workers=workers)
+    assert len(list((tmp_path / "data" / "meeting").glob("*/basic.json"))) == 2
+    assert (results[0].created, results[0].updated) == (2, 0)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_partial_failure_still_records_written_meetings(monkeypatch, tmp_path: Path, workers: int) -> None:
+    repo_root = Path(__file__).resolve().parent.parent
+    shutil.copytree(repo_root / "docs" / "schema" / "base", tmp_path / "docs" / "schema" / "base")
+    register = tmp_path / "register"
+    meeting = {"main": {"group_id": "G", "num": 1}, "date": "2024-01-01", "holding": "online", "attendee": []}
+    for entity, rows in {
+        "group": [{"name": "G", "category": "c", "official_url": "https://example.com"}],
+        "person": [],
+        # 2件目は未登録の出席者で止まる
+        "meeting": [meeting, {**meeting, "main": {"group_id": "G", "num": 2}, "attendee": ["未登録"]}],
+    }.items():
+        (register / entity).mkdir(parents=True)
+        (register / entity / "form.json").write_text(json.dumps(rows, ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+
+    group_registry, _ = convert_group()
+    person_registry, _ = convert_person()
+    with pytest.raises(UnresolvedName):
+        convert_meeting(group_registry, person_registry, workers=workers)
+
+    written = [p.parent.name for p in (tmp_path / "data" / "meeting").glob("*/basic.json")]
+    assert len(written) == 1
+    assert [c.id for c in read_since(0) if c.entity == "meeting"] == written
+    assert [r["id"] for r in load_index().summaries()] == written
+    # ダイジェストも保存されているので、再実行では書き込み済みの分を unchanged として扱う
+    result = convert_meeting(group_registry, person_registry, strict_missing=False, workers=workers)
+    assert (result.created, result.unchanged, result.skipped) == (0, 1, 1)
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+import src.utils as utils
+from src.core.dedup import blocking_keys, find_duplicates, merge
+from src.core.meeting_index import refresh_index
+from src.core.writer import write_json_file
+
+
+def _group(gid: str, name: str, parent=None, url: str = "https://example.com/a") -> dict:
+    return {"id": gid, "name": name, "parent": parent, "category": "c", "list_url": None, "official_url": url}
+
+
+def _meeting(mid: str, gid: str, attendee=None, sub=None, num: int = 1) -> dict:
+    return {
+        "id": mid,
+        "main": {"group_id": gid, "num": num},
+        "sub": sub or [],
+        "date": "2024-01-01",
+        "holding": "online",
+        "attendee": attendee or [],
+    }
+
+
+def test_find_duplicates_uses_blocks() -> None:
+    persons = [
+        {"id": "p1", "name": "山田 太郎", "name_yomi": "やまだ たろう"},
+        {"id": "p2", "name": "山田太郎", "name_yomi": None},
+        {"id": "p3", "name": "山田 太朗", "name_yomi": "ヤマダタロウ"},
+        {"id": "p4", "name": "山田 花子", "name_yomi": "やまだ はなこ"},
+    ]
+    clusters = find_duplicates("person", persons)
+    assert [c.ids for c in clusters] == [["p1", "p2", "p3"]]
+    assert "yomi:やまだ" in blocking_keys("person", persons[0])
+
+    groups = [
+        _group("g1", "デジタル庁", url="https://www.digital.go.jp/"),
+        _group("g2", "デジタル庁 ", url="https://digital.go.jp/about"),
+        _group("g3", "デジタル社会推進会議", url="https://www.digital.go.jp/"),
+    ]
+    assert [c.ids for c in find_duplicates("group", groups)] == [["g1", "g2"]]
+
+
+def test_same_name_under_different_parent_or_yomi_is_not_a_duplicate() -> None:
+    groups = [
+        _group("g1", "医療部会", parent="p1"),
+        _group("g2", "医療部会", parent="p2"),
+        _group("g3", "医療部会 ", parent="p1"),
+    ]
+    assert [c.ids for c in find_duplicates("group", groups)] == [["g1", "g3"]]
+    persons = [
+        {"id": "p1", "name": "佐藤 一", "name_yomi": "さとう はじめ"},
+        {"id": "p2", "name": "佐藤 一", "name_yomi": "さとう かず"},
+        {"id": "p3", "name": "佐藤一", "name_yomi": None},
+    ]
+    # よみの無い p3 はどちらとも同一人物でありうるが、p1 と p2 を同じクラスタにはしない
+    assert [c.ids for c in find_duplicates("person", persons)] == [["p1", "p3"]]
+    assert find_duplicates("person", persons[:2]) == []
+
+
+def test_merge_rewrites_references_in_one_batch(monkeypatch, tmp_path: Path) -> None:
+    repo_root = Path(__file__).resolve().parent.parent
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    (tmp_path / "docs" / "schema").mkdir(parents=True)
+    (tmp_path / "docs" / "schema" / "base").symlink_to(repo_root / "docs" / "schema" / "base")
+    data = tmp_path / "data"
+    for g in (_group("g1", "本部"), _group("g2", "本部 "), _group("g3", "部会", parent="g2")):
+        write_json_file(data / "group" / f"{g['id']}.json", g)
+    for p in ("p1", "p2"):
+        write_json_file(data / "person" / f"{p}.json", {"id": p, "name": "山田", "name_yomi": None})
+    write_json_file(data / "meeting" / "m1" / "basic.json", _meeting("m1", "g2", ["p1", "p2"], [{"group_id": "g2", "num": 3}]))
+    write_json_file(data / "meeting" / "m2" / "basic.json", _meeting("m2", "g3"))
+    refresh_index()
+
+    planned = merge("group", "g1", ["g2"], dry_run=True)
+    assert planned.meetings == ["m1"] and planned.groups == ["g3"]
+    assert (data / "group" / "g2.json").exists()
+
+    merge("group", "g1", ["g2"])
+    m1 = json.loads((data / "meeting" / "m1" / "basic.json").read_text(encoding="utf-8"))
+    # main と同じ団体になった sub は落とす
+    assert m1["main"]["group_id"] == "g1" and m1["sub"] == []
+    assert json.loads((data / "group" / "g3.json").read_text(encoding="utf-8"))["parent"] == "g1"
+    assert not (data / "group" / "g2.json").exists()
+    assert {m["id"]: m["main"]["group_id"] for m in refresh_index().summaries()} == {"m1": "g1", "m2": "g3"}
+
+    result = merge("person", "p1", ["p2"])
+    assert result.meetings == ["m1"]
+    assert json.loads((data / "meeting" / "m1" / "basic.json").read_text(encoding="utf-8"))["attendee"] == ["p1"]
+    assert not (data / "person" / "p2.json").exists()
+
+
+def test_interrupted_merge_keeps_duplicate_and_records_written(monkeypatch, tmp_path: Path) -> None:
+    from src.core import dedup
+    from src.core.journal import read_since
+
+    repo_root = Path(__file__).resolve().parent.parent
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    (tmp_path / "docs" / "schema").mkdir(parents=True)
+    (tmp_path / "docs" / "schema" / "base").symlink_to(repo_root / "docs" / "schema" / "base")
+    data = tmp_path / "data"
+    for g in (_group("g1", "本部"), _group("g2", "本部 ")):
+        write_json_file(data / "group" / f"{g['id']}.json", g)
+    for num, mid in enumerate(("m1", "m2"), 1):
+        write_json_file(data / "meeting" / mid / "basic.json", _meeting(mid, "g2", num=num))
+    refresh_index()
+
+    # 2件目の会議を書く途中で止まる
+    calls = []
+
+    def flaky(path, payload):
+        calls.append(path)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        write_json_file(path, payload)
+
+    monkeypatch.setattr(dedup, "write_json_file", flaky)
+    with pytest.raises(KeyboardInterrupt):
+        merge("group", "g1", ["g2"])
+    # 統合元はまだ消えていないので、書き換えていない会議の参照も切れていない
+    assert (data / "group" / "g2.json").exists()
+    assert [(c.entity, c.id) for c in read_since(0)] == [("meeting", "m1")]
+    assert {m["id"]: m["main"]["group_id"] for m in refresh_index().summaries()} == {"m1": "g1", "m2": "g2"}
+
+    monkeypatch.setattr(dedup, "write_json_file", write_json_file)
+    merge("group", "g1", ["g2"])
+    assert not (data / "group" / "g2.json").exists()
+    assert {m["id"]: m["main"]["group_id"] for m in refresh_index().summaries()} == {"m1": "g1", "m2": "g1"}
+
+
+def test_merge_refuses_to_create_duplicate_meeting_numbers(monkeypatch, tmp_path: Path) -> None:
+    repo_root = Path(__file__).resolve().parent.parent
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    (tmp_path / "docs" / "schema").mkdir(parents=True)
+    (tmp_path / "docs" / "schema" / "base").symlink_to(repo_root / "docs" / "schema" / "base")
+    data = tmp_path / "data"
+    for g in (_group("g1", "本部"), _group("g2", "本部 "), _group("g3", "部会")):
+        write_json_file(data / "group" / f"{g['id']}.json", g)
+    # m1 と m2 はどちらも第1回。m3 は sub の g2・g1 が同じ団体に重なる
+    write_json_file(data / "meeting" / "m1" / "basic.json", _meeting("m1", "g1"))
+    write_json_file(data / "meeting" / "m2" / "basic.json", _meeting("m2", "g2"))
+    write_json_file(data / "meeting" / "m3" / "basic.json",
+                    _meeting("m3", "g3", sub=[{"group_id": "g2", "num": 5}, {"group_id": "g1", "num": 5}]))
+    refresh_index()
+
+    planned = merge("group", "g1", ["g2"], dry_run=True)
+    assert planned.conflicts == ["g1 第1回: m1, m2"]
+    with pytest.raises(ValueError, match="号数が重複"):
+        merge("group", "g1", ["g2"])
+    assert (data / "group" / "g2.json").exists()
+    assert json.loads((data / "meeting" / "m2" / "basic.json").read_text(encoding="utf-8"))["main"]["group_id"] == "g2"
+
+    (data / "meeting" / "m2" / "basic.json").unlink()
+    (data / "meeting" / "m2").rmdir()
+    assert merge("group", "g1", ["g2"]).conflicts == []
+    m3 = json.loads((data / "meeting" / "m3" / "basic.json").read_text(encoding="utf-8"))
+    assert m3["sub"] == [{"group_id": "g1", "num": 5}]
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import src.utils as utils
+from src.cli.commands.fragment import run_fragment, write_fragment
+
+
+def test_fragment_skips_unchanged_name_sets(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    written = write_fragment("group", ["本部", "委員会", "委員会"])
+    assert [p.name for p in written] == ["group_names.json"]
+    assert json.loads(written[0].read_text(encoding="utf-8")) == {"enum": ["委員会", "本部"]}
+    # 並び・重複が変わっただけなら書き直さない
+    assert write_fragment("group", ["委員会", "本部"]) == []
+    assert write_fragment("group", ["委員会", "本部", "部会"]) == written
+
+
+def test_run_fragment_writes_names_from_data(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    (tmp_path / "data" / "person").mkdir(parents=True)
+    (tmp_path / "data" / "person" / "p1.json").write_text(json.dumps({"id": "p1", "name": "山田 太郎"}), encoding="utf-8")
+    run_fragment()
+    fragment_dir = tmp_path / "docs" / "schema" / "fragment"
+    assert sorted(p.name for p in fragment_dir.iterdir()) == ["group_names.json", "person_names.json"]
+    assert json.loads((fragment_dir / "person_names.json").read_text(encoding="utf-8")) == {"enum": ["山田 太郎"]}
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import src.utils as utils
+from benchmarks.generate import SCALES, generate_dataset
+from src.core.ical import build_feeds, fold, subtree_ids
+from src.core.meeting_index import refresh_index, update_meetings
+
+
+def test_fold_keeps_lines_within_75_octets() -> None:
+    folded = fold("SUMMARY:" + "会議" * 40)
+    lines = folded.rstrip("\r\n").split("\r\n")
+    assert all(len(line.encode("utf-8")) <= 75 for line in lines)
+    assert "".join(line[1:] if i else line for i, line in enumerate(lines)) == "SUMMARY:" + "会議" * 40
+
+
+def test_group_feeds_and_caching_headers(monkeypatch, tmp_path: Path) -> None:
+    import viewer
+
+    generate_dataset(tmp_path, SCALES["tiny"], seed=7)
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    index = refresh_index()
+    groups = viewer.load_groups()
+    parent = next(g for g in groups if any(c.get("parent") == g["id"] for c in groups))
+    tree = subtree_ids(parent["id"], groups)
+    feeds = build_feeds(groups, index.summaries(), [f"group/{parent['id']}", f"tree/{parent['id']}", "all"])
+    own = {r["id"] for r in feeds[f"group/{parent['id']}"].rows}
+    whole = {r["id"] for r in feeds[f"tree/{parent['id']}"].rows}
+    assert own <= whole
+    assert whole == {
+        m["id"] for m in index.summaries()
+        if m["main"]["group_id"] in tree or any(s["group_id"] in tree for s in m["sub"])
+    }
+    assert len(feeds["all"].rows) == len(index)
+
+    client = viewer.app.test_client()
+    res = client.get(f"/ical/tree/{parent['id']}.ics")
+    assert res.status_code == 200
+    assert res.mimetype == "text/calendar"
+    assert "max-age=3600" in res.headers["Cache-Control"]
+    body = res.get_data(as_text=True)
+    assert body.startswith("BEGIN:VCALENDAR\r\n") and body.endswith("END:VCALENDAR\r\n")
+    assert body.count("BEGIN:VEVENT") == len(whole)
+    etag = res.headers["ETag"]
+    assert client.get(f"/ical/tree/{parent['id']}.ics", headers={"If-None-Match": etag}).status_code == 304
+
+    # フィードに含まれる会議が変わると ETag も変わる
+    mid = next(iter(own))
+    path = tmp_path / "data" / "meeting" / mid / "basic.json"
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    payload["start_time"], payload["end_time"] = "09:30", "11:00"
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    update_meetings([{**payload, "id": mid}])
+    res = client.get(f"/ical/tree/{parent['id']}.ics", headers={"If-None-Match": etag})
+    assert res.status_code == 200 and res.headers["ETag"] != etag
+    assert "T093000" in res.get_data(as_text=True)
+    assert client.get("/ical/group/missing.ics").status_code == 404
+
+
+def test_invalid_date_skips_only_that_event(monkeypatch, tmp_path: Path) -> None:
+    import viewer
+
+    generate_dataset(tmp_path, SCALES["tiny"], seed=7)
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    index = refresh_index()
+    mid = index.summaries()[0]["id"]
+    path = tmp_path / "data" / "meeting" / mid / "basic.json"
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    payload["date"] = "2024-13-45"
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    update_meetings([{**payload, "id": mid}])
+
+    res = viewer.app.test_client().get("/ical/all.ics")
+    assert res.status_code == 200
+    body = res.get_data(as_text=True)
+    assert body.endswith("END:VCALENDAR\r\n")
+    assert body.count("BEGIN:VEVENT") == len(index) - 1
+    assert f"UID:{mid}@kaigitai" not in body
+
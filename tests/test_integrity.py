@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import src.utils as utils
+from src.core.integrity import check_dataset
+
+
+def _group(gid: str, name: str, parent=None) -> dict:
+    return {"id": gid, "name": name, "parent": parent, "category": "c", "official_url": "https://example.com"}
+
+
+def _meeting(mid: str, gid: str, num: int, sub=None, attendee=None) -> dict:
+    return {
+        "id": mid,
+        "main": {"group_id": gid, "num": num},
+        "sub": sub or [],
+        "date": "2024-01-01",
+        "holding": "online",
+        "attendee": attendee or [],
+    }
+
+
+def test_check_dataset_reports_every_problem_kind() -> None:
+    groups = [
+        _group("g1", "A"),
+        _group("g2", "A "),  # strip 後に同名
+        _group("g3", "C", parent="missing"),
+        _group("g4", "D", parent="g5"),
+        _group("g5", "E", parent="g4"),
+    ]
+    persons = [{"id": "p1", "name": "P", "name_yomi": None}]
+    meetings = [
+        _meeting("m1", "g1", 1, attendee=["p1", "p-x"]),
+        _meeting("m2", "g-x", 1, sub=[{"group_id": "g1", "num": 1}]),
+    ]
+    report = check_dataset(groups, persons, meetings)
+    kinds = report.by_kind()
+    assert not report.ok
+    assert {i.id for i in kinds["duplicate_name"]} == {"g1", "g2"}
+    assert [i.ref for i in kinds["dangling_parent"]] == ["missing"]
+    assert len(kinds["parent_cycle"]) == 1
+    assert [i.ref for i in kinds["dangling_attendee"]] == ["p-x"]
+    assert [i.ref for i in kinds["dangling_group"]] == ["g-x"]
+    assert [(i.id, i.ref) for i in kinds["duplicate_meeting_num"]] == [("m2", "m1")]
+    assert report.counts == {"group": 5, "person": 1, "meeting": 2}
+
+
+def test_check_dataset_clean() -> None:
+    report = check_dataset([_group("g1", "A"), _group("g2", "B", parent="g1")], [], [_meeting("m1", "g2", 1)])
+    assert report.ok
+
+
+def test_admin_save_rejects_dangling_reference(monkeypatch, tmp_path: Path) -> None:
+    import app as admin_app
+
+    repo_root = Path(__file__).resolve().parent.parent
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    (tmp_path / "docs" / "schema").mkdir(parents=True)
+    (tmp_path / "docs" / "schema" / "base").symlink_to(repo_root / "docs" / "schema" / "base")
+
+    admin_app.save_group("g1", _group("g1", "A"))
+    with pytest.raises(ValueError, match="循環"):
+        admin_app.save_group("g1", _group("g1", "A", parent="g1"))
+    with pytest.raises(ValueError, match="同名"):
+        admin_app.save_group("g2", _group("g2", "A"))
+
+    meeting = {**_meeting("m1", "g1", 1, attendee=["nobody"]), "start_time": None, "end_time": None}
+    with pytest.raises(ValueError, match="attendee"):
+        admin_app.save_meeting("m1", meeting)
+    assert not (tmp_path / "data" / "meeting").exists()
+
+
+def test_admin_save_allows_existing_issues(monkeypatch, tmp_path: Path) -> None:
+    import app as admin_app
+    from src.core.writer import write_json_file
+
+    repo_root = Path(__file__).resolve().parent.parent
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    (tmp_path / "docs" / "schema").mkdir(parents=True)
+    (tmp_path / "docs" / "schema" / "base").symlink_to(repo_root / "docs" / "schema" / "base")
+    admin_app.save_group("p1", _group("p1", "審議会1"))
+    admin_app.save_group("p2", _group("p2", "審議会2"))
+    # 親が違う同名は問題にしない
+    admin_app.save_group("g1", _group("g1", "部会", parent="p1"))
+    admin_app.save_group("g2", _group("g2", "部会", parent="p2"))
+    # 親に名前が入ったままの既存データ（保存前から壊れている）
+    write_json_file(tmp_path / "data" / "group" / "g3.json", _group("g3", "分科会", parent="労働条件分科会"))
+
+    # 既にある問題はそのままでも他の項目は編集できる
+    admin_app.save_group("g3", _group("g3", "分科会（改）", parent="労働条件分科会"))
+    assert admin_app._load_json(tmp_path / "data" / "group" / "g3.json")["name"] == "分科会（改）"
+    # 編集で新たに生じる問題は拒否する
+    with pytest.raises(ValueError, match="親グループが存在しません"):
+        admin_app.save_group("g3", _group("g3", "分科会", parent="別の名前"))
+    with pytest.raises(ValueError, match="同名"):
+        admin_app.save_group("g2", _group("g2", "部会", parent="p1"))
+
+
+def test_admin_meeting_edit_keeps_existing_dangling_references(monkeypatch, tmp_path: Path) -> None:
+    import app as admin_app
+    from src.core.writer import write_json_file
+
+    repo_root = Path(__file__).resolve().parent.parent
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    (tmp_path / "docs" / "schema").mkdir(parents=True)
+    (tmp_path / "docs" / "schema" / "base").symlink_to(repo_root / "docs" / "schema" / "base")
+    admin_app.save_group("p1", _group("p1", "審議会1"))
+    admin_app.save_group("p2", _group("p2", "審議会2"))
+    admin_app.save_group("g1", _group("g1", "部会", parent="p1"))
+    admin_app.save_group("g2", _group("g2", "部会", parent="p2"))
+    admin_app.save_person("u1", {"id": "u1", "name": "山田 太郎", "name_yomi": None})
+    # 保存前から消えた人物を参照している既存データ
+    meeting = {**_meeting("m1", "g1", 1, attendee=["u1", "gone"]), "start_time": None, "end_time": None}
+    write_json_file(tmp_path / "data" / "meeting" / "m1" / "basic.json", meeting)
+
+    client = admin_app.app.test_client()
+    form = {"main_group_id": "g1", "main_num": "1", "date": "2024-01-01", "holding": "online",
+            "attendee_multi": ["u1", "gone"], "agenda_lines": "議題"}
+    assert client.post("/meeting/m1/edit", data=form).status_code == 302
+    saved = admin_app._load_json(tmp_path / "data" / "meeting" / "m1" / "basic.json")
+    assert (saved["agenda"], saved["attendee"]) == (["議題"], ["u1", "gone"])
+
+    # 新しく入力した名前は解決が必要で、同名の団体はどれかに決めつけない
+    page = client.post("/meeting/m1/edit", data={**form, "main_group_id": "部会"}).get_data(as_text=True)
+    assert "複数の登録に一致する名前です: 部会" in page
+    page = client.post("/meeting/m1/edit", data={**form, "attendee_multi": ["u1", "gone", "nobody"]})
+    assert "未登録の名前です: nobody" in page.get_data(as_text=True)
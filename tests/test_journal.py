@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import src.utils as utils
+from src.core import journal
+from src.core.journal import CursorExpired, compact, head, read_since, record, record_changes, save_cursor
+
+
+def test_read_since_spans_segments(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    monkeypatch.setattr(journal, "SEGMENT_SIZE", 3)
+    assert head() == 0 and read_since(0) == []
+
+    record_changes([("group", f"g{i}", {"id": f"g{i}", "name": str(i)}) for i in range(7)])
+    change = record("group", "g1")
+    assert change.seq == 8 and change.op == "delete" and change.hash is None
+    assert len(list(journal.journal_dir().glob("*.jsonl"))) == 3
+    assert [c.seq for c in read_since(5)] == [6, 7, 8]
+    assert [c.id for c in read_since(0, limit=2)] == ["g0", "g1"]
+    # 内容が同じならハッシュも同じ（キー順に依存しない）
+    again = record("group", "g2", {"name": "2", "id": "g2"})
+    assert again.hash == read_since(2, limit=1)[0].hash
+
+
+def test_compact_keeps_latest_and_expires_old_cursors(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    record("meeting", "m1", {"v": 1})
+    record("meeting", "m2", {"v": 1})
+    record("meeting", "m1", {"v": 2})
+    record("meeting", "m2")
+    save_cursor("freeze", 4)
+    record("meeting", "m3", {"v": 1})
+
+    assert compact() == (5, 2)
+    assert [(c.seq, c.id, c.op) for c in read_since(4)] == [(5, "m3", "put")]
+    assert head() == 5
+    with pytest.raises(CursorExpired):
+        read_since(1)
+    assert record("meeting", "m4", {"v": 1}).seq == 6
+
+
+def test_admin_save_and_delete_are_journaled(monkeypatch, tmp_path: Path) -> None:
+    import app as admin_app
+
+    repo_root = Path(__file__).resolve().parent.parent
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    (tmp_path / "docs" / "schema").mkdir(parents=True)
+    (tmp_path / "docs" / "schema" / "base").symlink_to(repo_root / "docs" / "schema" / "base")
+    admin_app.save_person("p1", {"id": "p1", "name": "山田 太郎", "name_yomi": None})
+    admin_app.delete_person("p1")
+    admin_app.delete_person("p1")
+    assert [(c.op, c.entity, c.id) for c in read_since(0)] == [("put", "person", "p1"), ("delete", "person", "p1")]
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import re
+import threading
+from pathlib import Path
+
+import pytest
+
+import src.utils as utils
+from src.core.lock import LockTimeout, data_lock
+
+
+def test_data_lock_is_reentrant_and_excludes_other_threads(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    errors = []
+
+    def contender() -> None:
+        try:
+            with data_lock(timeout=0.1):
+                pass
+        except LockTimeout as e:
+            errors.append(e)
+
+    with data_lock():
+        with data_lock():
+            thread = threading.Thread(target=contender)
+            thread.start()
+            thread.join()
+    assert len(errors) == 1
+
+    thread = threading.Thread(target=contender)
+    thread.start()
+    thread.join()
+    assert len(errors) == 1
+
+
+def test_admin_edit_detects_stale_version(monkeypatch, tmp_path: Path) -> None:
+    import app as admin_app
+
+    repo_root = Path(__file__).resolve().parent.parent
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    (tmp_path / "docs" / "schema").mkdir(parents=True)
+    (tmp_path / "docs" / "schema" / "base").symlink_to(repo_root / "docs" / "schema" / "base")
+    admin_app.save_person("p1", {"id": "p1", "name": "山田 太郎", "name_yomi": None})
+
+    client = admin_app.app.test_client()
+    page = client.get("/person/p1/edit").get_data(as_text=True)
+    version = re.search(r'name="version" value="(\w+)"', page).group(1)
+
+    # 別の編集者が先に保存する
+    assert client.post("/person/p1/edit", data={"name": "山田 太郎", "name_yomi": "やまだ", "version": version}).status_code == 302
+    stale = client.post("/person/p1/edit", data={"name": "山田 次郎", "name_yomi": "", "version": version})
+    assert stale.status_code == 409
+    body = stale.get_data(as_text=True)
+    assert "編集中に他の保存がありました" in body and "name: &#34;山田 太郎&#34; → &#34;山田 次郎&#34;" in body
+    assert admin_app._load_json(tmp_path / "data" / "person" / "p1.json")["name_yomi"] == "やまだ"
+
+    # 確認画面から上書きすると最新の版トークンで保存される
+    current = re.search(r'name="version" value="(\w+)"', body).group(1)
+    assert client.post("/person/p1/edit", data={"name": "山田 次郎", "name_yomi": "", "version": current}).status_code == 302
+    assert admin_app._load_json(tmp_path / "data" / "person" / "p1.json")["name"] == "山田 次郎"
+    with pytest.raises(ValueError, match="他の保存"):
+        admin_app.save_person("p1", {"id": "p1", "name": "X", "name_yomi": None}, expected_version=version)
+
+
+def test_person_delete_writes_nothing_when_a_meeting_cannot_be_saved(monkeypatch, tmp_path: Path) -> None:
+    import app as admin_app
+    from src.core.writer import write_json_file
+
+    repo_root = Path(__file__).resolve().parent.parent
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    (tmp_path / "docs" / "schema").mkdir(parents=True)
+    (tmp_path / "docs" / "schema" / "base").symlink_to(repo_root / "docs" / "schema" / "base")
+    admin_app.save_group("g1", {"id": "g1", "name": "G", "parent": None, "category": "c", "official_url": "https://example.com"})
+    admin_app.save_person("p1", {"id": "p1", "name": "山田 太郎", "name_yomi": None})
+    meeting = {
+        "main": {"group_id": "g1", "num": 1}, "sub": [], "date": "2024-02-01", "holding": "online",
+        "start_time": None, "end_time": None, "attendee": ["p1"],
+    }
+    admin_app.save_meeting("m1", {**meeting, "id": "m1"})
+    # 既に壊れている会議（スキーマ違反）。新しい順に処理されるので m1 が先に書き換え対象になる
+    write_json_file(tmp_path / "data" / "meeting" / "m2" / "basic.json", {
+        **meeting, "id": "m2", "main": {"group_id": "g1", "num": 2}, "date": "2024-01-01", "holding": "壊れた値",
+    })
+    before = (tmp_path / "data" / "meeting" / "m1" / "basic.json").read_text(encoding="utf-8")
+
+    client = admin_app.app.test_client()
+    res = client.post("/person/p1/delete", data={"confirm": "yes", "remove_attendance": "on"})
+    assert res.status_code == 409
+    assert "削除を中止しました" in res.get_data(as_text=True)
+    assert (tmp_path / "data" / "meeting" / "m1" / "basic.json").read_text(encoding="utf-8") == before
+    assert (tmp_path / "data" / "person" / "p1.json").exists()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import src.utils as utils
+from src.cli.commands import validate as validate_cmd
+from src.core import manifest as manifest_mod
+from src.core.manifest import build_manifest, diff_manifests
+from src.core.writer import write_json_file
+
+
+def _group(gid: str, name: str) -> dict:
+    return {"id": gid, "name": name, "parent": None, "category": "c", "list_url": None, "official_url": "https://example.com"}
+
+
+def _setup(monkeypatch, tmp_path: Path) -> Path:
+    repo_root = Path(__file__).resolve().parent.parent
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    (tmp_path / "docs" / "schema").mkdir(parents=True)
+    (tmp_path / "docs" / "schema" / "base").symlink_to(repo_root / "docs" / "schema" / "base")
+    group_dir = tmp_path / "data" / "group"
+    for i in range(20):
+        write_json_file(group_dir / f"g{i}.json", _group(f"g{i}", f"G{i}"))
+    return group_dir
+
+
+def test_manifest_diff_follows_changed_buckets(monkeypatch, tmp_path: Path) -> None:
+    group_dir = _setup(monkeypatch, tmp_path)
+    first = build_manifest()
+    assert diff_manifests(first, build_manifest(first)).changed == []
+
+    write_json_file(group_dir / "g3.json", _group("g3", "G3 改"))
+    write_json_file(group_dir / "g99.json", _group("g99", "G99"))
+    (group_dir / "g7.json").unlink()
+    hashed = []
+    original = manifest_mod.file_hash
+    monkeypatch.setattr(manifest_mod, "file_hash", lambda p: hashed.append(p.name) or original(p))
+    second = build_manifest(first)
+    # (mtime, size) の変わらないファイルはハッシュを計算し直さない
+    assert sorted(hashed) == ["g3.json", "g99.json"]
+    assert second["root"] != first["root"]
+    assert second["entities"]["meeting"]["root"] == first["entities"]["meeting"]["root"]
+
+    diff = diff_manifests(first, second)
+    assert (diff.added, diff.modified, diff.removed) == (["group/g99.json"], ["group/g3.json"], ["group/g7.json"])
+    assert diff_manifests(None, second).changed == sorted(f"group/{p.name}" for p in group_dir.glob("*.json"))
+
+
+def test_changed_only_validate_reuses_results(monkeypatch, tmp_path: Path) -> None:
+    group_dir = _setup(monkeypatch, tmp_path)
+    write_json_file(group_dir / "bad.json", {"id": "bad"})
+    first = validate_cmd.validate_data(changed_only=True)
+    assert len(first.checked) == 21 and list(first.failures) == ["group/bad.json"]
+
+    write_json_file(group_dir / "g1.json", _group("g1", "G1 改"))
+    second = validate_cmd.validate_data(changed_only=True)
+    assert second.checked == ["group/g1.json"] and second.reused == 20
+    assert list(second.failures) == ["group/bad.json"]
+
+    write_json_file(group_dir / "bad.json", _group("bad", "Bad"))
+    third = validate_cmd.validate_data(changed_only=True)
+    assert third.checked == ["group/bad.json"] and third.failures == {}
+    assert len(validate_cmd.validate_data(changed_only=False).checked) == 21
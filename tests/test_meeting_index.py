@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+import src.utils as utils
+from benchmarks.generate import SCALES, generate_dataset
+from src.core import meeting_index
+from src.core.meeting_index import (
+    index_root,
+    iter_meetings,
+    meeting_num_conflicts,
+    next_meeting_num,
+    load_index,
+    rebuild_index,
+    refresh_index,
+    remove_meetings,
+    sequence_report,
+    update_meetings,
+)
+
+
+def test_refresh_matches_full_load(monkeypatch, tmp_path: Path) -> None:
+    import app as admin_app
+
+    generate_dataset(tmp_path, SCALES["tiny"], seed=4)
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+
+    index = refresh_index()
+    assert (index_root() / "_manifest.json").exists()
+    full = admin_app.load_meetings()
+    summaries = index.summaries()
+    assert [m["id"] for m in summaries] == [m["id"] for m in full]
+    first = full[0]
+    assert summaries[0]["main"] == first["main"]
+    assert summaries[0]["attendee_count"] == len(first["attendee"])
+
+    month = index.months()[0]
+    assert {m["id"] for m in index.summaries(month)} == {m["id"] for m in full if m["date"].startswith(month)}
+
+
+def test_refresh_reads_only_changed_meetings(monkeypatch, tmp_path: Path) -> None:
+    generate_dataset(tmp_path, SCALES["tiny"], seed=5)
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    index = refresh_index()
+    target = index.summaries()[0]["id"]
+    removed = index.summaries()[1]["id"]
+
+    basic = tmp_path / "data" / "meeting" / target / "basic.json"
+    payload = json.loads(basic.read_text(encoding="utf-8"))
+    payload["holding"] = "document"
+    basic.write_text(json.dumps(payload), encoding="utf-8")
+    shutil.rmtree(tmp_path / "data" / "meeting" / removed)
+
+    opened = []
+    original = meeting_index._basic_path
+    monkeypatch.setattr(meeting_index, "_basic_path", lambda mid: opened.append(mid) or original(mid))
+    index = refresh_index()
+    assert opened == [target]
+    assert removed not in set(index.ids_newest_first())
+    assert next(m for m in index.summaries() if m["id"] == target)["holding"] == "document"
+
+
+def test_update_and_remove(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    meeting = {"id": "m1", "main": {"group_id": "g1", "num": 3}, "sub": [], "date": "2024-05-01", "holding": "online"}
+    dest = tmp_path / "data" / "meeting" / "m1" / "basic.json"
+    dest.parent.mkdir(parents=True)
+    dest.write_text(json.dumps(meeting), encoding="utf-8")
+
+    update_meetings([meeting])
+    assert [m["id"] for m in refresh_index().summaries("2024-05")] == ["m1"]
+    shutil.rmtree(dest.parent)
+    remove_meetings(["m1"])
+    assert len(refresh_index()) == 0
+
+
+def test_month_view_reads_single_partition(monkeypatch, tmp_path: Path) -> None:
+    generate_dataset(tmp_path, SCALES["tiny"], seed=6)
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    rebuild_index()
+    months = load_index().months()
+    assert len(months) > 1
+    assert sorted(p.stem for p in index_root().glob("20*.json")) == sorted(months)
+
+    meeting_index._cache.clear()
+    opened = []
+    original = meeting_index._read_cached
+    monkeypatch.setattr(meeting_index, "_read_cached", lambda path, *a: opened.append(path.name) or original(path, *a))
+    rows = load_index().summaries(months[0])
+    assert rows and all(m["date"].startswith(months[0]) for m in rows)
+    assert opened == ["_manifest.json", f"{months[0]}.json"]
+
+
+def test_date_change_moves_partition_and_iter_order(monkeypatch, tmp_path: Path) -> None:
+    import app as admin_app
+
+    generate_dataset(tmp_path, SCALES["tiny"], seed=7)
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    index = refresh_index()
+    target = index.summaries()[-1]
+    old_month = target["date"][:7]
+
+    basic = tmp_path / "data" / "meeting" / target["id"] / "basic.json"
+    payload = json.loads(basic.read_text(encoding="utf-8"))
+    payload["date"] = "2099-01-01"
+    basic.write_text(json.dumps(payload), encoding="utf-8")
+    update_meetings([{**payload, "id": target["id"]}])
+
+    index = load_index()
+    assert index.months()[0] == "2099-01"
+    assert target["id"] not in {m["id"] for m in index.summaries(old_month)}
+    assert [m["id"] for m in iter_meetings()] == [m["id"] for m in admin_app.load_meetings()]
+    assert next(iter(admin_app.load_meetings(lazy=True)))["id"] == target["id"]
+
+
+def test_sequence_index_tracks_nums(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+
+    def write(mid: str, num: int, sub=None, date: str = "2024-05-01") -> dict:
+        meeting = {"id": mid, "main": {"group_id": "g1", "num": num}, "sub": sub or [], "date": date, "holding": "online"}
+        dest = tmp_path / "data" / "meeting" / mid / "basic.json"
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_text(json.dumps(meeting), encoding="utf-8")
+        return meeting
+
+    update_meetings([write("m1", 1), write("m2", 2), write("m4", 4, sub=[{"group_id": "g2", "num": 7}])])
+    assert next_meeting_num("g1") == 5 and next_meeting_num("g2") == 8 and next_meeting_num("gx") == 1
+    assert sequence_report("g1")["gaps"] == [3]
+
+    # 号数を変えると古い号数は外れ、別の会議と重なれば重複として報告される
+    update_meetings([write("m4", 2, date="2024-06-01")])
+    report = sequence_report("g1")
+    assert report["nums"] == [1, 2] and report["gaps"] == []
+    assert report["duplicates"] == {2: [("m2", "main"), ("m4", "main")]}
+    assert next_meeting_num("g2") == 1
+    assert meeting_num_conflicts({"id": "new", "main": {"group_id": "g1", "num": 1}}) == [("g1", 1, "m1")]
+    assert meeting_num_conflicts({"id": "m1", "main": {"group_id": "g1", "num": 1}}) == []
+
+    remove_meetings(["m2", "m4"])
+    assert sequence_report("g1") == {"nums": [1], "next": 2, "gaps": [], "duplicates": {}}
+
+
+def test_index_writes_wait_for_data_lock(monkeypatch, tmp_path: Path) -> None:
+    import threading
+
+    from src.core.lock import LockTimeout, data_lock
+
+    generate_dataset(tmp_path, SCALES["tiny"], seed=4)
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    monkeypatch.setattr(meeting_index, "REFRESH_LOCK_TIMEOUT", 0.1)
+    before = refresh_index().summaries()
+    victim = before[0]["id"]
+    shutil.rmtree(tmp_path / "data" / "meeting" / victim)
+
+    # 別プロセス（ここでは別スレッド）が data/ のロックを持っている間はインデックスを書き換えない
+    held, release = threading.Event(), threading.Event()
+
+    def holder() -> None:
+        with data_lock():
+            held.set()
+            release.wait()
+
+    thread = threading.Thread(target=holder)
+    thread.start()
+    held.wait()
+    try:
+        manifest = (index_root() / "_manifest.json").read_bytes()
+        assert victim in {r["id"] for r in meeting_index.current_index(max_age=0).summaries()}
+        assert (index_root() / "_manifest.json").read_bytes() == manifest
+        with pytest.raises(LockTimeout):
+            meeting_index._apply([], [victim], lock_timeout=0.1)
+    finally:
+        release.set()
+        thread.join()
+    assert victim not in {r["id"] for r in meeting_index.current_index(max_age=0).summaries()}
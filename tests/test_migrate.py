@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+import src.utils as utils
+from src.core import migrate, writer
+from src.core.migrate import checkpoint_path, current_version, migrate_payload, run_migrations
+from src.core.writer import write_json_file
+
+
+def _setup(monkeypatch, tmp_path: Path) -> Path:
+    repo_root = Path(__file__).resolve().parent.parent
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    (tmp_path / "docs" / "schema").mkdir(parents=True)
+    (tmp_path / "docs" / "schema" / "base").symlink_to(repo_root / "docs" / "schema" / "base")
+    for i in range(5):
+        write_json_file(tmp_path / "data" / "meeting" / f"m{i}" / "basic.json", {
+            "id": f"m{i}",
+            "main": {"group_id": "g1", "num": i + 1},
+            "date": "2024-01-01",
+            "holding": "online",
+            "sources": [{"source_type": "minutes", "url": f" https://example.com/{i} "}],
+        })
+    return tmp_path / "data" / "meeting"
+
+
+def test_sources_migration_is_first_and_idempotent() -> None:
+    assert current_version("meeting") >= 1
+    migrated, applied = migrate_payload("meeting", {"id": "m", "sources": [{"source_type": "notice", "url": "https://e/x"}]})
+    assert applied[0] == "001_normalize_sources"
+    assert migrated["sources"]["announcement"] == "https://e/x"
+    assert migrate_payload("meeting", migrated) == (migrated, [])
+
+
+def test_dry_run_then_resume_after_failure(monkeypatch, tmp_path: Path) -> None:
+    meeting_dir = _setup(monkeypatch, tmp_path)
+    before = (meeting_dir / "m0" / "basic.json").read_text(encoding="utf-8")
+
+    plan = run_migrations(["meeting"], dry_run=True, workers=2, chunk_size=2)
+    assert len(plan.changed) == 5
+    assert '+    "transcript": "https://example.com/0"' in plan.changed[0].diff
+    assert (meeting_dir / "m0" / "basic.json").read_text(encoding="utf-8") == before
+    assert not checkpoint_path().exists()
+
+    # 1件だけスキーマ違反になり、その分はチェックポイントに残る
+    write_json_file(meeting_dir / "m3" / "basic.json", {"id": "m3", "date": "2024-01-01"})
+    first = run_migrations(["meeting"], workers=2, chunk_size=2)
+    assert [r.path for r in first.errors] == ["meeting/m3/basic.json"]
+    assert len(first.changed) == 4
+    saved = json.loads(checkpoint_path().read_text(encoding="utf-8"))
+    assert "meeting/m3/basic.json" not in saved["done"]["meeting"]
+    stored = json.loads((meeting_dir / "m0" / "basic.json").read_text(encoding="utf-8"))
+    assert stored["schema_version"] == current_version("meeting")
+
+    calls = []
+    original = migrate.migrate_file
+    monkeypatch.setattr(migrate, "migrate_file", lambda *a, **k: calls.append(a[1]) or original(*a, **k))
+    write_json_file(meeting_dir / "m3" / "basic.json", {"id": "m3", "main": {"group_id": "g1", "num": 4}, "date": "2024-01-01", "holding": "online"})
+    second = run_migrations(["meeting"], workers=2)
+    assert second.resumed == 4 and calls == [meeting_dir / "m3" / "basic.json"]
+    assert not second.errors and not checkpoint_path().exists()
+
+
+def test_interrupted_write_keeps_previous_file(monkeypatch, tmp_path: Path) -> None:
+    meeting_dir = _setup(monkeypatch, tmp_path)
+    before = (meeting_dir / "m0" / "basic.json").read_text(encoding="utf-8")
+
+    def interrupted(src, dst):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(writer.os, "replace", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        run_migrations(["meeting"], workers=1, chunk_size=1)
+    assert (meeting_dir / "m0" / "basic.json").read_text(encoding="utf-8") == before
+    assert not list(meeting_dir.rglob("*.tmp"))
+
+
+def test_migrated_files_match_convert_output(monkeypatch, tmp_path: Path) -> None:
+    from src.core.convert import convert_group, convert_meeting, convert_person
+
+    meeting_dir = _setup(monkeypatch, tmp_path)
+    groups = [{"id": "g1", "name": "G", "category": "c", "official_url": "https://example.com"}]
+    write_json_file(tmp_path / "register" / "group" / "form.json", groups)
+    write_json_file(tmp_path / "register" / "person" / "form.json", [])
+    # 旧形式（配列）の data を、register では dict（値の無いキーあり）で書いたもの
+    write_json_file(tmp_path / "register" / "meeting" / "form.json", [{
+        "id": "m0",
+        "main": {"group_id": "G", "num": 1},
+        "date": "2024-01-01",
+        "holding": "online",
+        "sources": {"transcript": "https://example.com/0", "meeting_page": None},
+    }])
+    for i in range(1, 5):
+        (meeting_dir / f"m{i}" / "basic.json").unlink()
+        (meeting_dir / f"m{i}").rmdir()
+    write_json_file(meeting_dir / "m0" / "basic.json", {
+        "id": "m0", "main": {"group_id": "g1", "num": 1}, "sub": [], "date": "2024-01-01", "holding": "online",
+        "start_time": None, "end_time": None, "agenda": [], "attendee": [], "materials": [],
+        "sources": [{"source_type": "minutes", "url": "https://example.com/0"}],
+    })
+    assert len(run_migrations(["meeting"]).changed) == 1
+
+    # convert とマイグレーションは同じ正規形で書くので、互いの出力を書き換えない
+    group_registry, _ = convert_group()
+    person_registry, _ = convert_person()
+    result = convert_meeting(group_registry, person_registry)
+    assert (result.created, result.updated, result.unchanged) == (0, 0, 1)
+
+
+def test_convert_stamps_group_and_person_versions(monkeypatch, tmp_path: Path) -> None:
+    from src.core.convert import convert_group, convert_person
+
+    _setup(monkeypatch, tmp_path)
+    for entity in ("group", "person"):
+        monkeypatch.setitem(migrate._REGISTRY, entity, [migrate.Migration(entity, 1, "noop", dict)])
+    write_json_file(tmp_path / "register" / "group" / "form.json",
+                    [{"id": "g1", "name": "G", "category": "c", "official_url": "https://example.com"}])
+    write_json_file(tmp_path / "register" / "person" / "form.json", [{"name": "山田 太郎"}])
+    convert_group()
+    convert_person()
+
+    # convert の出力はマイグレーション済みとして扱われ、migrate が書き換えない
+    for entity in ("group", "person"):
+        for path in (tmp_path / "data" / entity).glob("*.json"):
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            assert payload["schema_version"] == 1
+            assert migrate_payload(entity, payload) == (payload, [])
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import src.utils as utils
+from benchmarks.generate import SCALES, generate_dataset
+from src.core.model import Group, IdTable, Meeting, Person, load_records
+
+
+def test_records_round_trip_json(tmp_path: Path) -> None:
+    generate_dataset(tmp_path, SCALES["tiny"], seed=8)
+    table = IdTable()
+    for path in sorted((tmp_path / "data" / "meeting").glob("*/basic.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert Meeting.from_json(data, table).to_json() == data
+    for cls, entity in ((Group, "group"), (Person, "person")):
+        for path in sorted((tmp_path / "data" / entity).glob("*.json")):
+            data = json.loads(path.read_text(encoding="utf-8"))
+            assert cls.from_json(data, table).to_json() == data
+
+
+def test_ids_are_interned_and_attendee_uses_handles() -> None:
+    table = IdTable()
+    pid = "11111111-1111-1111-1111-111111111111"
+    a = Meeting.from_json({"id": "m1", "main": {"group_id": "g1", "num": 1}, "attendee": [pid], "date": "2024-01-01"}, table)
+    b = Meeting.from_json({"id": "m2", "main": {"group_id": "".join(["g", "1"]), "num": 2}, "attendee": [pid[:]]}, table)
+    assert a.main.group_id is b.main.group_id
+    assert a._attendee.typecode == "I" and list(a._attendee) == list(b._attendee)
+    assert a.attendee == [pid]
+    # dict と同じ読み方もできる（テンプレートや既存コード向け）
+    assert a["main"]["num"] == 1 and a.get("sources") is None and "sources" not in a
+    assert b.get("date", "-") == "-" and b.date is None
+    a["attendee"] = []
+    assert a.to_json()["attendee"] == []
+
+
+def test_viewer_loaders_return_records(monkeypatch, tmp_path: Path) -> None:
+    import viewer
+
+    generate_dataset(tmp_path, SCALES["tiny"], seed=9)
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    meetings = viewer.load_meetings()
+    assert meetings and all(isinstance(m, Meeting) for m in meetings)
+    assert isinstance(viewer.load_groups()[0], Group)
+    assert [m["id"] for m in viewer.load_meetings(lazy=True)] == [m["id"] for m in meetings]
+    persons = load_records(Person, tmp_path / "data" / "person")
+    assert persons and persons[0]["id"] == sorted(p.stem for p in (tmp_path / "data" / "person").glob("*.json"))[0]
+
+    client = viewer.app.test_client()
+    mid = meetings[0]["id"]
+    assert client.get(f"/meeting/{mid}/").status_code == 200
+    assert client.get(f"/group/{meetings[0].main.group_id}/").status_code == 200
+
+
+def test_viewer_id_table_lives_for_one_request(monkeypatch, tmp_path: Path) -> None:
+    import viewer
+
+    generate_dataset(tmp_path, SCALES["tiny"], seed=9)
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    with viewer.app.test_request_context("/"):
+        table = viewer.id_table()
+        assert viewer.id_table() is table
+        groups = {g["id"]: g for g in viewer.load_groups()}
+        meeting = viewer.load_meetings()[0]
+        # 同じリクエスト内では group と meeting が同じ id 文字列を共有する
+        assert groups[meeting.main.group_id]["id"] is meeting.main.group_id
+        assert len(table) > len(groups)
+    # 次のリクエストは空のテーブルから始まる（削除された会議の id も残らない）
+    with viewer.app.test_request_context("/"):
+        assert viewer.id_table() is not table and len(viewer.id_table()) == 0
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import pytest
+
+from src.core.resolver import NameRegistry, UnresolvedName, normalize_name
+
+
+def _registry() -> NameRegistry:
+    return NameRegistry.from_lists([
+        {"id": "g1", "name": "デジタル庁"},
+        {"id": "g2", "name": "社会保障審議会 医療部会"},
+        {"id": "g3", "name": "社会保障審議会"},
+        {"id": "p1", "name": "山田 太郎", "name_yomi": "やまだ たろう"},
+        {"id": "p2", "name": "ＡＢＣ委員会"},
+    ])
+
+
+def test_resolves_width_and_space_variants() -> None:
+    registry = _registry()
+    assert normalize_name(" 山田　太郎 ") == "山田太郎"
+    assert registry.resolve("山田太郎") == "p1"
+    assert registry.resolve("社会保障審議会　医療部会") == "g2"
+    assert registry.resolve("ABC委員会") == "p2"
+    assert registry.resolve("ﾃﾞｼﾞﾀﾙ庁") == "g1"
+    # よみ（カタカナ・空白違いも可）と id でも引ける
+    assert registry.resolve("ヤマダタロウ") == "p1"
+    assert registry.resolve("g3") == "g3"
+
+
+def test_unresolved_name_carries_ranked_suggestions() -> None:
+    registry = _registry()
+    with pytest.raises(UnresolvedName) as excinfo:
+        registry.resolve("社会保障審議会医療分科会")
+    assert excinfo.value.suggestions[:2] == ["社会保障審議会 医療部会", "社会保障審議会"]
+    assert "候補: 社会保障審議会 医療部会" in str(excinfo.value)
+    assert isinstance(excinfo.value, ValueError)
+    assert registry.suggest("全く別の名前") == []
+
+
+def test_ambiguous_yomi_is_not_resolved() -> None:
+    registry = NameRegistry.from_lists([
+        {"id": "p1", "name": "佐藤 一", "name_yomi": "さとう はじめ"},
+        {"id": "p2", "name": "佐藤 元", "name_yomi": "さとう はじめ"},
+    ])
+    with pytest.raises(UnresolvedName):
+        registry.resolve("さとうはじめ")
+    assert registry.resolve_or_create("佐藤 一") == "p1"
+    new_id = registry.resolve_or_create("鈴木 次郎")
+    assert registry.resolve("鈴木次郎") == new_id
+
+
+def test_ambiguous_name_lists_candidate_ids() -> None:
+    registry = NameRegistry.from_lists([
+        {"id": "g1", "name": "部会"},
+        {"id": "g2", "name": "部会 "},
+        {"id": "g3", "name": "審議会"},
+    ])
+    with pytest.raises(UnresolvedName) as excinfo:
+        registry.resolve("部会")
+    assert excinfo.value.ambiguous
+    assert excinfo.value.suggestions == ["g1", "g2"]
+    assert "複数の登録に一致する名前です: 部会（候補: g1, g2）" == str(excinfo.value)
+    with pytest.raises(UnresolvedName):
+        registry.resolve_or_create("部会")
+    assert registry.resolve("g2") == "g2"
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import copy
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import jsonschema
+import pytest
+
+from benchmarks.generate import SCALES, generate_dataset
+from src.core.schema_compiler import UnsupportedSchema, compile_schema, load_compiled
+from src.core.validator import validate_with_schema
+
+SCHEMA_DIR = Path(__file__).resolve().parents[1] / "docs" / "schema" / "base"
+
+# 値の差し替え候補（型・pattern・enum・minLength の境界を突く）
+ODD_VALUES: List[Any] = [None, True, 0, 1.0, 1.5, "", "x", "2024-01-01", "12:30", "online", [], {}, ["x"], [{}]]
+
+
+def _mutations(payload: Any) -> Iterator[Any]:
+    """1か所だけ壊したコピーを列挙する（キー削除・値差し替え・未知キー追加）."""
+    yield payload
+    if isinstance(payload, dict):
+        yield {**payload, "unexpected": 1}
+        for key, value in payload.items():
+            yield {k: v for k, v in payload.items() if k != key}
+            for odd in ODD_VALUES:
+                yield {**payload, key: odd}
+            for inner in list(_mutations(value))[1:]:
+                yield {**payload, key: inner}
+    elif isinstance(payload, list) and payload:
+        for inner in list(_mutations(payload[0]))[1:]:
+            yield [inner] + payload[1:]
+        yield payload + [None]
+
+
+def _fixtures(tmp_path: Path) -> Dict[str, List[Any]]:
+    generate_dataset(tmp_path, SCALES["tiny"], seed=10)
+    data = tmp_path / "data"
+    register = tmp_path / "register"
+    meeting = json.loads(next(iter(sorted(data.glob("meeting/*/basic.json")))).read_text(encoding="utf-8"))
+    meeting["sub"] = [{"group_id": "g", "num": 2}]
+    meeting["sources"]["other"] = [{"url": "https://example.com", "title": None}]
+    meeting["materials"] = [{"url": "https://example.com/a.pdf", "title": "資料"}]
+    return {
+        "group.data": [json.loads(next(iter(sorted(data.glob("group/*.json")))).read_text(encoding="utf-8"))],
+        "person.data": [json.loads(next(iter(sorted(data.glob("person/*.json")))).read_text(encoding="utf-8"))],
+        "meeting.basic.data": [meeting],
+        "group.register": [json.loads((register / "group" / "form.json").read_text(encoding="utf-8"))[:2]],
+        "person.register": [json.loads((register / "person" / "form.json").read_text(encoding="utf-8"))[:2]],
+        "meeting.basic.register": [json.loads((register / "meeting" / "form.json").read_text(encoding="utf-8"))[:2]],
+    }
+
+
+def test_generated_validators_agree_with_jsonschema(tmp_path: Path) -> None:
+    for name, payloads in _fixtures(tmp_path).items():
+        schema = json.loads((SCHEMA_DIR / f"{name}.schema.json").read_text(encoding="utf-8"))
+        check = compile_schema(schema)
+        reference = jsonschema.Draft202012Validator(schema)
+        valid = invalid = 0
+        for payload in payloads:
+            for case in _mutations(copy.deepcopy(payload)):
+                expected = reference.is_valid(case)
+                assert check(case) is expected, (name, case)
+                valid += expected
+                invalid += not expected
+        assert valid and invalid, name
+
+
+def test_fallback_keeps_jsonschema_errors(tmp_path: Path) -> None:
+    path = tmp_path / "s.schema.json"
+    path.write_text(json.dumps({"type": "object", "properties": {"n": {"type": "integer", "minimum": 1}}}), encoding="utf-8")
+    with pytest.raises(UnsupportedSchema):
+        compile_schema(json.loads(path.read_text(encoding="utf-8")))
+    _, check, _ = load_compiled(path)
+    assert check is None
+    validate_with_schema({"n": 2}, path)
+    with pytest.raises(jsonschema.ValidationError):
+        validate_with_schema({"n": 0}, path)
+
+    with pytest.raises(jsonschema.ValidationError) as excinfo:
+        validate_with_schema({"id": "x", "main": {"group_id": "", "num": 1}, "date": "2024-01-01", "holding": "online"},
+                             SCHEMA_DIR / "meeting.basic.data.schema.json")
+    assert list(excinfo.value.path) == ["main", "group_id"]
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import src.utils as utils
+from benchmarks.generate import SCALES, generate_dataset
+from src.core.meeting_index import refresh_index, remove_meetings
+from src.core.static_api import build_api, content_hash
+
+
+def test_static_api_documents_and_incremental_rebuild(monkeypatch, tmp_path: Path) -> None:
+    generate_dataset(tmp_path, SCALES["tiny"], seed=8)
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    refresh_index()
+    dest = tmp_path / "build" / "api" / "v1"
+
+    first = build_api(dest)
+    assert not first.unchanged and not first.removed
+    index = json.loads((dest / "index.json").read_text(encoding="utf-8"))
+    assert index["counts"]["meeting"] == SCALES["tiny"].meetings
+    for rel, digest in index["files"].items():
+        assert content_hash((dest / rel).read_bytes()) == digest
+
+    page = json.loads((dest / "meeting" / "pages" / "1.json").read_text(encoding="utf-8"))
+    assert page["total"] == SCALES["tiny"].meetings
+    months = json.loads((dest / "meeting" / "months.json").read_text(encoding="utf-8"))
+    assert sum(m["count"] for m in months) == SCALES["tiny"].meetings
+    meeting = page["items"][0]
+    doc = json.loads((dest / "meeting" / f"{meeting['id']}.json").read_text(encoding="utf-8"))
+    assert doc["main"] == meeting["main"] and "schema_version" not in doc
+    group = json.loads((dest / "group" / f"{meeting['main']['group_id']}.json").read_text(encoding="utf-8"))
+    assert meeting["id"] in group["meetings"]["main"]
+    tree = json.loads((dest / "group" / "tree.json").read_text(encoding="utf-8"))
+
+    def count(nodes: list) -> int:
+        return sum(1 + count(n["children"]) for n in nodes)
+
+    assert count(tree) == index["counts"]["group"]
+
+    # 変更が無ければ何も書かない。消えた会議のドキュメントは削除される
+    assert not build_api(dest).written
+    shutil.rmtree(tmp_path / "data" / "meeting" / meeting["id"])
+    remove_meetings([meeting["id"]])
+    third = build_api(dest)
+    assert f"meeting/{meeting['id']}.json" in third.removed
+    assert "index.json" in third.written and "meeting/pages/1.json" in third.written
+    assert len(third.written) < len(first.written) // 2
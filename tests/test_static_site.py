@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+from pathlib import Path
+from xml.etree import ElementTree
+
+import src.utils as utils
+from benchmarks.generate import SCALES, generate_dataset
+from src.core.meeting_index import refresh_index, update_meetings
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _freeze_module():
+    spec = importlib.util.spec_from_file_location("_test_freeze_viewer", ROOT / "scripts" / "freeze_viewer.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_freeze_writes_months_sitemap_and_rebuilds_only_changed_months(monkeypatch, tmp_path: Path) -> None:
+    generate_dataset(tmp_path, SCALES["tiny"], seed=9)
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    index = refresh_index()
+    module = _freeze_module()
+    build = tmp_path / "build"
+    monkeypatch.setitem(module.app.config, "FREEZER_DESTINATION", str(build))
+    module.freeze()
+
+    months = index.months()
+    assert all((build / "meeting" / "month" / m / "index.html").is_file() for m in months)
+    ns = {"s": "http://www.sitemaps.org/schemas/sitemap/0.9", "a": "http://www.w3.org/2005/Atom"}
+    locs = [e.text for e in ElementTree.parse(build / "sitemap.xml").findall("s:url/s:loc", ns)]
+    assert f"https://zaruju.github.io/kaigitai/meeting/month/{months[0]}/" in locs
+    assert len(ElementTree.parse(build / "atom.xml").findall("a:entry", ns)) == min(50, len(index))
+
+    # 材料が変わっていない月は描画し直さない（目印を書いても残る）。会議を更新した月だけ作り直す
+    old, new = months[-1], months[0]
+    for m in (old, new):
+        (build / "meeting" / "month" / m / "index.html").write_text("stale", encoding="utf-8")
+    row = index.summaries(new)[0]
+    path = tmp_path / "data" / "meeting" / row["id"] / "basic.json"
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    payload["agenda"] = ["差し替えた議題"]
+    path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    update_meetings([{**payload, "id": row["id"]}])
+    module.freeze()
+
+    assert (build / "meeting" / "month" / old / "index.html").read_text(encoding="utf-8") == "stale"
+    assert (build / "meeting" / "month" / new / "index.html").read_text(encoding="utf-8") != "stale"
+    entries = ElementTree.parse(build / "atom.xml").findall("a:entry", ns)
+    assert entries[0].find("a:id", ns).text == f"urn:kaigitai:meeting:{row['id']}"
+    assert "差し替えた議題" in entries[0].find("a:summary", ns).text
+
+
+def test_freeze_rebuilds_everything_when_templates_change(monkeypatch, tmp_path: Path) -> None:
+    generate_dataset(tmp_path, SCALES["tiny"], seed=9)
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    index = refresh_index()
+    module = _freeze_module()
+    build = tmp_path / "build"
+    monkeypatch.setitem(module.app.config, "FREEZER_DESTINATION", str(build))
+    module.freeze()
+
+    month = build / "meeting" / "month" / index.months()[-1] / "index.html"
+    feed = build / "ical" / "all.ics"
+    for path in (month, feed):
+        path.write_text("stale", encoding="utf-8")
+    module.freeze()
+    assert month.read_text(encoding="utf-8") == "stale"
+
+    # データが同じでも、描画の版（テンプレートの内容と RENDER_VERSION）が変われば作り直す
+    monkeypatch.setattr(module, "render_version", lambda app: "edited-template")
+    module.freeze()
+    assert month.read_text(encoding="utf-8") != "stale"
+    assert feed.read_text(encoding="utf-8").startswith("BEGIN:VCALENDAR")
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import src.utils as utils
+from benchmarks.generate import SCALES, generate_dataset
+from src.core.meeting_index import index_root, meeting_stats, refresh_index, remove_meetings, update_meetings
+from src.core.stats import Aggregates, build_report
+
+
+def test_aggregates_add_and_remove() -> None:
+    a = {"id": "m1", "date": "2024-05-01", "main": {"group_id": "g1"}, "sub": [{"group_id": "g2"}], "holding": "online", "attendee": ["p1", "p2"]}
+    b = {"id": "m2", "date": "2023-01-10", "main": {"group_id": "g1"}, "sub": [], "holding": "onsite", "attendee": ["p1"]}
+    agg = Aggregates.from_meetings([a, b])
+    assert agg.group_year == {"g1": {"2024": 1, "2023": 1}, "g2": {"2024": 1}}
+    assert agg.holding_totals() == {"online": 1, "onsite": 1}
+    assert agg.top_attendees(1) == [("p1", 2)]
+    agg.remove(a)
+    assert agg.to_json() == Aggregates.from_meetings([b]).to_json()
+
+    report = build_report(agg, {"g1": "本会議"}, {"p1": "山田"})
+    assert report["groups"] == [{"id": "g1", "name": "本会議", "total": 1, "years": [1]}]
+    assert report["attendees"] == [{"id": "p1", "name": "山田", "count": 1}]
+
+
+def test_stats_follow_index_updates(monkeypatch, tmp_path: Path) -> None:
+    import app as admin_app
+
+    generate_dataset(tmp_path, SCALES["tiny"], seed=6)
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    refresh_index()
+
+    def expected() -> dict:
+        return Aggregates.from_meetings(admin_app.load_meetings()).to_json()
+
+    assert meeting_stats().to_json() == expected()
+
+    meetings = admin_app.load_meetings()
+    changed = {**meetings[0], "holding": "document", "date": "1999-01-01", "attendee": meetings[0]["attendee"][:1]}
+    (tmp_path / "data" / "meeting" / changed["id"] / "basic.json").write_text(json.dumps(changed), encoding="utf-8")
+    update_meetings([changed])
+    gone = meetings[1]["id"]
+    shutil.rmtree(tmp_path / "data" / "meeting" / gone)
+    remove_meetings([gone])
+    assert meeting_stats().to_json() == expected()
+
+    # 集計ファイルが消えてもパーティションから作り直す
+    (index_root() / "_stats.json").unlink()
+    assert meeting_stats().to_json() == expected()
+    page = admin_app.app.test_client().get("/stats").get_data(as_text=True)
+    assert "団体別・年別の開催数" in page and "1999" in page
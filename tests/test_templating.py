@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import src.utils as utils
+from benchmarks.generate import SCALES, generate_dataset
+from src.core.meeting_index import refresh_index
+from src.templating import compile_templates, render_version
+
+
+def test_meeting_cards_are_cached_and_match_macro(monkeypatch, tmp_path: Path) -> None:
+    import viewer
+
+    generate_dataset(tmp_path, SCALES["tiny"], seed=10)
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+    index = refresh_index()
+    cards = viewer.app.extensions["meeting_card_cache"]
+    cards.clear()
+    client = viewer.app.test_client()
+
+    month = index.months()[0]
+    first = client.get(f"/meeting/month/{month}/").get_data(as_text=True)
+    misses = cards.misses
+    assert misses >= len(index.summaries(month))
+    assert client.get(f"/meeting/month/{month}/").get_data(as_text=True) == first
+    assert cards.misses == misses
+
+    row = index.summaries(month)[0]
+    group_map = {g["id"]: g["name"] for g in viewer.load_groups()}
+    with viewer.app.test_request_context():
+        macro = viewer.app.jinja_env.get_template("components/meeting_card.html").module.meeting_card
+        html = str(macro(row, group_map))
+        # 団体名が変われば別のキーになり、古い描画結果は使われない
+        renamed = str(viewer.app.jinja_env.globals["meeting_card"](row, {**group_map, row["main"]["group_id"]: "改名後"}))
+    assert html in first
+    assert f"/kaigitai/meeting/{row['id']}/" in html
+    assert "改名後" in renamed
+
+    assert compile_templates(viewer.app) == len(list((Path(viewer.__file__).parent / "templates").rglob("*.html")))
+
+
+def test_render_version_follows_template_sources(tmp_path: Path) -> None:
+    from flask import Flask
+
+    (tmp_path / "templates").mkdir()
+    page = tmp_path / "templates" / "page.html"
+    page.write_text("<p>{{ x }}</p>", encoding="utf-8")
+    app = Flask("render_version_test", root_path=str(tmp_path))
+    app.config["TEMPLATES_AUTO_RELOAD"] = True
+    before = render_version(app)
+    assert render_version(app) == before
+    page.write_text("<div>{{ x }}</div>", encoding="utf-8")
+    assert render_version(app) != before
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import src.utils as utils
+from src.cli.commands.watch import WatchState, diff_snapshots, process_changes, snapshot
+
+
+def _setup(monkeypatch, tmp_path: Path) -> None:
+    repo_root = Path(__file__).resolve().parent.parent
+    shutil.copytree(repo_root / "docs" / "schema" / "base", tmp_path / "docs" / "schema" / "base")
+    for entity in ("group", "person", "meeting"):
+        dest = tmp_path / "register" / entity / "form.json"
+        dest.parent.mkdir(parents=True)
+        dest.write_text("[]", encoding="utf-8")
+    monkeypatch.setattr(utils, "repo_root", lambda: tmp_path)
+
+
+def _write(path: Path, data) -> None:
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def test_only_changed_entity_is_reconverted(monkeypatch, tmp_path: Path) -> None:
+    _setup(monkeypatch, tmp_path)
+    state = WatchState.initial()
+
+    _write(tmp_path / "register" / "group" / "form.json", [
+        {"name": "親", "category": "cat", "official_url": "https://example.com"},
+    ])
+    changed, removed = diff_snapshots(state.stamps, snapshot())
+    state.stamps = snapshot()
+    process_changes(state, changed, removed)
+
+    group_files = list((tmp_path / "data" / "group").glob("*.json"))
+    assert len(group_files) == 1
+    assert not (tmp_path / "data" / "person").exists()
+    assert not (tmp_path / "data" / "meeting").exists()
+    fragment = json.loads((tmp_path / "docs" / "schema" / "fragment" / "group_names.json").read_text(encoding="utf-8"))
+    assert fragment == {"enum": ["親"]}
+    assert not (tmp_path / "docs" / "schema" / "fragment" / "person_names.json").exists()
+
+    # meeting だけ変えた場合は data/group から参照を解決する
+    _write(tmp_path / "register" / "meeting" / "form.json", [
+        {"main": {"group_id": "親", "num": 1}, "date": "2024-01-01", "holding": "online"},
+    ])
+    fragment_path = tmp_path / "docs" / "schema" / "fragment" / "group_names.json"
+    fragment_path.unlink()
+    changed, removed = diff_snapshots(state.stamps, snapshot())
+    state.stamps = snapshot()
+    process_changes(state, changed, removed)
+    assert len(list((tmp_path / "data" / "meeting").glob("*/basic.json"))) == 1
+    # name が変わっていないので fragment は書き直さない
+    assert not fragment_path.exists()
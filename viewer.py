@@ -2,17 +2,29 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-from flask import Flask, abort, render_template, request, url_for as flask_url_for
+from flask import Flask, Response, abort, g as flask_g, has_app_context, render_template, request, url_for as flask_url_for
 
+from src.core.ical import Feed, build_feeds, iter_calendar
+from src.core.meeting_index import current_index, iter_meetings, meeting_stats
+from src.core.model import Group, IdTable, Meeting, Person, load_records, to_meetings
+from src.core.sources import normalize_sources
+from src.core.static_site import lastmod, render_atom, render_sitemap
+from src.core.stats import build_report
+from src.templating import render_version, setup_templates
 from src.utils import data_dir
 
 DISCLAIMER_TEXT = "本サイトの掲載情報は正確性を保証しません。参考情報としてご利用ください。"
 # GitHub Pagesのプロジェクトページ配下で動かすためのベースパス
 BASE_PATH = "/kaigitai"
+# サイトマップ・Atom フィードに載せる公開URLのオリジン（GitHub Pages）
+SITE_URL = "https://zaruju.github.io"
+# カレンダーアプリの購読間隔に合わせる。内容が変わっていなければ ETag で 304 を返す
+ICAL_MAX_AGE = 3600
 
 app = Flask(__name__)
+setup_templates(app)
 
 
 def _prefixed_url_for(endpoint: str, **values: Any) -> str:
@@ -33,88 +45,46 @@ def _load_json(path: Path, default: Any = None) -> Any:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def load_groups() -> List[Dict[str, Any]]:
-    results: List[Dict[str, Any]] = []
-    dir_path = data_dir() / "group"
-    for file in sorted(dir_path.glob("*.json")):
-        data = _load_json(file, {})
-        data["id"] = file.stem
-        results.append(data)
+def id_table() -> IdTable:
+    """リクエスト内で id 文字列を共有するテーブル。リクエストが終われば捨てる（プロセス全体では溜めない）."""
+    if not has_app_context():
+        return IdTable()
+    if "id_table" not in flask_g:
+        flask_g.id_table = IdTable()
+    return flask_g.id_table
+
+
+def load_groups() -> List[Group]:
+    # id 文字列を共有するため、スロット付きレコードで保持する
+    results = load_records(Group, data_dir() / "group", id_table())
     return sorted(results, key=lambda g: (g.get("name") or "", g["id"]))
 
 
-def load_persons() -> List[Dict[str, Any]]:
-    results: List[Dict[str, Any]] = []
-    dir_path = data_dir() / "person"
-    for file in sorted(dir_path.glob("*.json")):
-        data = _load_json(file, {})
-        data["id"] = file.stem
-        results.append(data)
-    return results
+def load_persons() -> List[Person]:
+    return load_records(Person, data_dir() / "person", id_table())
 
 
-def load_meetings() -> List[Dict[str, Any]]:
-    results: List[Dict[str, Any]] = []
+def load_meetings(lazy: bool = False) -> Iterable[Meeting]:
+    """全会議を新しい順に返す。lazy=True なら月別パーティション順に1件ずつ読み込むイテレータを返す."""
+    if lazy:
+        return to_meetings(iter_meetings(), id_table())
+    results: List[Meeting] = []
     dir_path = data_dir() / "meeting"
     if not dir_path.exists():
         return results
+    table = id_table()
     for folder in sorted(p for p in dir_path.iterdir() if p.is_dir()):
         basic = folder / "basic.json"
         data = _load_json(basic, {})
         data["id"] = folder.name
-        results.append(data)
+        results.append(Meeting.from_json(data, table))
 
-    def sort_key(m: Dict[str, Any]) -> Any:
+    def sort_key(m: Meeting) -> Any:
         return (m.get("date") or "", m.get("main", {}).get("num") or 0)
 
     return sorted(results, key=sort_key, reverse=True)
 
 
-def _clean_url(value: Optional[str]) -> Optional[str]:
-    if value is None:
-        return None
-    v = value.strip()
-    return v or None
-
-
-def normalize_sources(raw: Any) -> Dict[str, Any]:
-    if not raw:
-        return {"meeting_page": None, "transcript": None, "announcement": None, "other": []}
-    if isinstance(raw, dict):
-        return {
-            "meeting_page": _clean_url(raw.get("meeting_page")),
-            "transcript": _clean_url(raw.get("transcript")),
-            "announcement": _clean_url(raw.get("announcement") or raw.get("notice")),
-            "other": raw.get("other") or [],
-        }
-    meeting_page = None
-    transcript = None
-    announcement = None
-    other_items: List[Dict[str, Any]] = []
-    for item in raw:
-        if not isinstance(item, dict):
-            continue
-        url = _clean_url(item.get("url"))
-        if not url:
-            continue
-        stype = item.get("source_type")
-        title = item.get("title")
-        if stype == "meeting_page" and not meeting_page:
-            meeting_page = url
-        elif stype in ("minutes", "transcript") and not transcript:
-            transcript = url
-        elif stype in ("announcement", "notice") and not announcement:
-            announcement = url
-        else:
-            other_items.append({"url": url, "title": title})
-    return {
-        "meeting_page": meeting_page,
-        "transcript": transcript,
-        "announcement": announcement,
-        "other": other_items,
-    }
-
-
 def build_group_tree(level_limit: Optional[int] = None) -> tuple[List[Dict[str, Any]], int]:
     groups = load_groups()
     by_parent: Dict[Optional[str], List[Dict[str, Any]]] = {}
@@ -187,8 +157,7 @@ def group_detail(id: str) -> str:
     path = data_dir() / "group" / f"{id}.json"
     if not path.exists():
         abort(404)
-    group = _load_json(path, {})
-    group["id"] = id
+    group = Group.from_json({**_load_json(path, {}), "id": id}, id_table())
     groups = load_groups()
     group_map = {g["id"]: g["name"] for g in groups}
     group_name_map = {g["name"]: g["id"] for g in groups}
@@ -205,7 +174,7 @@ def group_detail(id: str) -> str:
                 parent_name = group_map.get(parent_id)
         parent_label = f"{parent_name} ({parent_id})" if parent_name else parent_id
         parent_id_for_link = parent_id if parent_name else None
-    meetings = load_meetings()
+    meetings = current_index().summaries()
     main_meetings = [m for m in meetings if m.get("main", {}).get("group_id") == id]
     sub_meetings = [m for m in meetings if any(sub.get("group_id") == id for sub in m.get("sub", []))]
     return render_template(
@@ -264,18 +233,17 @@ def person_detail(id: str) -> str:
     path = data_dir() / "person" / f"{id}.json"
     if not path.exists():
         abort(404)
-    person = _load_json(path, {})
-    person["id"] = id
+    person = Person.from_json({**_load_json(path, {}), "id": id}, id_table())
     return render_template("person_detail.html", person=person, page_title=f"Person: {person.get('name') or id} - kaigitai viewer")
 
 
 @app.get("/meeting/")
 def meeting_list() -> str:
-    meetings = load_meetings()
-    months = sorted({(m.get("date") or "")[:7] for m in meetings if m.get("date")}, reverse=True)
+    # 一覧はサマリインデックスだけで描画し、basic.json は開かない
+    index = current_index()
+    months = index.months()
     active_month = request.args.get("month") or (months[0] if months else None)
-    if active_month:
-        meetings = [m for m in meetings if (m.get("date") or "").startswith(active_month)]
+    meetings = index.summaries(active_month)
     groups = load_groups()
     group_map = {g["id"]: g["name"] for g in groups}
     persons = load_persons()
@@ -291,6 +259,18 @@ def meeting_list() -> str:
     )
 
 
+@app.get("/stats/")
+def stats() -> str:
+    current_index()
+    group_map = {g["id"]: g["name"] for g in load_groups()}
+    person_map = {p["id"]: p["name"] for p in load_persons()}
+    return render_template(
+        "stats.html",
+        report=build_report(meeting_stats(), group_map, person_map),
+        page_title="Stats - kaigitai viewer",
+    )
+
+
 @app.get("/meeting/month/<ym>/")
 def meeting_month(ym: str) -> str:
     with app.test_request_context(f"/meeting?month={ym}"):
@@ -302,8 +282,7 @@ def meeting_detail(id: str) -> str:
     path = data_dir() / "meeting" / id / "basic.json"
     if not path.exists():
         abort(404)
-    meeting = _load_json(path, {})
-    meeting["id"] = id
+    meeting = Meeting.from_json({**_load_json(path, {}), "id": id}, id_table())
     meeting["sources"] = normalize_sources(meeting.get("sources"))
     groups = load_groups()
     persons = load_persons()
@@ -318,5 +297,83 @@ def meeting_detail(id: str) -> str:
     )
 
 
+def _absolute_url(endpoint: str, **values: Any) -> str:
+    return SITE_URL + _prefixed_url_for(endpoint, **values)
+
+
+@app.get("/atom.xml")
+def atom() -> Response:
+    """最近追加・更新された会議の Atom フィード."""
+    group_map = {g["id"]: g["name"] for g in load_groups()}
+    body = render_atom(
+        current_index(),
+        group_map,
+        feed_url=_absolute_url("atom"),
+        meeting_url=lambda mid: _absolute_url("meeting_detail", id=mid),
+        version=render_version(app),
+    )
+    # 静的出力（GitHub Pages）は .xml を application/xml で配信するので揃える
+    return Response(body, mimetype="application/xml")
+
+
+@app.get("/sitemap.xml")
+def sitemap() -> Response:
+    index = current_index()
+    groups = load_groups()
+    _, max_level = build_group_tree()
+    urls: List[tuple] = [(_absolute_url(endpoint), None) for endpoint in (
+        "index", "group_list", "group_by_category", "group_tree", "person_list", "meeting_list", "stats",
+    )]
+    urls.extend((_absolute_url("group_tree_level", level=lv), None) for lv in range(1, max_level + 1))
+    for g in groups:
+        urls.append((_absolute_url("group_detail", id=g["id"]), None))
+        urls.append((_absolute_url("group_children", id=g["id"]), None))
+    urls.extend((_absolute_url("person_detail", id=p["id"]), None) for p in load_persons())
+    urls.extend((_absolute_url("meeting_month", ym=m), None) for m in index.months())
+    urls.extend(
+        (_absolute_url("meeting_detail", id=row["id"]), lastmod(row["mtime_ns"]) if row.get("mtime_ns") else None)
+        for row in index.summaries()
+    )
+    return Response(render_sitemap(urls), mimetype="application/xml")
+
+
+def _feed(key: str) -> Feed:
+    feed = build_feeds(load_groups(), current_index().summaries(), [key]).get(key)
+    if feed is None:
+        abort(404)
+    return feed
+
+
+def _ical_response(feed: Feed) -> Response:
+    group_map = {g["id"]: g["name"] for g in load_groups()}
+    etag = feed.fingerprint(group_map, render_version(app))
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        # basic.json を1件ずつ読みながら送る
+        response = Response((line.encode("utf-8") for line in iter_calendar(feed, group_map)), mimetype="text/calendar")
+        response.headers["Content-Disposition"] = f'inline; filename="{feed.key.replace("/", "-")}.ics"'
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = ICAL_MAX_AGE
+    return response
+
+
+@app.get("/ical/all.ics")
+def ical_all() -> Response:
+    return _ical_response(_feed("all"))
+
+
+@app.get("/ical/group/<id>.ics")
+def ical_group(id: str) -> Response:
+    return _ical_response(_feed(f"group/{id}"))
+
+
+@app.get("/ical/tree/<id>.ics")
+def ical_tree(id: str) -> Response:
+    """下位団体の会議も含むフィード."""
+    return _ical_response(_feed(f"tree/{id}"))
+
+
 if __name__ == "__main__":
     app.run(debug=True, port=9000)